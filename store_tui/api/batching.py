@@ -0,0 +1,292 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from snap_python.client import SnapClient
+from snap_python.components.store import StoreEndpoints
+from snap_python.schemas.snaps import (
+    InstalledSnapListResponse,
+    SingleInstalledSnapResponse,
+)
+from snap_python.schemas.store.info import InfoResponse
+from snap_python.schemas.store.refresh import RefreshResultData
+
+from store_tui.elements.utils import get_platform_architecture
+
+logger = logging.getLogger(__name__)
+
+REVISION_FIELDS = [
+    "base",
+    "confinement",
+    "created-at",
+    "download",
+    "revision",
+    "summary",
+    "title",
+    "version",
+]
+
+
+class SnapInfoBatcher:
+    """Coalesce snap lookups made within a short window into as few requests as possible
+
+    Revision lookups (the revision currently released to a channel) are sent to the
+    store's bulk refresh endpoint, one request per architecture. Full snap info,
+    including the channel map, can only be fetched one snap at a time, so those
+    requests are deduplicated and fanned out with bounded concurrency instead.
+    """
+
+    def __init__(
+        self,
+        store: StoreEndpoints,
+        window: float = 0.005,
+        max_concurrency: int = 8,
+        max_batch_size: int = 100,
+    ) -> None:
+        self.store = store
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._info_futures: dict[tuple, asyncio.Future[InfoResponse]] = {}
+        self._revision_futures: dict[tuple, asyncio.Future[RefreshResultData]] = {}
+        self._queued_info: list[tuple] = []
+        self._queued_revisions: list[tuple] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_snap_info(
+        self, snap_name: str, fields: list[str] | None = None
+    ) -> InfoResponse:
+        """Get full snap info, sharing the request with concurrent callers for the same snap
+
+        Args:
+            snap_name (str): name of the snap
+            fields (list[str] | None, optional): info fields to request. Defaults to None.
+
+        Returns:
+            InfoResponse: the snap info
+        """
+        key = (snap_name, tuple(fields or ()))
+        future = self._get_future(self._info_futures, self._queued_info, key)
+        return await asyncio.shield(future)
+
+    async def get_channel_revision(
+        self,
+        snap_name: str,
+        channel: str = "latest/stable",
+        architecture: str | None = None,
+    ) -> RefreshResultData:
+        """Get the revision released to a channel, batched with other lookups in the window
+
+        Args:
+            snap_name (str): name of the snap
+            channel (str, optional): channel to look at. Defaults to "latest/stable".
+            architecture (str | None, optional): architecture. Defaults to the current one.
+
+        Returns:
+            RefreshResultData: revision data for the snap on that channel
+        """
+        key = (snap_name, channel, architecture or get_platform_architecture())
+        future = self._get_future(self._revision_futures, self._queued_revisions, key)
+        return await asyncio.shield(future)
+
+    def _get_future(
+        self, futures: dict[tuple, asyncio.Future], queue: list[tuple], key: tuple
+    ) -> asyncio.Future:
+        future = futures.get(key)
+        if future is not None:
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        futures[key] = future
+        future.add_done_callback(lambda _: futures.pop(key, None))
+        queue.append(key)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+        return future
+
+    def _flush(self):
+        self._flush_handle = None
+        info_keys, self._queued_info = self._queued_info, []
+        revision_keys, self._queued_revisions = self._queued_revisions, []
+
+        for key in info_keys:
+            self._spawn(self._fetch_info(key))
+
+        keys_by_arch: dict[str, list[tuple]] = defaultdict(list)
+        for key in revision_keys:
+            keys_by_arch[key[2]].append(key)
+        for architecture, keys in keys_by_arch.items():
+            for start in range(0, len(keys), self.max_batch_size):
+                chunk = keys[start : start + self.max_batch_size]
+                self._spawn(self._fetch_revisions(architecture, chunk))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch_info(self, key: tuple):
+        future = self._info_futures.get(key)
+        if future is None or future.done():
+            return
+        snap_name, fields = key
+        try:
+            async with self._semaphore:
+                info = await self.store.get_snap_info(
+                    snap_name=snap_name, fields=list(fields) or None
+                )
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(info)
+
+    async def _fetch_revisions(self, architecture: str, keys: list[tuple]):
+        futures = {
+            str(index): self._revision_futures[key]
+            for index, key in enumerate(keys)
+            if key in self._revision_futures
+        }
+        payload = {
+            "context": [],
+            "actions": [
+                {
+                    "action": "install",
+                    "instance-key": str(index),
+                    "name": snap_name,
+                    "channel": channel,
+                }
+                for index, (snap_name, channel, _) in enumerate(keys)
+            ],
+            "fields": REVISION_FIELDS,
+        }
+        try:
+            async with self._semaphore:
+                response = await self.store.snap_refresh(
+                    snap_name=keys[0][0],
+                    payload=payload,
+                    extra_headers={"Snap-Device-Architecture": architecture},
+                )
+            response.raise_for_status()
+            results = response.json().get("results", [])
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for result in results:
+            future = futures.pop(result.get("instance-key"), None)
+            if future is None or future.done():
+                continue
+            if result.get("result") == "error":
+                error = result.get("error") or {}
+                future.set_exception(
+                    LookupError(
+                        f"{result.get('name')}: {error.get('message', 'unknown error')}"
+                    )
+                )
+                continue
+            try:
+                future.set_result(RefreshResultData.model_validate(result))
+            except Exception as e:
+                future.set_exception(e)
+
+        for instance_key, future in futures.items():
+            if not future.done():
+                snap_name = keys[int(instance_key)][0]
+                future.set_exception(LookupError(f"{snap_name}: missing from response"))
+
+
+class SnapdStatusBatcher:
+    """Coalesce snapd install-state queries made within a short window into one request
+
+    snapd lists any set of installed snaps in a single `GET /v2/snaps?snaps=...`.
+    Snaps missing from that list are not installed, and are queried on their own so
+    callers still get snapd's own response for them.
+    """
+
+    def __init__(self, api: SnapClient, window: float = 0.005) -> None:
+        self.api = api
+        self.window = window
+        self._futures: dict[str, asyncio.Future[SingleInstalledSnapResponse]] = {}
+        self._queued: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_snap_info(self, snap_name: str) -> SingleInstalledSnapResponse:
+        """Get a snap's install state, batched with other queries in the window
+
+        Args:
+            snap_name (str): name of the snap
+
+        Returns:
+            SingleInstalledSnapResponse: snapd's response for the snap
+        """
+        future = self._futures.get(snap_name)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[snap_name] = future
+            future.add_done_callback(lambda _: self._futures.pop(snap_name, None))
+            self._queued.append(snap_name)
+            if self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self.window, self._flush
+                )
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        self._flush_handle = None
+        snap_names, self._queued = self._queued, []
+        if len(snap_names) == 1:
+            coro = self._fetch_single(snap_names[0])
+        else:
+            coro = self._fetch_many(snap_names)
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _resolve(self, snap_name: str, result=None, error: BaseException | None = None):
+        future = self._futures.get(snap_name)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def _fetch_single(self, snap_name: str):
+        try:
+            self._resolve(snap_name, await self.api.snaps.get_snap_info(snap_name))
+        except Exception as e:
+            self._resolve(snap_name, error=e)
+
+    async def _fetch_many(self, snap_names: list[str]):
+        try:
+            response = await self.api.request(
+                "GET", "snaps", params={"snaps": ",".join(snap_names)}
+            )
+            installed = InstalledSnapListResponse.model_validate_json(response.content)
+        except Exception as e:
+            for snap_name in snap_names:
+                self._resolve(snap_name, error=e)
+            return
+
+        found = set()
+        for snap in installed.result:
+            found.add(snap.name)
+            self._resolve(
+                snap.name,
+                SingleInstalledSnapResponse(
+                    status_code=installed.status_code,
+                    type=installed.type,
+                    status=installed.status,
+                    result=snap,
+                ),
+            )
+        missing = [name for name in snap_names if name not in found]
+        await asyncio.gather(*(self._fetch_single(name) for name in missing))
@@ -0,0 +1,82 @@
+import httpx
+from snap_python.client import SNAPD_SOCKET, SnapClient
+
+from store_tui.config import Settings, SnapdSettings
+
+
+def create_snapd_transport(
+    socket_path: str = SNAPD_SOCKET, settings: SnapdSettings | None = None
+) -> httpx.AsyncHTTPTransport:
+    settings = settings or SnapdSettings()
+    limits = httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+    return httpx.AsyncHTTPTransport(uds=socket_path, limits=limits, retries=1)
+
+
+def use_persistent_snapd_connection(
+    client: SnapClient,
+    socket_path: str = SNAPD_SOCKET,
+    settings: SnapdSettings | None = None,
+):
+    """Route a client's snapd calls through a small pool of keep-alive connections
+
+    SnapClient's constructor takes no transport or httpx client, so its
+    `snapd_client` is replaced after construction. That relies on snap_python's
+    internals: every snapd call (`request`, `request_raw`, `ping`) goes through
+    `snapd_client`, and nothing else holds the transport the constructor made.
+    snap-python is pinned in pyproject.toml to the releases checked for this.
+
+    Raises:
+        TypeError: the client has no `snapd_client` to replace
+
+    Args:
+        client (SnapClient): client to update in place
+        socket_path (str, optional): snapd socket. Defaults to SNAPD_SOCKET.
+        settings (SnapdSettings | None, optional): pool limits and timeouts.
+            Defaults to SnapdSettings().
+    """
+    if not isinstance(getattr(client, "snapd_client", None), httpx.AsyncClient):
+        raise TypeError(
+            "SnapClient no longer sends snapd calls through `snapd_client`, "
+            "check use_persistent_snapd_connection against this snap-python release"
+        )
+    settings = settings or SnapdSettings()
+    client.snapd_client = httpx.AsyncClient(
+        transport=create_snapd_transport(socket_path, settings),
+        headers=client.snapd_headers,
+        timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+    )
+
+
+def create_snap_client(
+    prompt_for_authentication: bool = False,
+    snapd_socket: str | None = None,
+    settings: Settings | None = None,
+) -> SnapClient:
+    """Create the SnapClient shared by the TUI and the headless CLI
+
+    Args:
+        prompt_for_authentication (bool, optional): let snapd prompt for polkit
+            authentication on privileged calls. Defaults to False.
+        snapd_socket (str | None, optional): snapd socket. Defaults to the
+            `snapd.socket` setting.
+        settings (Settings | None, optional): store and snapd settings.
+            Defaults to Settings().
+
+    Returns:
+        SnapClient: client for the Snap Store and snapd
+    """
+    settings = settings or Settings()
+    snapd_socket = snapd_socket or settings.snapd.socket
+    client = SnapClient(
+        store_base_url=settings.store.base_url,
+        version="v2",
+        store_headers=settings.store.headers,
+        prompt_for_authentication=prompt_for_authentication,
+        snapd_socket_location=snapd_socket,
+    )
+    use_persistent_snapd_connection(client, snapd_socket, settings.snapd)
+    return client
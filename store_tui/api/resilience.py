@@ -0,0 +1,333 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import Any, Awaitable, Callable
+
+import httpx
+from snap_python.client import SnapClient
+
+logger = logging.getLogger(__name__)
+
+STALE_CACHE_SIZE = 256
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of making a call while the circuit for its service is open"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How a single endpoint is called
+
+    Attributes:
+        timeout (float): seconds allowed for each attempt
+        attempts (int): total attempts, including the first
+        base_delay (float): backoff before the first retry, doubled for each further retry
+        max_delay (float): upper bound on the backoff
+        hedge_after (float | None): for idempotent calls, start a second request if
+            the first has not finished after this many seconds
+    """
+
+    timeout: float = 5.0
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    hedge_after: float | None = None
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter exponential backoff before the given retry (starting at 0)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry_number))
+
+
+STORE_GET_POLICY = RetryPolicy(timeout=5.0, attempts=3, hedge_after=1.5)
+DEFAULT_POLICIES: dict[str, RetryPolicy] = {
+    "store.get_categories": STORE_GET_POLICY,
+    "store.get_top_snaps_from_category": STORE_GET_POLICY,
+    "store.find": STORE_GET_POLICY,
+    "store.get_snap_info": STORE_GET_POLICY,
+    "store.snap_refresh": RetryPolicy(timeout=10.0, attempts=3),
+    "snapd.ping": RetryPolicy(timeout=1.0, attempts=1),
+    "snapd.get_snap_info": RetryPolicy(timeout=5.0, attempts=2),
+    "snapd.list_installed_snaps": RetryPolicy(timeout=10.0, attempts=2),
+    "snapd.status": RetryPolicy(timeout=5.0, attempts=2),
+    "snapd.changes": RetryPolicy(timeout=5.0, attempts=2),
+}
+# snapd routes read with `request`, by their first path segment
+SNAPD_REQUEST_ENDPOINTS = {"snaps": "snapd.status", "changes": "snapd.changes"}
+
+
+class CircuitBreaker:
+    """Stop calling a service after repeated failures, probing it again after a cool-down
+
+    The breaker is closed while calls succeed. After `failure_threshold` consecutive
+    failures it opens and calls fail fast. Once `reset_timeout` has passed a single
+    probe call is let through (half-open), which closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self):
+        """Let another call probe, the probe ended without a verdict (e.g. cancelled)"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self._probe_in_flight or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+        self._probe_in_flight = False
+
+
+@dataclass
+class EndpointMetrics:
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    hedges: int = 0
+    short_circuited: int = 0
+    stale_served: int = 0
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.successes if self.successes else 0.0
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether an error is worth retrying and should count against the circuit"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+class ResilientClient:
+    """Wrap a SnapClient with per-endpoint timeouts, retries, hedging and circuit breakers
+
+    Only read-only calls are wrapped (see `DEFAULT_POLICIES`); every other attribute,
+    such as `snaps.install_snap` or `get_changes_by_id_generator`, is passed through to
+    the wrapped client untouched. Store and snapd each get their own circuit breaker.
+    While a circuit is open, the last good response for the same call is served instead.
+    """
+
+    def __init__(
+        self,
+        api: SnapClient,
+        policies: dict[str, RetryPolicy] | None = None,
+        breakers: dict[str, CircuitBreaker] | None = None,
+    ) -> None:
+        self.api = api
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.breakers = breakers or {
+            "store": CircuitBreaker(),
+            "snapd": CircuitBreaker(failure_threshold=2),
+        }
+        self.metrics: dict[str, EndpointMetrics] = {}
+        self._stale_cache: OrderedDict[tuple, Any] = OrderedDict()
+
+    def __getattr__(self, name: str):
+        return getattr(self.api, name)
+
+    @cached_property
+    def store(self) -> "_EndpointProxy":
+        return _EndpointProxy(self, "store", self.api.store)
+
+    @cached_property
+    def snaps(self) -> "_EndpointProxy":
+        return _EndpointProxy(self, "snapd", self.api.snaps)
+
+    async def ping(self) -> httpx.Response:
+        return await self.call("snapd.ping", self.api.ping, idempotent=True)
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send a request to snapd, reads of `SNAPD_REQUEST_ENDPOINTS` under their policy"""
+        policy_name = SNAPD_REQUEST_ENDPOINTS.get(endpoint.split("/", 1)[0])
+        if method != "GET" or policy_name is None:
+            return await self.api.request(method, endpoint, **kwargs)
+        return await self.call(
+            policy_name, self.api.request, method, endpoint, **kwargs
+        )
+
+    def metrics_snapshot(self) -> dict[str, dict]:
+        """Plain-dict copy of the per-endpoint metrics, e.g. for logging"""
+        return {
+            endpoint: {**asdict(metrics), "mean_latency": metrics.mean_latency}
+            for endpoint, metrics in self.metrics.items()
+        }
+
+    async def call(
+        self,
+        endpoint: str,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        idempotent: bool = False,
+        **kwargs,
+    ) -> Any:
+        """Call `func` under the policy and circuit breaker configured for `endpoint`
+
+        Args:
+            endpoint (str): policy name, e.g. "store.find"
+            func (Callable[..., Awaitable[Any]]): the coroutine function to call
+            idempotent (bool, optional): allow hedged requests. Defaults to False.
+
+        Raises:
+            CircuitOpenError: the circuit is open and no cached response exists
+
+        Returns:
+            Any: the result of `func`
+        """
+        policy = self.policies.get(endpoint, RetryPolicy(attempts=1))
+        breaker = self.breakers[endpoint.split(".", 1)[0]]
+        metrics = self.metrics.setdefault(endpoint, EndpointMetrics())
+        cache_key = (endpoint, repr(args), repr(sorted(kwargs.items())))
+        metrics.calls += 1
+
+        probing = breaker.state == "half-open"
+        if not breaker.allow_request():
+            metrics.short_circuited += 1
+            if cache_key in self._stale_cache:
+                metrics.stale_served += 1
+                return self._stale_cache[cache_key]
+            raise CircuitOpenError(f"{endpoint}: circuit open, not calling")
+
+        try:
+            start = time.perf_counter()
+            for attempt in range(policy.attempts):
+                try:
+                    if idempotent and policy.hedge_after is not None:
+                        result = await self._hedged(
+                            policy, metrics, func, *args, **kwargs
+                        )
+                    else:
+                        async with asyncio.timeout(policy.timeout):
+                            result = await func(*args, **kwargs)
+                    if isinstance(result, httpx.Response) and not result.is_success:
+                        # e.g. snap_refresh returns error responses rather than
+                        # raising, they must be retried, and never served as stale
+                        result.raise_for_status()
+                except Exception as e:
+                    if not is_transient_error(e):
+                        breaker.record_success()
+                        raise
+                    if attempt + 1 >= policy.attempts:
+                        metrics.failures += 1
+                        breaker.record_failure()
+                        raise
+                    metrics.retries += 1
+                    logger.debug("Retrying %s after %r", endpoint, e)
+                    await asyncio.sleep(policy.backoff(attempt))
+                    continue
+
+                breaker.record_success()
+                metrics.successes += 1
+                metrics.total_latency += time.perf_counter() - start
+                self._remember(cache_key, result)
+                return result
+        finally:
+            if probing:
+                # a cancelled probe says nothing about the service, but must not
+                # keep every later call waiting on its verdict
+                breaker.release_probe()
+
+    async def _hedged(
+        self,
+        policy: RetryPolicy,
+        metrics: EndpointMetrics,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Race a second request against a slow first one, keeping whichever succeeds first"""
+
+        async def attempt():
+            async with asyncio.timeout(policy.timeout):
+                return await func(*args, **kwargs)
+
+        tasks = {asyncio.create_task(attempt())}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.hedge_after)
+            if not done:
+                metrics.hedges += 1
+                tasks.add(asyncio.create_task(attempt()))
+            error: BaseException | None = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _remember(self, cache_key: tuple, result: Any):
+        self._stale_cache[cache_key] = result
+        self._stale_cache.move_to_end(cache_key)
+        while len(self._stale_cache) > STALE_CACHE_SIZE:
+            self._stale_cache.popitem(last=False)
+
+
+class _EndpointProxy:
+    """Route calls to a snap_python endpoints object through ResilientClient.call"""
+
+    def __init__(self, client: ResilientClient, service: str, target: Any) -> None:
+        self._client = client
+        self._service = service
+        self._target = target
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._target, name)
+        endpoint = f"{self._service}.{name}"
+        if endpoint not in self._client.policies:
+            return attribute
+
+        async def wrapped(*args, **kwargs):
+            return await self._client.call(
+                endpoint,
+                getattr(self._target, name),
+                *args,
+                idempotent=self._service == "store" and name != "snap_refresh",
+                **kwargs,
+            )
+
+        return wrapped
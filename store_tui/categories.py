@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import AbstractAsyncContextManager, nullcontext
+from pathlib import Path
+from typing import Callable, Collection
+
+from pydantic import BaseModel, Field, ValidationError
+from snap_python.schemas.store.categories import Category
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.session import SessionRow
+
+logger = logging.getLogger(__name__)
+
+# categories and their listings change slowly, revalidate them a few times a day
+CATEGORY_MAX_AGE = 6 * 60 * 60
+MAX_CATEGORY_ROWS = 200
+
+
+def get_categories_filepath() -> Path:
+    """Location of the category cache, following the XDG base directory spec
+
+    Returns:
+        Path: $XDG_CACHE_HOME/store-tui/categories.json
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "store-tui" / "categories.json"
+
+
+class CategoryEntry(BaseModel):
+    """A store category with the last listing fetched for it"""
+
+    name: str
+    title: str | None = None
+    count: int | None = None
+    rows: list[SessionRow] = Field(default_factory=list)
+    updated_at: float | None = None
+    # last time the user opened the category
+    opened_at: float | None = None
+
+    @property
+    def label(self) -> str:
+        return self.title or self.name
+
+
+class CategoryCatalog(BaseModel):
+    """Category metadata, persisted between runs and revalidated in the background"""
+
+    fetched_at: float | None = None
+    categories: list[CategoryEntry] = Field(default_factory=list)
+
+    def get(self, name: str) -> CategoryEntry | None:
+        for entry in self.categories:
+            if entry.name == name:
+                return entry
+        return None
+
+    def set_categories(self, categories: list[Category], now: float):
+        """Replace the category list, keeping the cached listings of known categories
+
+        Args:
+            categories (list[Category]): categories returned by the store
+            now (float): time of the fetch
+        """
+        previous = {entry.name: entry for entry in self.categories}
+        self.categories = []
+        for category in categories:
+            if not category.name:
+                continue
+            entry = previous.get(category.name) or CategoryEntry(name=category.name)
+            entry.title = category.title or entry.title
+            self.categories.append(entry)
+        self.fetched_at = now
+
+    def record_listing(self, name: str, response: SearchResponse, now: float):
+        """Remember the snaps listed for a category
+
+        Args:
+            name (str): category name
+            response (SearchResponse): listing returned by the store
+            now (float): time of the fetch
+        """
+        entry = self.get(name)
+        if entry is None:
+            entry = CategoryEntry(name=name)
+            self.categories.append(entry)
+        entry.count = len(response.results)
+        entry.rows = [
+            SessionRow(name=result.name, summary=result.snap.summary)
+            for result in response.results[:MAX_CATEGORY_ROWS]
+        ]
+        entry.updated_at = now
+
+    def mark_opened(self, name: str, now: float):
+        entry = self.get(name)
+        if entry is None:
+            entry = CategoryEntry(name=name)
+            self.categories.append(entry)
+        entry.opened_at = now
+
+    def recently_opened(self, count: int) -> list[str]:
+        """Names of the `count` categories opened last, most recent first"""
+        opened = [entry for entry in self.categories if entry.opened_at is not None]
+        opened.sort(key=lambda entry: entry.opened_at, reverse=True)
+        return [entry.name for entry in opened[:count]]
+
+    def stale_entries(
+        self, max_age: float, now: float, names: Collection[str] | None = None
+    ) -> list[CategoryEntry]:
+        return [
+            entry
+            for entry in self.categories
+            if (names is None or entry.name in names)
+            and (entry.updated_at is None or now - entry.updated_at >= max_age)
+        ]
+
+
+def load_catalog(path: Path) -> CategoryCatalog | None:
+    """Load the category cache, ignoring missing or unreadable files
+
+    Args:
+        path (Path): cache file
+
+    Returns:
+        CategoryCatalog | None: the cached categories, if any
+    """
+    try:
+        return CategoryCatalog.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValidationError):
+        logger.warning("Ignoring unreadable category cache %s", path, exc_info=True)
+        return None
+
+
+def save_catalog(catalog: CategoryCatalog, path: Path):
+    """Atomically write the category cache
+
+    Args:
+        catalog (CategoryCatalog): categories to save
+        path (Path): cache file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(catalog.model_dump_json())
+    tmp_path.replace(path)
+
+
+async def revalidate_catalog(
+    catalog: CategoryCatalog,
+    store,
+    max_age: float = CATEGORY_MAX_AGE,
+    max_concurrency: int = 4,
+    clock: Callable[[], float] = time.time,
+    slot: Callable[[], AbstractAsyncContextManager] | None = None,
+    names: Collection[str] | None = None,
+):
+    """Refresh the category list and any listing older than `max_age`
+
+    Listings are fetched concurrently, at most `max_concurrency` at a time, so
+    stores with many categories are neither slow to revalidate nor flooded.
+
+    Args:
+        catalog (CategoryCatalog): catalog to update in place
+        store: store endpoints (or a ResilientClient proxy for them)
+        max_age (float, optional): seconds before cached data is refetched.
+            Defaults to CATEGORY_MAX_AGE.
+        max_concurrency (int, optional): concurrent listing requests. Defaults to 4.
+        clock (Callable[[], float], optional): time source. Defaults to time.time.
+        slot (Callable[[], AbstractAsyncContextManager] | None, optional): entered
+            around each request, to hold requests back while more urgent ones run.
+        names (Collection[str] | None, optional): only refresh the listings of
+            these categories, the others are refreshed when they are opened.
+            Defaults to every category.
+    """
+    slot = slot or nullcontext
+    if catalog.fetched_at is None or clock() - catalog.fetched_at >= max_age:
+        async with slot():
+            categories_response = await store.get_categories()
+        catalog.set_categories(categories_response.categories or [], now=clock())
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def refresh(entry: CategoryEntry):
+        async with semaphore, slot():
+            try:
+                response = await store.get_top_snaps_from_category(entry.name)
+            except Exception:
+                logger.warning(
+                    "Error refreshing category %s", entry.name, exc_info=True
+                )
+                return
+        catalog.record_listing(entry.name, response, now=clock())
+
+    await asyncio.gather(
+        *(
+            refresh(entry)
+            for entry in catalog.stale_entries(max_age, now=clock(), names=names)
+        )
+    )
@@ -0,0 +1,126 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.measure import Measurement
+from rich.text import Text
+from snap_python.schemas.store.info import ChannelMapItem
+
+RISK_ORDER = {"stable": 0, "candidate": 1, "beta": 2, "edge": 3}
+# wide enough for "rev. 12345 v1.2.3-beta"; longer versions are cut off
+CELL_WIDTH = 24
+MISSING_CELL = "-"
+
+
+def channel_name(channel: ChannelMapItem) -> str:
+    """Fully qualified channel name, the store leaves the track out for latest"""
+    track, name = channel.channel.track, channel.channel.name
+    if name.startswith(f"{track}/"):
+        return name
+    return f"{track}/{name}"
+
+
+def _natural_key(value: str) -> list:
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", value)]
+
+
+def channel_sort_key(name: str) -> tuple:
+    """latest first, then newer tracks first, each ordered stable to edge, then branches"""
+    track, _, risk = name.partition("/")
+    risk, _, branch = risk.partition("/")
+    natural_track = _natural_key(track)
+    return (
+        track != "latest",
+        [-part if isinstance(part, int) else part for part in natural_track],
+        RISK_ORDER.get(risk, len(RISK_ORDER)),
+        branch,
+    )
+
+
+class MatrixCell:
+    """Matrix cell that formats its text only when it is first drawn
+
+    It reports a fixed width, so a table can be laid out without formatting the
+    cells that are never scrolled into view.
+    """
+
+    def __init__(self, channel: ChannelMapItem | None, highlight: bool = False):
+        self.channel = channel
+        self.highlight = highlight
+        self._text: Text | None = None
+
+    @property
+    def text(self) -> Text:
+        if self._text is None:
+            if self.channel is None:
+                self._text = Text(MISSING_CELL, style="dim")
+            else:
+                version = f" v{self.channel.version}" if self.channel.version else ""
+                self._text = Text(
+                    f"rev. {self.channel.revision}{version}",
+                    style="yellow" if self.highlight else "",
+                    overflow="ellipsis",
+                    no_wrap=True,
+                )
+        return self._text
+
+    def __rich_measure__(
+        self, console: Console, options: ConsoleOptions
+    ) -> Measurement:
+        return Measurement(1, CELL_WIDTH)
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        yield self.text
+
+
+@dataclass
+class ChannelMatrix:
+    """A snap's channel map as channels x architectures, built in one pass"""
+
+    channels: list[str] = field(default_factory=list)
+    architectures: list[str] = field(default_factory=list)
+    cells: dict[tuple[str, str], ChannelMapItem] = field(default_factory=dict)
+
+    @classmethod
+    def from_channel_map(cls, channel_map: list[ChannelMapItem]) -> "ChannelMatrix":
+        cells = {}
+        channels = set()
+        architectures = set()
+        for item in channel_map:
+            name = channel_name(item)
+            architecture = item.channel.architecture
+            channels.add(name)
+            architectures.add(architecture)
+            cells[(name, architecture)] = item
+        return cls(
+            channels=sorted(channels, key=channel_sort_key),
+            architectures=sorted(architectures),
+            cells=cells,
+        )
+
+    def get(self, channel: str, architecture: str) -> ChannelMapItem | None:
+        return self.cells.get((channel, architecture))
+
+    def row(self, channel: str) -> list[ChannelMapItem | None]:
+        return [self.get(channel, architecture) for architecture in self.architectures]
+
+    def versions_differ(self, channel: str) -> bool:
+        """Whether a channel carries different versions on different architectures"""
+        return len({item.version for item in self.row(channel) if item is not None}) > 1
+
+    def by_architecture(self) -> dict[str, list[ChannelMapItem]]:
+        """Channels available on each architecture, most recently released first"""
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        organized: dict[str, list[ChannelMapItem]] = {
+            architecture: [] for architecture in self.architectures
+        }
+        for (_, architecture), item in self.cells.items():
+            organized[architecture].append(item)
+        for items in organized.values():
+            items.sort(
+                key=lambda item: item.channel.released_at or oldest, reverse=True
+            )
+        return organized
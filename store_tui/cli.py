@@ -0,0 +1,340 @@
+"""Headless command line interface for scripted store queries
+
+Shares the data layer of the TUI (SnapClient, ResilientClient, SnapInfoBatcher)
+but never imports textual or rich_pixels, so it starts quickly. Every command
+writes one JSON object per line to stdout as results arrive.
+
+`export` writes the installed snaps as an inventory (see store_tui.inventory),
+which `diff` compares with other machines' inventories and `diff-store` with the
+store's current channel revisions.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from snap_python.client import SnapClient
+from snap_python.schemas.store.info import VALID_SNAP_INFO_FIELDS
+
+from store_tui.api.batching import SnapInfoBatcher
+from store_tui.api.client import create_snap_client
+from store_tui.api.resilience import ResilientClient
+from store_tui.config import Settings, SettingsError, get_config_filepath, load_settings
+from store_tui.inventory import (
+    Inventory,
+    InventoryEntry,
+    diff_inventories,
+    read_inventory,
+)
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ["title", "store-url", "summary", "version", "publisher"]
+
+parser = argparse.ArgumentParser(
+    prog="store-tui.cli", description="Query the Snap Store without the TUI"
+)
+parser.add_argument(
+    "--concurrency",
+    type=int,
+    default=None,
+    help="maximum number of concurrent store requests (default: from the config file)",
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+search_parser = subparsers.add_parser("search", help="search the store")
+search_parser.add_argument("query")
+
+info_parser = subparsers.add_parser("info", help="get store info for snaps")
+info_parser.add_argument("snaps", nargs="+")
+
+category_parser = subparsers.add_parser("category", help="list snaps in a category")
+category_parser.add_argument("category", nargs="?", default="featured")
+
+subparsers.add_parser("installed", help="list installed snaps")
+subparsers.add_parser(
+    "outdated", help="list installed snaps with a newer revision in their channel"
+)
+
+export_parser = subparsers.add_parser(
+    "export", help="write an inventory of the installed snaps"
+)
+export_parser.add_argument(
+    "--machine", help="machine name in the inventory (default: the hostname)"
+)
+
+diff_parser = subparsers.add_parser(
+    "diff", help="list differences of inventories from a baseline inventory"
+)
+diff_parser.add_argument("baseline", type=Path)
+diff_parser.add_argument("inventories", type=Path, nargs="+")
+
+diff_store_parser = subparsers.add_parser(
+    "diff-store",
+    help="list inventory snaps whose channel has another revision in the store",
+)
+diff_store_parser.add_argument("inventories", type=Path, nargs="+")
+
+
+class NDJSONWriter:
+    def __init__(self, stream: IO[str] = sys.stdout) -> None:
+        self.stream = stream
+        self.errors = 0
+
+    def write(self, record: dict[str, Any]):
+        self.stream.write(json.dumps(record, default=str) + "\n")
+        self.stream.flush()
+
+    def write_error(self, error: BaseException, **context):
+        self.errors += 1
+        self.write({**context, "error": f"{type(error).__name__}: {error}"})
+
+
+async def search(api: ResilientClient, writer: NDJSONWriter, query: str):
+    response = await api.store.find(query=query, fields=SEARCH_FIELDS)
+    for result in response.results:
+        writer.write(result.model_dump(mode="json", exclude_none=True))
+
+
+async def category(api: ResilientClient, writer: NDJSONWriter, category: str):
+    response = await api.store.get_top_snaps_from_category(category)
+    for result in response.results:
+        writer.write(result.model_dump(mode="json", exclude_none=True))
+
+
+async def info(batcher: SnapInfoBatcher, writer: NDJSONWriter, snaps: list[str]):
+    async def get_info(snap_name: str):
+        try:
+            return snap_name, await batcher.get_snap_info(
+                snap_name, fields=VALID_SNAP_INFO_FIELDS
+            )
+        except Exception as e:
+            return snap_name, e
+
+    for next_result in asyncio.as_completed([get_info(snap) for snap in snaps]):
+        snap_name, result = await next_result
+        if isinstance(result, Exception):
+            writer.write_error(result, name=snap_name)
+        else:
+            writer.write(
+                result.model_dump(mode="json", by_alias=True, exclude_none=True)
+            )
+
+
+async def installed(api: ResilientClient, writer: NDJSONWriter):
+    response = await api.snaps.list_installed_snaps()
+    for snap in sorted(response.result, key=lambda snap: snap.name):
+        writer.write(
+            {
+                "name": snap.name,
+                "version": snap.version,
+                "revision": snap.revision,
+                "channel": snap.tracking_channel or snap.channel,
+                "confinement": snap.confinement,
+            }
+        )
+
+
+async def outdated(
+    api: ResilientClient, batcher: SnapInfoBatcher, writer: NDJSONWriter
+):
+    response = await api.snaps.list_installed_snaps()
+
+    async def check(snap):
+        channel = snap.tracking_channel or "latest/stable"
+        try:
+            return snap, channel, await batcher.get_channel_revision(snap.name, channel)
+        except Exception as e:
+            return snap, channel, e
+
+    # locally installed snaps have no store revision to compare against
+    store_snaps = [
+        snap for snap in response.result if not str(snap.revision).startswith("x")
+    ]
+    for next_result in asyncio.as_completed([check(snap) for snap in store_snaps]):
+        snap, channel, result = await next_result
+        if isinstance(result, Exception):
+            writer.write_error(result, name=snap.name, channel=channel)
+            continue
+        if result.snap.revision is None or result.snap.revision == int(snap.revision):
+            continue
+        writer.write(
+            {
+                "name": snap.name,
+                "channel": channel,
+                "installed-revision": int(snap.revision),
+                "installed-version": snap.version,
+                "store-revision": result.snap.revision,
+                "store-version": result.snap.version,
+            }
+        )
+
+
+async def export(api: ResilientClient, writer: NDJSONWriter, machine: str | None):
+    response = await api.snaps.list_installed_snaps()
+    for record in Inventory.from_installed_snaps(response.result, machine).records():
+        writer.write(record)
+
+
+def load_inventory(path: Path) -> Inventory:
+    with open(path) as f:
+        return read_inventory(f, source=str(path))
+
+
+def diff(writer: NDJSONWriter, baseline_path: Path, inventory_paths: list[Path]):
+    baseline = load_inventory(baseline_path)
+    # one inventory is read at a time, however many machines are compared
+    for path in inventory_paths:
+        try:
+            inventory = load_inventory(path)
+        except (OSError, ValueError) as e:
+            writer.write_error(e, inventory=str(path))
+            continue
+        for record in diff_inventories(baseline, inventory):
+            writer.write(record)
+
+
+def store_lookups(inventory: Inventory) -> Iterator[tuple[InventoryEntry, tuple]]:
+    """Entries installed from the store, with the (name, channel, arch) to look up"""
+    for entry in inventory.entries.values():
+        if entry.is_local:
+            continue
+        yield (
+            entry,
+            (entry.name, entry.channel or "latest/stable", inventory.architecture),
+        )
+
+
+async def diff_store(
+    batcher: SnapInfoBatcher, writer: NDJSONWriter, inventory_paths: list[Path]
+):
+    # each channel is looked up once, however many machines track it
+    async def check(key: tuple[str, str, str]):
+        name, channel, architecture = key
+        try:
+            return await batcher.get_channel_revision(name, channel, architecture)
+        except Exception as e:
+            return e
+
+    # two passes over the inventories, one at a time: the first starts the lookups
+    # of their channels, the second compares each inventory with the results, so
+    # only the lookups (not the machines) are held in memory
+    lookups: dict[tuple[str, str, str], asyncio.Task] = {}
+    readable = []
+    for path in inventory_paths:
+        try:
+            inventory = load_inventory(path)
+        except (OSError, ValueError) as e:
+            writer.write_error(e, inventory=str(path))
+            continue
+        readable.append(path)
+        for _, key in store_lookups(inventory):
+            if key not in lookups:
+                lookups[key] = asyncio.ensure_future(check(key))
+    await asyncio.gather(*lookups.values())
+
+    reported_errors = set()
+    for path in readable:
+        try:
+            inventory = load_inventory(path)
+        except (OSError, ValueError) as e:
+            writer.write_error(e, inventory=str(path))
+            continue
+        for entry, key in store_lookups(inventory):
+            lookup = lookups.get(key)
+            if lookup is None:
+                # the file changed since the first pass
+                lookup = lookups[key] = asyncio.ensure_future(check(key))
+                await lookup
+            result = lookup.result()
+            if isinstance(result, Exception):
+                if key not in reported_errors:
+                    reported_errors.add(key)
+                    writer.write_error(
+                        result, name=key[0], channel=key[1], architecture=key[2]
+                    )
+                continue
+            if (
+                result.snap.revision is None
+                or str(result.snap.revision) == entry.revision
+            ):
+                continue
+            writer.write(
+                {
+                    "machine": inventory.machine,
+                    "name": entry.name,
+                    "channel": key[1],
+                    "installed-revision": entry.revision,
+                    "installed-version": entry.version,
+                    "store-revision": str(result.snap.revision),
+                    "store-version": result.snap.version,
+                }
+            )
+
+
+async def run(
+    args: argparse.Namespace,
+    api: SnapClient,
+    writer: NDJSONWriter,
+    settings: Settings | None = None,
+) -> int:
+    """Run a parsed command against the given client
+
+    Args:
+        args (argparse.Namespace): arguments parsed by `parser`
+        api (SnapClient): client to query the store and snapd with
+        writer (NDJSONWriter): output
+        settings (Settings | None, optional): timeouts, concurrency and batching.
+            Defaults to Settings().
+
+    Returns:
+        int: process exit code
+    """
+    settings = settings or Settings()
+    resilient_api = ResilientClient(api, policies=settings.store.retry_policies())
+    batcher = SnapInfoBatcher(
+        resilient_api.store,
+        window=settings.batching.window,
+        max_concurrency=args.concurrency or settings.concurrency.store_requests,
+        max_batch_size=settings.batching.max_batch_size,
+    )
+    try:
+        if args.command == "search":
+            await search(resilient_api, writer, args.query)
+        elif args.command == "category":
+            await category(resilient_api, writer, args.category)
+        elif args.command == "info":
+            await info(batcher, writer, args.snaps)
+        elif args.command == "installed":
+            await installed(resilient_api, writer)
+        elif args.command == "outdated":
+            await outdated(resilient_api, batcher, writer)
+        elif args.command == "export":
+            await export(resilient_api, writer, args.machine)
+        elif args.command == "diff":
+            diff(writer, args.baseline, args.inventories)
+        elif args.command == "diff-store":
+            await diff_store(batcher, writer, args.inventories)
+    except Exception as e:
+        logger.debug("Error running %s", args.command, exc_info=True)
+        writer.write_error(e, command=args.command)
+    return 1 if writer.errors else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parser.parse_args(argv)
+    try:
+        settings = load_settings(get_config_filepath())
+    except SettingsError as e:
+        parser.error(str(e))
+    return asyncio.run(
+        run(args, create_snap_client(settings=settings), NDJSONWriter(), settings)
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import os
+import tomllib
+from collections.abc import Mapping
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Iterator
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from snap_python.client import SNAPD_SOCKET
+
+from store_tui.api.resilience import DEFAULT_POLICIES, RetryPolicy
+
+# e.g. STORE_TUI_CACHE__RECENT_SNAPS=8 sets `recent_snaps` in the [cache] table
+ENV_PREFIX = "STORE_TUI_"
+ENV_SECTION_SEPARATOR = "__"
+
+
+class SettingsError(ValueError):
+    """Raised when the config file or a STORE_TUI_ variable cannot be used"""
+
+
+def get_config_filepath() -> Path:
+    """Location of the config file, following the XDG base directory spec
+
+    Returns:
+        Path: $XDG_CONFIG_HOME/store-tui/config.toml
+    """
+    config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(config_home) / "store-tui" / "config.toml"
+
+
+class SettingsSection(BaseModel):
+    # unknown keys are most likely typos, which should not be silently ignored
+    model_config = ConfigDict(extra="forbid", validate_default=True)
+
+
+class StoreSettings(SettingsSection):
+    base_url: str = "https://api.snapcraft.io"
+    device_series: str = "16"
+    # multiplies every store timeout and hedging delay, raise it on slow links
+    timeout_scale: float = Field(default=1.0, gt=0)
+    icon_timeout: float = Field(default=5.0, gt=0)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "Snap-Device-Series": self.device_series,
+            "X-Ubuntu-Series": self.device_series,
+        }
+
+    def retry_policies(self) -> dict[str, RetryPolicy]:
+        """Default store policies with their timeouts scaled by `timeout_scale`"""
+        return {
+            endpoint: replace(
+                policy,
+                timeout=policy.timeout * self.timeout_scale,
+                hedge_after=(
+                    None
+                    if policy.hedge_after is None
+                    else policy.hedge_after * self.timeout_scale
+                ),
+            )
+            for endpoint, policy in DEFAULT_POLICIES.items()
+            if endpoint.startswith("store.")
+        }
+
+
+class SnapdSettings(SettingsSection):
+    socket: str = SNAPD_SOCKET
+    # a few connections are enough for snapd, but they should outlive the pauses
+    # between user actions (httpx drops idle connections after 5s by default)
+    max_connections: int = Field(default=4, ge=1)
+    keepalive_expiry: float = Field(default=300.0, ge=0)
+    timeout: float = Field(default=5.0, gt=0)
+    # a local socket connects at once or not at all
+    connect_timeout: float = Field(default=1.0, gt=0)
+
+
+class ConcurrencySettings(SettingsSection):
+    store_requests: int = Field(default=8, ge=1)
+    category_requests: int = Field(default=4, ge=1)
+
+
+class BatchingSettings(SettingsSection):
+    # seconds to wait for more lookups before sending a batch
+    window: float = Field(default=0.005, ge=0)
+    max_batch_size: int = Field(default=100, ge=1, le=1000)
+
+
+class CacheSettings(SettingsSection):
+    recent_snaps: int = Field(default=32, ge=0)
+    recent_snaps_megabytes: float = Field(default=16.0, ge=0)
+    # categories and their listings change slowly, revalidate them a few times a day
+    category_ttl: float = Field(default=6 * 60 * 60, ge=0)
+    # recently opened categories whose listings are revalidated on start, besides
+    # the current one; the others are only fetched when they are opened
+    recent_categories: int = Field(default=3, ge=0)
+    installed_poll_interval: float = Field(default=2.0, gt=0)
+    # channels whose revision history is kept while the app runs
+    revision_histories: int = Field(default=64, ge=1)
+    # rows on each side of the open snap whose info is fetched ahead
+    prefetch_depth: int = Field(default=2, ge=0)
+
+    @property
+    def recent_snaps_bytes(self) -> int:
+        return int(self.recent_snaps_megabytes * 1024 * 1024)
+
+
+class InstrumentationSettings(SettingsSection):
+    # show the stats overlay on start
+    overlay: bool = False
+    refresh_interval: float = Field(default=1.0, gt=0)
+
+
+class ErrorSettings(SettingsSection):
+    # repeats of an error within this many seconds are folded into one notification
+    notify_interval: float = Field(default=5.0, ge=0)
+    log_megabytes: float = Field(default=1.0, gt=0)
+    log_backups: int = Field(default=3, ge=0)
+
+    @property
+    def log_bytes(self) -> int:
+        return int(self.log_megabytes * 1024 * 1024)
+
+
+class Settings(SettingsSection):
+    """Tunable limits of the app, read from config.toml and STORE_TUI_ variables
+
+    Each table of the config file is one section, e.g.
+
+        [cache]
+        recent_snaps = 8
+        recent_snaps_megabytes = 4
+    """
+
+    store: StoreSettings = Field(default_factory=StoreSettings)
+    snapd: SnapdSettings = Field(default_factory=SnapdSettings)
+    concurrency: ConcurrencySettings = Field(default_factory=ConcurrencySettings)
+    batching: BatchingSettings = Field(default_factory=BatchingSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    instrumentation: InstrumentationSettings = Field(
+        default_factory=InstrumentationSettings
+    )
+    errors: ErrorSettings = Field(default_factory=ErrorSettings)
+
+    def sections(self) -> Iterator[tuple[str, SettingsSection]]:
+        for section_name in type(self).model_fields:
+            yield section_name, getattr(self, section_name)
+
+    def describe(self) -> Iterator[tuple[str, Any, bool]]:
+        """Every setting as ("section.key", value, whether it was set explicitly)"""
+        for section_name, section in self.sections():
+            for key in type(section).model_fields:
+                yield (
+                    f"{section_name}.{key}",
+                    getattr(section, key),
+                    key in section.model_fields_set,
+                )
+
+
+def read_environment(environ: Mapping[str, str]) -> dict[str, dict[str, str]]:
+    """Collect STORE_TUI_<SECTION>__<KEY> variables into config tables"""
+    tables: dict[str, dict[str, str]] = {}
+    for name, value in environ.items():
+        if not name.startswith(ENV_PREFIX) or ENV_SECTION_SEPARATOR not in name:
+            continue
+        section, _, key = (
+            name[len(ENV_PREFIX) :].lower().partition(ENV_SECTION_SEPARATOR)
+        )
+        tables.setdefault(section, {})[key] = value
+    return tables
+
+
+def load_settings(
+    path: Path | None, environ: Mapping[str, str] = os.environ
+) -> Settings:
+    """Load settings from a config file, overridden by environment variables
+
+    A missing file leaves every setting at its default.
+
+    Args:
+        path (Path | None): config file, None to only read the environment
+        environ (Mapping[str, str], optional): environment. Defaults to os.environ.
+
+    Raises:
+        SettingsError: the file is not valid TOML, or a value is invalid
+
+    Returns:
+        Settings: the validated settings
+    """
+    data: dict[str, Any] = {}
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            raise SettingsError(f"Cannot read {path}: {e}") from e
+
+    for section, values in read_environment(environ).items():
+        table = data.setdefault(section, {})
+        if isinstance(table, dict):
+            table.update(values)
+
+    try:
+        return Settings.model_validate(data)
+    except ValidationError as e:
+        raise SettingsError(f"Invalid settings in {path or 'environment'}:\n{e}") from e
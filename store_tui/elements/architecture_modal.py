@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from textual.app import ComposeResult
+from textual.screen import ModalScreen
+from textual.widgets import DataTable, Footer, Header
+
+from store_tui.channel_matrix import CELL_WIDTH, ChannelMatrix, MatrixCell
+from store_tui.elements.utils import get_platform_architecture
+
+ARCHITECTURE_CSS_PATH = (
+    Path(__file__).parent.parent / "styles" / "architecture_modal.tcss"
+)
+
+
+class ArchitectureMatrixModal(ModalScreen):
+    """Revision and version of every channel on every architecture
+
+    Channels whose version differs between architectures are highlighted. The table
+    only draws the rows in view, and each cell is formatted when first drawn.
+    """
+
+    CSS_PATH = ARCHITECTURE_CSS_PATH
+    BINDINGS = [("escape,q", "dismiss", "Close")]
+
+    def __init__(self, snap_title: str, channel_matrix: ChannelMatrix) -> None:
+        super().__init__()
+        self.title = f"{snap_title} - channels by architecture"
+        self.channel_matrix = channel_matrix
+        self.matrix_table = DataTable(
+            id="architecture-matrix", cursor_type="cell", zebra_stripes=True
+        )
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        yield self.matrix_table
+        yield Footer()
+
+    def on_mount(self):
+        current_architecture = get_platform_architecture()
+        self.matrix_table.add_column("Channel", key="channel")
+        for architecture in self.channel_matrix.architectures:
+            label = architecture
+            if architecture == current_architecture:
+                label = f"{architecture} (this machine)"
+            self.matrix_table.add_column(
+                label, key=architecture, width=max(CELL_WIDTH, len(label))
+            )
+        for channel in self.channel_matrix.channels:
+            highlight = self.channel_matrix.versions_differ(channel)
+            self.matrix_table.add_row(
+                channel,
+                *(
+                    MatrixCell(item, highlight=highlight)
+                    for item in self.channel_matrix.row(channel)
+                ),
+                key=channel,
+            )
+        self.matrix_table.focus()
@@ -1,25 +1,82 @@
 from pathlib import Path
 
+from textual import on
 from textual.app import ComposeResult
 from textual.screen import ModalScreen
-from textual.widgets import OptionList
+from textual.widgets import Input, OptionList
+from textual.widgets.option_list import Option, OptionDoesNotExist
+
+from store_tui.categories import CategoryEntry
+from store_tui.elements.result_index import ResultIndex
 
 CATEGORY_CSS_PATH = Path(__file__).parent.parent / "styles" / "category_modal.tcss"
 
 
 class CategoryModal(ModalScreen):
     CSS_PATH = CATEGORY_CSS_PATH
+    BINDINGS = [
+        ("escape", "cancel", "Cancel"),
+        ("up", "move_highlight(-1)", "Previous"),
+        ("down", "move_highlight(1)", "Next"),
+    ]
 
-    def __init__(self, categories: list[str], current_category: str) -> None:
+    def __init__(self, categories: list[CategoryEntry], current_category: str) -> None:
         super().__init__()
         self.categories = categories
         self.current_category = current_category
+        self.index = ResultIndex([(entry.name, entry.title) for entry in categories])
+        self.options = [
+            Option(self.format_prompt(entry), id=entry.name) for entry in categories
+        ]
+        self.option_list = OptionList(
+            *self.options, name="category", id="category_option_list", wrap=False
+        )
+
+    @staticmethod
+    def format_prompt(entry: CategoryEntry) -> str:
+        if entry.count is None:
+            return entry.label
+        return f"{entry.label} ({entry.count})"
 
     def compose(self) -> ComposeResult:
-        option_list = OptionList(
-            *self.categories, name="category", id="category_option_list", wrap=False
+        yield Input(placeholder="Filter categories", id="category_filter")
+        yield self.option_list
+
+    def on_mount(self):
+        self.highlight_category(self.current_category)
+
+    def highlight_category(self, name: str):
+        try:
+            self.option_list.highlighted = self.option_list.get_option_index(name)
+        except OptionDoesNotExist:
+            self.option_list.highlighted = 0 if self.option_list.option_count else None
+
+    @on(Input.Changed, "#category_filter")
+    def on_filter_changed(self, changed: Input.Changed):
+        self.option_list.clear_options()
+        self.option_list.add_options(
+            self.options[row_id] for row_id in self.index.search(changed.value)
         )
-        yield option_list
+        # matches are ranked, so highlight the best one while filtering
+        if changed.value:
+            self.option_list.highlighted = 0 if self.option_list.option_count else None
+        else:
+            self.highlight_category(self.current_category)
+
+    @on(Input.Submitted, "#category_filter")
+    def on_filter_submitted(self):
+        highlighted = self.option_list.highlighted
+        if highlighted is not None:
+            self.dismiss(self.option_list.get_option_at_index(highlighted).id)
+
+    def action_move_highlight(self, step: int):
+        if step < 0:
+            self.option_list.action_cursor_up()
+        else:
+            self.option_list.action_cursor_down()
+
+    def action_cancel(self):
+        self.dismiss(None)
 
     def on_option_list_option_selected(self, option: OptionList.OptionSelected) -> None:
-        self.dismiss(option.option.prompt)
+        self.dismiss(option.option.id)
@@ -1,22 +1,29 @@
-import subprocess
-
 from textual import on
 from textual.events import Click
 from textual.widgets import Label
 
+from store_tui.launcher import ExternalLauncher
+
 
 class ClickableLink(Label):
-    def __init__(self, text: str, url: str, *args, **kwargs) -> None:
+    def __init__(
+        self,
+        text: str,
+        url: str,
+        *args,
+        launcher: ExternalLauncher | None = None,
+        **kwargs,
+    ) -> None:
         super().__init__(text, *args, **kwargs)
         self.url = url
+        self.launcher = launcher or ExternalLauncher()
 
     @on(Click)
     def on_link_clicked(self):
-        # trigger system url handler
-        # webbrowser.open(self.url, new=2)
-        subprocess.run(
-            ["xdg-open", self.url],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        # trigger system url handler, without waiting for it to exit
+        self.launcher.launch(self.url, on_error=self.on_launch_error)
+
+    def on_launch_error(self, url: str, error: Exception):
+        # the link may be gone by the time the opener fails
+        if self.is_attached:
+            self.app.notify(str(error), title=f"Could not open {url}", severity="error")
@@ -4,36 +4,76 @@ from pathlib import Path
 from textual import on
 from textual.containers import Horizontal, Vertical
 from textual.screen import ModalScreen
-from textual.widgets import Button, Header, TextArea
+from textual.widgets import Button, Collapsible, Header, Label, TextArea
+
+from store_tui.errors import ErrorRecord
 
 MODAL_CSS_PATH = Path(__file__).parent.parent / "styles" / "error_modal.tcss"
 
 
 class ErrorModal(ModalScreen):
+    """An error's message, with its traceback formatted only once it is expanded"""
+
     CSS_PATH = MODAL_CSS_PATH
 
-    def __init__(self, exc: Exception, error_title: str | None = None):
+    def __init__(
+        self, exc: BaseException, error_title: str | None = None, count: int = 1
+    ):
         super().__init__()
         self.exc = exc
-        self.error_text = "".join(traceback.format_exception(exc))
+        self.count = count
+        # the record the error was reported in, which keeps its formatted traceback
+        self.record: ErrorRecord | None = None
+        self._error_text: str | None = None
 
         self.title = error_title or "Error"
-        self.text_area = TextArea(
-            self.error_text, show_line_numbers=True, read_only=True
+        summary = f"{type(exc).__name__}: {exc}"
+        if count > 1:
+            summary = f"{summary} (happened {count} times)"
+        self.summary_label = Label(summary, id="error-summary")
+        self.traceback_section = Collapsible(
+            title="Traceback", collapsed=True, id="error-traceback"
         )
-        self.text_area.scroll_end(duration=0.5)
-        self.text_area.move_cursor(self.text_area.document.end)
+        self.text_area: TextArea | None = None
+
+    @classmethod
+    def from_record(cls, record: ErrorRecord) -> "ErrorModal":
+        modal = cls(record.exc, error_title=record.title, count=record.count)
+        modal.record = record
+        return modal
+
+    @property
+    def error_text(self) -> str:
+        if self.record is not None:
+            return self.record.traceback_text
+        if self._error_text is None:
+            self._error_text = "".join(traceback.format_exception(self.exc))
+        return self._error_text
 
     def compose(self):
         yield Header()
         yield Vertical(
-            Horizontal(self.text_area, classes="centered"),
+            Horizontal(self.summary_label, classes="centered summary-height"),
+            self.traceback_section,
             Horizontal(
                 Button("OK", variant="error", classes="centered"),
                 classes="centered button-height",
             ),
         )
 
+    @on(Collapsible.Expanded, "#error-traceback")
+    async def show_traceback(self):
+        if self.text_area is not None:
+            return
+        self.text_area = TextArea(
+            self.error_text, show_line_numbers=True, read_only=True
+        )
+        await self.traceback_section.query_one(Collapsible.Contents).mount(
+            self.text_area
+        )
+        self.text_area.move_cursor(self.text_area.document.end)
+        self.text_area.scroll_end(duration=0.5)
+
     @on(Button.Pressed)
     def on_button_pressed(self):
         self.dismiss()
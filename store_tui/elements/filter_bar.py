@@ -0,0 +1,24 @@
+from textual.widgets import Input
+
+
+class FilterBar(Input):
+    """Input for filtering the result table, hidden until opened"""
+
+    BINDINGS = [("escape", "close", "Close filter")]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, placeholder="Filter by name or summary", **kwargs)
+        # hidden widgets can still be auto-focused, disabled ones cannot
+        self.display = False
+        self.disabled = True
+
+    def open(self):
+        self.display = True
+        self.disabled = False
+        self.focus()
+
+    def action_close(self):
+        self.value = ""
+        self.display = False
+        self.disabled = True
+        self.screen.focus_next()
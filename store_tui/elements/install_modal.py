@@ -16,11 +16,14 @@ from textual.widgets import (
 from textual.widgets.selection_list import Selection
 from textual.worker import Worker, WorkerState
 
+from store_tui.channel_matrix import ChannelMatrix
 from store_tui.elements.error_modal import ErrorModal
 from store_tui.elements.progress_bar_with_message import ProgressBarWithMessage
 from store_tui.elements.settings_list import SettingsList
 from store_tui.elements.snap_channel_tree import SnapChannelTree
 from store_tui.elements.utils import get_platform_architecture
+from store_tui.revisions import RevisionHistoryCache
+from store_tui.snap_state import SnapStateStore
 
 MODAL_CSS_PATH = Path(__file__).parent.parent / "styles" / "install_modal.tcss"
 
@@ -44,12 +47,20 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
         snap_info: InfoResponse,
         snap_install_data: SingleInstalledSnapResponse | None,
         api: SnapClient,
+        snap_state: SnapStateStore,
+        revision_history: RevisionHistoryCache | None = None,
+        channel_matrix: ChannelMatrix | None = None,
     ) -> None:
         super().__init__()
         self.snap_info = snap_info
         self.snap_install_data = snap_install_data
         self.api = api
+        self.snap_state = snap_state
+        self.revision_history = revision_history or RevisionHistoryCache(api.store)
         self.current_architecture = get_platform_architecture()
+        self.channel_matrix = channel_matrix or ChannelMatrix.from_channel_map(
+            snap_info.channel_map
+        )
         self.channel_info = self.organize_channel_tree()
         self.current_arch_channels = {
             f"{channel.channel.track}/{channel.channel.name}": channel
@@ -71,6 +82,9 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
 
         self.channel_tree = SnapChannelTree(
             self.current_arch_channels[self.selected_channel.name],
+            snap_name=self.snap_info.name,
+            architecture=self.current_architecture,
+            revision_history=self.revision_history,
             classes="snap-channel-info",
         )
 
@@ -100,14 +114,15 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
         return self.dismiss(self.snap_install_data)
 
     async def on_mount(self):
-        await self.toggle_is_installed()
+        self.snap_state.subscribe(self)
+        self.toggle_is_installed()
 
-    async def check_is_installed(self):
+    def check_is_installed(self):
         """
-        Asynchronously checks if the snap is installed and updates the installation status.
-        This method retrieves the installation information of the snap using the API and
-        updates the `is_installed` and `same_channel_installed` attributes based on the
-        retrieved data.
+        Checks if the snap is installed and updates the installation status.
+        This method uses the installation information last published by the snap state
+        store and updates the `is_installed` and `same_channel_installed` attributes
+        based on it, without querying snapd.
         Attributes:
             snap_install_data (SnapInfo): The installation data of the snap.
             is_installed (bool): True if the snap is installed, False otherwise.
@@ -121,8 +136,6 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
             self.same_channel_installed = False
             return
 
-        # get installed snap info
-        self.snap_install_data = await self.api.snaps.get_snap_info(self.snap_info.name)
         if self.snap_install_data and isinstance(
             self.snap_install_data.result, InstalledSnap
         ):
@@ -134,9 +147,9 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
             self.is_installed = False
             self.same_channel_installed = False
 
-    async def toggle_is_installed(self, disable_all: bool = False):
+    def toggle_is_installed(self, disable_all: bool = False):
         """
-        Asynchronously toggles the installation status of the application.
+        Toggles the installation status of the application.
         This method enables or disables the install and uninstall buttons based on
         the installation status of the application. If `disable_all` is set to True,
         both buttons will be disabled regardless of the installation status.
@@ -149,7 +162,7 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
             self.install_button.disabled = True
             self.uninstall_button.disabled = True
         else:
-            await self.check_is_installed()
+            self.check_is_installed()
             # TODO: this needs to be implemented in snap-python: "and self.same_channel_installed"
             self.install_button.disabled = self.is_installed
             self.uninstall_button.disabled = not self.is_installed
@@ -221,8 +234,8 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
         """
         Perform the installation or removal of a snap package asynchronously.
         This method handles the installation or removal of a snap package based on the
-        `install` parameter. It updates the installation progress bar and status messages
-        accordingly.
+        `install` parameter. The change is followed by the snap state store, whose
+        progress events update the progress bar and status messages.
         Args:
             install (bool): If True, install the snap package. If False, remove the snap package.
             **kwargs: Additional keyword arguments to pass to the snap installation or removal API.
@@ -232,7 +245,7 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
             Exception: If there is an error during the snap installation or removal process.
         """
 
-        await self.toggle_is_installed(disable_all=True)
+        self.toggle_is_installed(disable_all=True)
         if install:
             response = await self.api.snaps.install_snap(
                 wait=False,
@@ -243,24 +256,38 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
                 self.snap_info.name, purge=True, terminate=True, wait=False
             )
 
-        async for change in self.api.get_changes_by_id_generator(response.change):
-            if change.ready:
-                # set progress bar to 100% and exit loop
-                self.install_progress_bar.progress_bar.total = (
-                    self.install_progress_bar.progress_bar.progress
-                )
-                self.install_progress_bar.message.update("Operation Complete")
-                break
-            active_tasks = [t for t in change.result.tasks if t.status == "Doing"]
+        # followed in an app worker, so the change is tracked to completion even if
+        # this modal is dismissed first
+        tracker = self.app.run_worker(
+            self.snap_state.track_change(self.snap_info.name, response.change),
+            group="snap-changes",
+            exit_on_error=False,
+        )
+        await tracker.wait()
 
-            self.install_progress_bar.progress_bar.total = (
-                change.result.overall_progress.total
-            )
-            self.install_progress_bar.progress_bar.progress = (
-                change.result.overall_progress.done
-            )
-            if active_tasks:
-                self.install_progress_bar.message.update(active_tasks[0].summary)
+    @on(SnapStateStore.ChangeProgress)
+    def on_change_progress(self, event: SnapStateStore.ChangeProgress):
+        if self.snap_info is None or event.snap_name != self.snap_info.name:
+            return
+        transfer = None
+        if event.task_kind == "download-snap" and event.task_total > 0:
+            transfer = (event.task_done, event.task_total)
+        self.install_progress_bar.set_progress(
+            event.done, event.total, event.summary, transfer=transfer
+        )
+
+    @on(SnapStateStore.ChangeFinished)
+    def on_change_finished(self, event: SnapStateStore.ChangeFinished):
+        if self.snap_info is None or event.snap_name != self.snap_info.name:
+            return
+        self.install_progress_bar.complete(event.error or "Operation Complete")
+
+    @on(SnapStateStore.InstallStateChanged)
+    def on_install_state_changed(self, event: SnapStateStore.InstallStateChanged):
+        if self.snap_info is None or event.snap_name != self.snap_info.name:
+            return
+        self.snap_install_data = event.state.install_data
+        self.toggle_is_installed()
 
     @on(Worker.StateChanged)
     async def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
@@ -269,16 +296,19 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
 
         This method handles the state changes of a worker. If the worker state is
         `ERROR`, it toggles the installation status and displays an error modal
-        with the error message. If the worker state is `SUCCESS`, it fetches and
-        updates the snap installation data.
+        with the error message. If the worker state is `SUCCESS`, it re-enables the
+        buttons from the install state the snap state store has published.
 
         Args:
             event (Worker.StateChanged): The event object containing the new state
             of the worker.
         """
+        if self.snap_info is None:
+            # modal already dismissed and released
+            return
 
         if event.state == WorkerState.ERROR:
-            await self.toggle_is_installed()
+            self.toggle_is_installed()
             self.app.push_screen(
                 ErrorModal(
                     event.worker.error,
@@ -286,7 +316,7 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
                 )
             )
         elif event.state == WorkerState.SUCCESS:
-            await self.toggle_is_installed()
+            self.toggle_is_installed()
 
     @on(ListView.Selected)
     @on(ListView.Highlighted)
@@ -309,38 +339,32 @@ class InstallModal(ModalScreen[SingleInstalledSnapResponse]):
         self.update_snap_settings_list(
             self.current_arch_channels[self.selected_channel.name]
         )
-        await self.toggle_is_installed()
+        self.toggle_is_installed()
 
     def organize_channel_tree(self) -> dict[str, list[ChannelMapItem]]:
         """
         Organize channels by architecture and sort them by release date.
 
-        This method processes the `channel_map` attribute of `snap_info` to group
-        channels by their architecture. Each group of channels is then sorted in
-        descending order based on their release date.
+        The grouping comes from the channel matrix, which is built in a single pass
+        over the `channel_map` of `snap_info` and shared with the snap screen.
 
         Returns:
             dict[str, list[ChannelMapItem]]: A dictionary where the keys are
             architecture strings and the values are lists of `ChannelMapItem`
             objects sorted by their release date in descending order.
         """
-
-        architectures = set()
-        for channel_item in self.snap_info.channel_map:
-            architectures.add(channel_item.channel.architecture)
-
-        organized_channels = {}
-        for architecture in architectures:
-            channels = [
-                c
-                for c in self.snap_info.channel_map
-                if c.channel.architecture == architecture
-            ]
-            organized_channels[architecture] = sorted(
-                channels, key=lambda x: x.channel.released_at, reverse=True
-            )
-
-        return organized_channels
+        return self.channel_matrix.by_architecture()
+
+    def release(self):
+        """Drop the channel widgets and snap info of a dismissed modal"""
+        self.snap_state.unsubscribe(self)
+        self.snap_info = None
+        self.channel_info = {}
+        self.channel_matrix = None
+        self.current_arch_channels = {}
+        self.available_channels = []
+        self.channel_list = None
+        self.channel_tree = None
 
     def compose(self):
         yield Horizontal(
@@ -0,0 +1,40 @@
+from typing import Callable
+
+import humanize
+from textual.widgets import Label
+
+
+class InstrumentationOverlay(Label):
+    """Small overlay with process memory and cache statistics, refreshed periodically"""
+
+    def __init__(
+        self,
+        get_stats: Callable[[], dict[str, int | None]],
+        *args,
+        refresh_interval: float = 1.0,
+        show: bool = False,
+        **kwargs,
+    ):
+        super().__init__("", *args, **kwargs)
+        self.get_stats = get_stats
+        self.refresh_interval = refresh_interval
+        self.display = show
+
+    def on_mount(self):
+        self.set_interval(self.refresh_interval, self.refresh_stats)
+        self.refresh_stats()
+
+    def toggle(self):
+        self.display = not self.display
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        if not self.display:
+            return
+        stats = self.get_stats()
+        rss = stats.get("rss")
+        self.update(
+            f"RSS: {humanize.naturalsize(rss) if rss is not None else 'n/a'}"
+            f" | retained: {humanize.naturalsize(stats.get('retained_bytes') or 0)}"
+            f" | recent snaps: {stats.get('recent_snaps', 0)}"
+        )
@@ -1,12 +1,33 @@
+import time
+
 from textual.containers import Horizontal
+from textual.timer import Timer
 from textual.widget import Widget
 from textual.widgets import Label, ProgressBar
 
+from store_tui.progress import RateEstimator
+
+# progress is polled much faster than it is useful to repaint it
+MAX_PROGRESS_FPS = 10
+
 
 class ProgressBarWithMessage(Widget):
-    def __init__(self, name=None, id=None, classes=None, disabled=False):
+    def __init__(
+        self,
+        name=None,
+        id=None,
+        classes=None,
+        disabled=False,
+        max_fps: float = MAX_PROGRESS_FPS,
+    ):
         self.progress_bar = ProgressBar(id="progress-bar")
         self.message = Label("", id="progress-bar-message")
+        self.min_interval = 1 / max_fps
+        self.rate_estimator = RateEstimator()
+        self._pending: tuple[float | None, float, str] | None = None
+        self._shown: tuple[float | None, float, str] | None = None
+        self._last_render = 0.0
+        self._render_timer: Timer | None = None
 
         super().__init__(
             self.message, name=name, id=id, classes=classes, disabled=disabled
@@ -14,3 +35,58 @@ class ProgressBarWithMessage(Widget):
 
     def compose(self):
         yield Horizontal(self.progress_bar, self.message)
+
+    def set_progress(
+        self,
+        done: float,
+        total: float | None,
+        message: str = "",
+        transfer: tuple[int, int] | None = None,
+    ):
+        """Queue a progress update, rendered at most `max_fps` times a second
+
+        Args:
+            done (float): progress so far
+            total (float | None): total progress, None if unknown
+            message (str, optional): status message. Defaults to "".
+            transfer (tuple[int, int] | None, optional): (bytes done, bytes total)
+                of a running download, to show its rate and ETA. Defaults to None.
+        """
+        if transfer is None:
+            self.rate_estimator.reset()
+        else:
+            self.rate_estimator.add(*transfer)
+            rate = self.rate_estimator.describe()
+            if rate:
+                message = f"{message} ({rate})" if message else rate
+        self._pending = (total, done, message)
+
+        wait = self._last_render + self.min_interval - time.monotonic()
+        if wait <= 0:
+            self.render_progress()
+        elif self._render_timer is None:
+            self._render_timer = self.set_timer(wait, self.render_progress)
+
+    def complete(self, message: str):
+        """Fill the bar and show a final message straight away"""
+        self.rate_estimator.reset()
+        progress = self.progress_bar.progress
+        self._pending = (progress or 1, progress or 1, message)
+        self.render_progress()
+
+    def render_progress(self):
+        """Render the latest queued update, skipping values that are already shown"""
+        if self._render_timer is not None:
+            self._render_timer.stop()
+            self._render_timer = None
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        self._last_render = time.monotonic()
+        total, done, message = pending
+        shown_total, shown_done, shown_message = self._shown or (None, None, None)
+        if (total, done) != (shown_total, shown_done):
+            self.progress_bar.update(total=total, progress=done)
+        if message != shown_message:
+            self.message.update(message)
+        self._shown = pending
@@ -0,0 +1,210 @@
+from collections import defaultdict
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def is_subsequence(query: str, text: str) -> bool:
+    """Whether all characters of `query` appear in `text`, in order"""
+    remaining = iter(text)
+    return all(char in remaining for char in query)
+
+
+class ResultIndex:
+    """Precomputed sort keys, and trigram and character indexes over a result table
+
+    Built once per result set, so that filtering and re-sorting the table never
+    has to casefold, re-sort or rescan every row: substring matches are looked up
+    by trigram, and fuzzy matches are only tried on the rows that contain every
+    character of the query. Single rows can be added, replaced or removed
+    afterwards without rebuilding the index.
+
+    Args:
+        rows (list[tuple[str, str | None]]): (name, summary) rows
+    """
+
+    def __init__(self, rows: list[tuple[str, str | None]]) -> None:
+        self.rows = rows
+        self.names = [name.casefold() for name, _ in rows]
+        self.summaries = [(summary or "").casefold() for _, summary in rows]
+        # one key list per table column, in column order
+        self.sort_keys = (self.names, self.summaries)
+        self.row_ids = {name: row_id for row_id, (name, _) in enumerate(rows)}
+        # ids of removed rows, which keep their slot so other ids stay valid
+        self.removed: set[int] = set()
+        self._sorted_ids: dict[int, list[int]] = {}
+
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._char_postings: dict[str, set[int]] = defaultdict(set)
+        for row_id in range(len(rows)):
+            self._add_postings(row_id)
+
+    def __len__(self) -> int:
+        return len(self.rows) - len(self.removed)
+
+    def live_rows(self) -> list[tuple[str, str | None]]:
+        """Rows that have not been removed, in their original order"""
+        return [
+            row for row_id, row in enumerate(self.rows) if row_id not in self.removed
+        ]
+
+    def upsert(self, name: str, summary: str | None) -> int:
+        """Replace the row with this name, or add it at the end
+
+        Args:
+            name (str): snap name
+            summary (str | None): snap summary
+
+        Returns:
+            int: id of the row
+        """
+        row_id = self.row_ids.get(name)
+        if row_id is None:
+            row_id = len(self.rows)
+            self.rows.append((name, summary))
+            self.names.append(name.casefold())
+            self.summaries.append((summary or "").casefold())
+            self.row_ids[name] = row_id
+        else:
+            self._remove_postings(row_id)
+            self.rows[row_id] = (name, summary)
+            self.summaries[row_id] = (summary or "").casefold()
+        self._add_postings(row_id)
+        self._sorted_ids.clear()
+        return row_id
+
+    def remove(self, name: str) -> int | None:
+        """Remove the row with this name
+
+        Args:
+            name (str): snap name
+
+        Returns:
+            int | None: id of the removed row, None if there was no such row
+        """
+        row_id = self.row_ids.pop(name, None)
+        if row_id is None:
+            return None
+        self._remove_postings(row_id)
+        self.removed.add(row_id)
+        self._sorted_ids.clear()
+        return row_id
+
+    def _row_trigrams(self, row_id: int) -> set[str]:
+        return trigrams(self.names[row_id]) | trigrams(self.summaries[row_id])
+
+    def _row_characters(self, row_id: int) -> set[str]:
+        return set(self.names[row_id]) | set(self.summaries[row_id])
+
+    def _add_postings(self, row_id: int):
+        for trigram in self._row_trigrams(row_id):
+            self._postings[trigram].add(row_id)
+        for char in self._row_characters(row_id):
+            self._char_postings[char].add(row_id)
+
+    def _remove_postings(self, row_id: int):
+        for trigram in self._row_trigrams(row_id):
+            self._postings[trigram].discard(row_id)
+        for char in self._row_characters(row_id):
+            self._char_postings[char].discard(row_id)
+
+    @staticmethod
+    def _lookup(postings: dict[str, set[int]], keys: set[str]) -> list[int]:
+        """Ids of the rows posted under every key, in row order"""
+        matches = sorted((postings.get(key, set()) for key in keys), key=len)
+        return sorted(set.intersection(*matches))
+
+    def sorted_ids(self, column: int) -> list[int]:
+        """Row ids ordered by the given column, computed once per column
+
+        Args:
+            column (int): column index
+
+        Returns:
+            list[int]: row ids in ascending order of the column
+        """
+        if column not in self._sorted_ids:
+            keys = self.sort_keys[column]
+            self._sorted_ids[column] = sorted(
+                (
+                    row_id
+                    for row_id in range(len(self.rows))
+                    if row_id not in self.removed
+                ),
+                key=keys.__getitem__,
+            )
+        return self._sorted_ids[column]
+
+    def search(self, query: str) -> list[int]:
+        """Find rows matching the query
+
+        Rows whose name or summary contains the query come first, followed by rows
+        whose name contains the query's characters in order (fuzzy match).
+
+        Args:
+            query (str): filter text
+
+        Returns:
+            list[int]: matching row ids, best matches first
+        """
+        query = query.casefold().strip()
+        if not query:
+            return [
+                row_id for row_id in range(len(self.rows)) if row_id not in self.removed
+            ]
+
+        # every match, substring or fuzzy, contains all of the query's characters
+        candidates = self._lookup(self._char_postings, set(query))
+        query_trigrams = trigrams(query)
+        substring_matches = [
+            row_id
+            for row_id in (
+                self._lookup(self._postings, query_trigrams)
+                if query_trigrams
+                else candidates
+            )
+            if query in self.names[row_id] or query in self.summaries[row_id]
+        ]
+
+        matched = set(substring_matches)
+        fuzzy_matches = [
+            row_id
+            for row_id in candidates
+            if row_id not in matched and is_subsequence(query, self.names[row_id])
+        ]
+        return substring_matches + fuzzy_matches
+
+    def matches(self, row_id: int, query: str) -> bool:
+        """Whether a single row would be found by `search(query)`"""
+        query = query.casefold().strip()
+        name = self.names[row_id]
+        return (
+            not query
+            or query in name
+            or query in self.summaries[row_id]
+            or is_subsequence(query, name)
+        )
+
+    def view(
+        self, query: str = "", sort_column: int | None = None, reverse: bool = False
+    ) -> list[int]:
+        """Row ids to display for a filter and sort order
+
+        Args:
+            query (str, optional): filter text. Defaults to "".
+            sort_column (int | None, optional): column to sort by, None keeps the
+                store's order (or match ranking when filtering). Defaults to None.
+            reverse (bool, optional): sort descending. Defaults to False.
+
+        Returns:
+            list[int]: row ids in display order
+        """
+        matches = self.search(query)
+        if sort_column is None:
+            return matches[::-1] if reverse else matches
+        matched = set(matches)
+        ordered = [
+            row_id for row_id in self.sorted_ids(sort_column) if row_id in matched
+        ]
+        return ordered[::-1] if reverse else ordered
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from textual.app import ComposeResult
+from textual.screen import ModalScreen
+from textual.widgets import DataTable, Footer, Header, Label
+
+from store_tui.config import ENV_PREFIX, ENV_SECTION_SEPARATOR, Settings
+
+SETTINGS_CSS_PATH = Path(__file__).parent.parent / "styles" / "settings_modal.tcss"
+
+
+class SettingsModal(ModalScreen):
+    """Read-only view of the settings in effect, and where to change them"""
+
+    CSS_PATH = SETTINGS_CSS_PATH
+    BINDINGS = [("escape,q", "dismiss", "Close")]
+
+    def __init__(self, settings: Settings, config_path: Path | None) -> None:
+        super().__init__()
+        self.settings = settings
+        self.config_path = config_path
+        self.title = "Settings"
+        self.settings_table = DataTable(
+            id="settings-table", cursor_type="row", zebra_stripes=True
+        )
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        source = self.config_path if self.config_path is not None else "no file"
+        yield Label(
+            f"Config file: {source}\n"
+            f"Set [section] keys there, or {ENV_PREFIX}<SECTION>"
+            f"{ENV_SECTION_SEPARATOR}<KEY> variables. Changes apply on restart.",
+            id="settings-help",
+            markup=False,
+        )
+        yield self.settings_table
+        yield Footer()
+
+    def on_mount(self):
+        self.settings_table.add_columns("Setting", "Value", "Source")
+        for key, value, is_set in self.settings.describe():
+            self.settings_table.add_row(
+                key, str(value), "configured" if is_set else "default", key=key
+            )
+        self.settings_table.focus()
@@ -1,36 +1,126 @@
-import humanize
+import logging
+
 from snap_python.schemas.store.info import ChannelMapItem
+from textual import on, work
 from textual.widget import Widget
 from textual.widgets import Tree
+from textual.widgets.tree import TreeNode
+
+from store_tui.revisions import RevisionEntry, RevisionHistory, RevisionHistoryCache
+
+logger = logging.getLogger(__name__)
+
+HISTORY_NODE = "history"
+LOAD_MORE_NODE = "load-more"
 
 
 class SnapChannelTree(Widget):
+    """Details of a channel's current revision, with the older revisions below it
+
+    The history node loads a page of older revisions when it is first expanded,
+    and a "load older" leaf fetches the next page on demand.
+    """
+
     def __init__(
-        self, channel: ChannelMapItem, name=None, id=None, classes=None, disabled=False
+        self,
+        channel: ChannelMapItem,
+        snap_name: str | None = None,
+        architecture: str | None = None,
+        revision_history: RevisionHistoryCache | None = None,
+        name=None,
+        id=None,
+        classes=None,
+        disabled=False,
     ):
         super().__init__(name=name, id=id, classes=classes, disabled=disabled)
-        self.channel = channel
+        self.snap_name = snap_name
+        self.architecture = architecture
+        self.revision_history = revision_history
+        self.history: RevisionHistory | None = None
+        self.channel_tree = Tree("")
+        self.channel_tree.styles.overflow_x = "hidden"
+        self.history_node: TreeNode | None = None
         self.update_tree(channel)
 
     def update_tree(self, channel: ChannelMapItem):
         self.channel = channel
-        channel_name = f"{channel.channel.track}/{channel.channel.name}"
-        self.channel_tree = Tree(channel_name)
-        self.channel_tree.styles.overflow_x = "hidden"
-        self.channel_tree.root.expand()
-        self.channel_tree.root.add_leaf(f"Revision: {channel.revision}")
-        self.channel_tree.root.add_leaf(
-            f"Size: {humanize.naturalsize(channel.download.size)}"
-        )
-        self.channel_tree.root.add_leaf(f"Version: {channel.version}")
-        release_node = self.channel_tree.root.add(
-            f"Released: {humanize.naturaltime(channel.channel.released_at)}"
+        if self.is_mounted:
+            self.workers.cancel_group(self, "revision-history")
+        current = RevisionEntry.from_channel(channel)
+
+        self.channel_tree.clear()
+        self.channel_tree.root.set_label(
+            f"{channel.channel.track}/{channel.channel.name}"
         )
-        release_node.add(f"{channel.channel.released_at}")
-        self.channel_tree.root.add_leaf(f"Confinement: {channel.confinement}")
+        self.channel_tree.root.expand()
+        self.channel_tree.root.add_leaf(f"Revision: {current.revision}")
+        self.channel_tree.root.add_leaf(f"Size: {current.size}")
+        self.channel_tree.root.add_leaf(f"Version: {current.version}")
+        release_node = self.channel_tree.root.add(f"Released: {current.created}")
+        release_node.add(f"{current.created_at}")
+        self.channel_tree.root.add_leaf(f"Confinement: {current.confinement}")
 
-        if self.is_mounted:
-            self.refresh(recompose=True)
+        self.history = None
+        self.history_node = None
+        if self.revision_history is not None and self.snap_name and self.architecture:
+            self.history = self.revision_history.get(
+                self.snap_name, channel, self.architecture
+            )
+            self.history_node = self.channel_tree.root.add(
+                "Older revisions", data=HISTORY_NODE, allow_expand=True
+            )
 
     def compose(self):
         yield self.channel_tree
+
+    def show_history(self):
+        """Show the revisions loaded so far, and a leaf to load more if there are any"""
+        if self.history is None or self.history_node is None:
+            return
+        self.history_node.remove_children()
+        for entry in self.history.entries:
+            self.history_node.add_leaf(entry.label, data=entry)
+        if not self.history.exhausted:
+            self.history_node.add_leaf("Load older revisions...", data=LOAD_MORE_NODE)
+        elif not self.history.entries:
+            self.history_node.add_leaf("No older revisions")
+
+    @on(Tree.NodeExpanded)
+    def on_node_expanded(self, event: Tree.NodeExpanded):
+        if event.node is not self.history_node or self.history is None:
+            return
+        # revisions already in the cache are shown without a request
+        if self.history.entries or self.history.exhausted:
+            self.show_history()
+        else:
+            self.load_history()
+
+    @on(Tree.NodeSelected)
+    def on_node_selected(self, event: Tree.NodeSelected):
+        if event.node.data == LOAD_MORE_NODE:
+            self.load_history()
+
+    @work(exclusive=True, group="revision-history", exit_on_error=False)
+    async def load_history(self):
+        history, history_node = self.history, self.history_node
+        if history is None or history_node is None:
+            return
+        for child in history_node.children:
+            if child.data == LOAD_MORE_NODE:
+                child.set_label("Loading...")
+                break
+        else:
+            history_node.add_leaf("Loading...", data=LOAD_MORE_NODE)
+        try:
+            await self.revision_history.load_more(history)
+        except Exception as e:
+            logger.warning(
+                "Error loading revisions of %s", history.snap_name, exc_info=True
+            )
+            if history is self.history:
+                self.show_history()
+                history_node.add_leaf(f"Could not load revisions: {e}")
+            return
+        # the channel may have changed while the page was loading
+        if history is self.history:
+            self.show_history()
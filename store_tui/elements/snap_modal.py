@@ -1,32 +1,39 @@
-import tempfile
 from pathlib import Path
 
-import httpx
-import humanize
 from rich_pixels import Pixels
 from snap_python.client import SnapClient
-from snap_python.schemas.common import BaseErrorResult, Media
 from snap_python.schemas.snaps import SingleInstalledSnapResponse
 from snap_python.schemas.store.info import InfoResponse
 from textual import on, work
+from textual.binding import Binding
 from textual.containers import Horizontal, Vertical, VerticalScroll
 from textual.screen import ModalScreen
 from textual.widgets import Button, Footer, Label, Markdown, Static
 
+from store_tui.channel_matrix import ChannelMatrix
+from store_tui.elements.architecture_modal import ArchitectureMatrixModal
 from store_tui.elements.clickable_link import ClickableLink
 from store_tui.elements.install_modal import InstallModal
-from store_tui.elements.utils import get_platform_architecture
+from store_tui.imaging import get_imaging_executor, get_placeholder_icon
+from store_tui.launcher import ExternalLauncher
+from store_tui.navigation import LoadedSnap, SnapNavigator
+from store_tui.revisions import RevisionHistoryCache
+from store_tui.snap_state import SnapStateStore
+from store_tui.view_model import SnapViewModel, get_last_updated_message
 
 MODAL_CSS_PATH = Path(__file__).parent.parent / "styles" / "snap_modal.tcss"
-
-BASE_DIR = Path(__file__).parent.parent.parent
-SCHEMAS_DIR = BASE_DIR / "store_tui" / "schemas"
-PLACEHOLDER_ICON_FILEPATH = SCHEMAS_DIR / "images" / "placeholder.png"
+ICON_TIMEOUT = 5.0
 
 
 class SnapModal(ModalScreen):
     CSS_PATH = MODAL_CSS_PATH
-    BINDINGS = [("q", "dismiss", "Close"), ("i", "modify", "Install/Modify")]
+    BINDINGS = [
+        ("q", "dismiss", "Close"),
+        ("i", "modify", "Install/Modify"),
+        ("a", "compare_architectures", "Architectures"),
+        Binding("n,right_square_bracket", "next_snap", "Next"),
+        Binding("p,left_square_bracket", "previous_snap", "Previous"),
+    ]
 
     def __init__(
         self,
@@ -34,172 +41,271 @@ class SnapModal(ModalScreen):
         api: SnapClient,
         snap_info: InfoResponse,
         snap_install_data: SingleInstalledSnapResponse | None,
+        snap_state: SnapStateStore,
+        icon: Pixels | None = None,
+        icon_timeout: float = ICON_TIMEOUT,
+        revision_history: RevisionHistoryCache | None = None,
+        launcher: ExternalLauncher | None = None,
+        view_model: SnapViewModel | None = None,
+        navigator: SnapNavigator | None = None,
     ) -> None:
         super().__init__()
         self.snap_name = snap_name
         self.api = api
+        self.snap_state = snap_state
         self.snap_info = snap_info
         self.snap = self.snap_info.snap
         self.snap_install_data = snap_install_data
-        if not self.snap:
-            raise ValueError(f"Snap with name {self.snap_name} not found")
-        self.title = self.snap.title
+        if view_model is None:
+            view_model = SnapViewModel.from_info(snap_name, snap_info)
+        self.view_model = view_model.with_install_data(snap_install_data)
+        self.title = self.view_model.title
 
-        self.icon_obj = Static()
-        try:
-            self.download_icon()
-        except Exception:
-            self.icon_obj = Pixels.from_image_path(
-                PLACEHOLDER_ICON_FILEPATH, resize=(16, 16)
-            )
+        self.icon_timeout = icon_timeout
+        self.revision_history = revision_history
+        self.launcher = launcher or ExternalLauncher()
+        self.navigator = navigator
+        # snap the latest next/previous key press is heading to
+        self.target_snap: str | None = None
+        # show the placeholder until the real icon has been rendered in the pool
+        self.icon_is_placeholder = icon is None
+        self.icon_obj = icon or get_placeholder_icon()
+        self.icon_widget = Static(self.icon_obj, classes="centered snap-icon")
 
-        self.supported_architectures = self.get_architectures()
         self.installed_label = Label(
-            "", classes="details-item", id="is-installed-label", shrink=True
+            self.view_model.installed_message,
+            classes="details-item",
+            id="is-installed-label",
+            shrink=True,
+        )
+        # the content widgets are kept to show another snap in place
+        self.title_label = Label(self.view_model.title)
+        self.publisher_label = Label(self.view_model.publisher)
+        self.summary_label = Label(self.view_model.summary, classes="summary")
+        self.description = Markdown(self.view_model.description, id="description-text")
+        self.license_label = self.details_label(self.view_model.license)
+        self.supported_label = self.details_label(self.view_model.supported_label)
+        self.store_link = ClickableLink(
+            text="Store Page",
+            url=self.view_model.store_url,
+            launcher=self.launcher,
+            classes="details-item link",
+            shrink=True,
+        )
+        self.app_center_link = ClickableLink(
+            text="App Center Page",
+            url=self.view_model.app_center_url,
+            launcher=self.launcher,
+            classes="details-item link",
+            shrink=True,
+        )
+        self.architectures_label = self.details_label(
+            self.view_model.architectures_label
         )
 
-    def set_installed_message(self):
-        if self.snap_install_data is None:
-            snap_install_message = "Installed: 🚫 (snapd unaccessible)"
-        elif isinstance(self.snap_install_data.result, BaseErrorResult):
-            snap_install_message = "Installed: ❌"
-        else:
-            installed_version = (
-                f"v{self.snap_install_data.result.version}"
-                if self.snap_install_data.result.version
-                else f"rev. {self.snap_install_data.result.revision}"
-            )
-            snap_install_message = f"Installed: ✅ ({installed_version})"
+    @staticmethod
+    def details_label(text: str) -> Label:
+        return Label(text, classes="details-item", shrink=True)
 
+    def set_installed_message(self):
         self.installed_label: Label = self.query_one("#is-installed-label")
-        self.installed_label.update(snap_install_message)
+        self.installed_label.update(self.view_model.installed_message)
 
     @on(Button.Pressed, "#install-button")
     @work
     async def action_modify(self):
-        new_install_data = await self.app.push_screen(
-            InstallModal(
-                self.snap_info,
-                snap_install_data=self.snap_install_data,
-                api=self.api,
-            ),
-            wait_for_dismiss=True,
+        install_modal = InstallModal(
+            self.snap_info,
+            snap_install_data=self.snap_install_data,
+            api=self.api,
+            snap_state=self.snap_state,
+            revision_history=self.revision_history,
+            channel_matrix=self.channel_matrix,
+        )
+        await self.app.push_screen(install_modal, wait_for_dismiss=True)
+        install_modal.release()
+
+    @on(SnapStateStore.InstallStateChanged)
+    def on_install_state_changed(self, event: SnapStateStore.InstallStateChanged):
+        if event.snap_name != self.snap_name or self.snap_info is None:
+            return
+        self.snap_install_data = event.state.install_data
+        self.view_model = self.view_model.with_install_data(self.snap_install_data)
+        self.set_installed_message()
+
+    @property
+    def channel_matrix(self) -> ChannelMatrix:
+        return self.view_model.channel_matrix
+
+    def action_compare_architectures(self):
+        self.app.push_screen(
+            ArchitectureMatrixModal(self.view_model.title, self.channel_matrix)
+        )
+
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
+        if action in ("next_snap", "previous_snap") and self.navigator is None:
+            return False
+        return True
+
+    def action_next_snap(self):
+        self.navigate(1)
+
+    def action_previous_snap(self):
+        self.navigate(-1)
+
+    @work(exclusive=True, group="navigate", exit_on_error=False)
+    async def navigate(self, step: int):
+        """Show the snap `step` rows away in the result table, in this screen
+
+        Key presses made while a snap loads move on from the snap being loaded,
+        and the last one wins.
+        """
+        if self.navigator is None or self.snap_info is None:
+            return
+        snap_name = self.navigator.neighbour(self.target_snap or self.snap_name, step)
+        if snap_name is None:
+            self.app.bell()
+            return
+        self.target_snap = snap_name
+        self.navigator.move_cursor(snap_name)
+        try:
+            loaded_snap = await self.navigator.load(snap_name)
+        except Exception as e:
+            self.target_snap = None
+            self.navigator.move_cursor(self.snap_name)
+            self.notify(str(e), title=f"Could not load {snap_name}", severity="error")
+            return
+        if self.snap_info is None:
+            # dismissed while loading
+            return
+        self.target_snap = None
+        await self.show_snap(loaded_snap)
+
+    def current_snap(self) -> LoadedSnap:
+        return LoadedSnap(
+            snap_name=self.snap_name,
+            snap_info=self.snap_info,
+            view_model=self.view_model,
+            install_data=self.snap_install_data,
+            icon=None if self.icon_is_placeholder else self.icon_obj,
         )
-        if new_install_data:
-            self.snap_install_data = new_install_data
-            self.set_installed_message()
-
-    def get_architectures(self) -> list[str]:
-        architectures = set()
-        for channel in self.snap_info.channel_map:
-            if not channel.architectures:
-                continue
-            architectures.update(channel.architectures)
-        return sorted(architectures)
-
-    def get_last_modified_date(self) -> str:
-        # get the most recent date from all channels
-        last_modified_date = None
-        for channel in self.snap_info.channel_map:
-            if last_modified_date is None:
-                last_modified_date = channel.created_at
-                continue
-            last_modified_date = max(
-                last_modified_date,
-                channel.created_at,
-            )
-        if last_modified_date is None:
-            return "Unknown"
-        return humanize.naturaltime(last_modified_date)
-
-    def download_icon(self):
-        """download icon for snap using icon_url and create a Pixels object"""
-        icon_url = self.get_icon_url(self.snap.media)
+
+    async def show_snap(self, loaded_snap: LoadedSnap):
+        """Replace the snap shown, updating the existing widgets"""
+        self.workers.cancel_group(self, "icon")
+        if self.navigator is not None:
+            self.navigator.remember(self.current_snap())
+
+        self.snap_name = loaded_snap.snap_name
+        self.snap_info = loaded_snap.snap_info
+        self.snap = self.snap_info.snap
+        self.snap_install_data = loaded_snap.install_data
+        self.view_model = loaded_snap.view_model.with_install_data(
+            loaded_snap.install_data
+        )
+        view_model = self.view_model
+        self.title = view_model.title
+        self.title_label.update(view_model.title)
+        self.publisher_label.update(view_model.publisher)
+        self.summary_label.update(view_model.summary)
+        self.license_label.update(view_model.license)
+        self.supported_label.update(view_model.supported_label)
+        self.store_link.url = view_model.store_url
+        self.app_center_link.url = view_model.app_center_url
+        self.last_updated_label.update(
+            get_last_updated_message(view_model.last_updated)
+        )
+        self.architectures_label.update(view_model.architectures_label)
+        self.set_installed_message()
+
+        self.icon_is_placeholder = loaded_snap.icon is None
+        self.icon_obj = loaded_snap.icon or get_placeholder_icon()
+        self.icon_widget.update(self.icon_obj)
+        if self.icon_is_placeholder:
+            self.download_icon()
+
+        self.query_one("#snap-details", VerticalScroll).scroll_home(animate=False)
+        await self.description.update(view_model.description)
+        if self.navigator is not None:
+            self.navigator.prefetch_around(self.snap_name)
+
+    @work(exclusive=True, group="icon", exit_on_error=False)
+    async def download_icon(self):
+        """download icon for snap using icon_url and render it in the imaging executor"""
+        icon_url = self.view_model.icon_url
         if icon_url is None:
-            raise ValueError("Icon URL not found")
+            return
 
-        self.icon_obj = None
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            icon_path = Path(f.name)
-            icon_path.write_bytes(httpx.get(icon_url, timeout=5).content)
-            self.icon_obj = Pixels.from_image_path(icon_path, resize=(16, 16))
-
-    def get_icon_url(self, media: list[Media] | None) -> str | None:
-        """Get the icon_url from the media list"""
-        if media is None:
-            return None
-        for media_obj in media:
-            if media_obj.type == "icon":
-                return media_obj.url
-        return None
+        response = await self.api.store.store_client.get(
+            icon_url, timeout=self.icon_timeout
+        )
+        response.raise_for_status()
+        self.icon_obj = await get_imaging_executor().render(response.content)
+        self.icon_is_placeholder = False
+        self.icon_widget.update(self.icon_obj)
 
     def compose(self):
+        # relative to now, so formatted when shown rather than with the view model
+        self.last_updated_label = self.details_label(
+            get_last_updated_message(self.view_model.last_updated)
+        )
         yield Horizontal(
             Vertical(
                 Horizontal(
-                    Label(self.snap.title),
+                    self.title_label,
                     Label(" | "),
-                    Label(self.snap.publisher.display_name),
+                    self.publisher_label,
                     classes="snap-title",
                 ),
                 classes="title-container",
             ),
             classes="top-row",
         )
-        yield Horizontal(
-            Label(self.snap.summary, classes="summary"),
-            classes="summary-row",
-        )
+        yield Horizontal(self.summary_label, classes="summary-row")
         yield VerticalScroll(
             Horizontal(
                 Vertical(
                     Label("Description"),
-                    Markdown(self.snap.description, id="description-text"),
+                    self.description,
                     classes="description-box",
                 ),  # description
                 Vertical(
-                    Static(self.icon_obj, classes="centered snap-icon"),
-                    Label(
-                        f"License: {self.snap.license or 'unset'}",
-                        classes="details-item",
-                        shrink=True,
-                    ),
+                    self.icon_widget,
+                    self.license_label,
                     self.installed_label,
-                    Label(
-                        f"Supported: {'✅' if get_platform_architecture() in self.supported_architectures else '❌'} on {get_platform_architecture()}",
-                        classes="details-item",
-                        shrink=True,
-                    ),
-                    ClickableLink(
-                        text="Store Page",
-                        url=self.snap.store_url,
-                        classes="details-item link",
-                        shrink=True,
-                    ),
-                    ClickableLink(
-                        text="App Center Page",
-                        url=f"snap://{self.snap_name}",
-                        classes="details-item link",
-                        shrink=True,
-                    ),
-                    Label(
-                        f"Last Updated: {self.get_last_modified_date()}",
-                        classes="details-item",
-                        shrink=True,
-                    ),
-                    Label(
-                        f"Architectures: {", ".join(self.supported_architectures)}",
-                        classes="details-item",
-                        shrink=True,
-                    ),
+                    self.supported_label,
+                    self.store_link,
+                    self.app_center_link,
+                    self.last_updated_label,
+                    self.architectures_label,
                     classes="details-box",
                 ),  # right side
                 classes="main-row",
                 id="main-row-element",
-            )
+            ),
+            id="snap-details",
         )
         yield Footer(show_command_palette=False)
-        yield Footer(show_command_palette=False)
 
     def on_mount(self):
+        self.snap_state.subscribe(self)
         self.set_installed_message()
+        if self.icon_is_placeholder:
+            self.download_icon()
+        if self.navigator is not None:
+            self.navigator.prefetch_around(self.snap_name)
+
+    def release(self):
+        """Drop the heavy state of a dismissed modal
+
+        Textual may keep a dismissed screen alive for a while (workers, callbacks),
+        so the response and rendered icon are released explicitly.
+        """
+        self.workers.cancel_node(self)
+        self.snap_state.unsubscribe(self)
+        self.snap_info = None
+        self.snap = None
+        self.snap_install_data = None
+        self.view_model = None
+        self.icon_obj = None
+        self.icon_widget = None
@@ -1,21 +1,31 @@
 from pathlib import Path
-from typing import Coroutine, Optional
+from typing import Coroutine, Iterable, Optional
 
+from rich.text import Text
 from snap_python.schemas.store.search import SearchResponse
 from textual import on
 from textual.widgets import DataTable
-from textual.widgets.data_table import RowDoesNotExist
+from textual.widgets.data_table import ColumnKey, RowDoesNotExist
 
 from store_tui.elements.position_count import PositionCount
+from store_tui.elements.result_index import ResultIndex
+
+SORT_INDICATORS = {False: " ▲", True: " ▼"}
 
 
 class SnapResultTable(DataTable):
+    BINDINGS = [("o", "cycle_sort", "Sort")]
     MODAL_CSS_PATH = Path(__file__).parent.parent / "styles" / "main.tcss"
 
     def __init__(self, table_position_count: PositionCount, table_columns):
         super().__init__()
         self.table_position_count = table_position_count
         self.table_columns = table_columns
+        self.index = ResultIndex([])
+        self.filter_query = ""
+        self.sort_column: int | None = None
+        self.sort_reverse = False
+        self.column_keys: list[ColumnKey] = []
 
         self.call_after_refresh(self.after_init)
 
@@ -36,22 +46,160 @@ class SnapResultTable(DataTable):
         else:
             response = await top_snaps
 
-        self.table_position_count.total = len(response.results)
+        self.set_rows(
+            (snap_result.name, snap_result.snap.summary)
+            for snap_result in response.results
+        )
+        self.set_loading(False)
+
+    def set_rows(self, rows: Iterable[tuple[str, str | None]]):
+        """Replace the table contents with (name, summary) rows
+
+        The current filter and sort order stay applied to the new rows.
+
+        Args:
+            rows (Iterable[tuple[str, str | None]]): rows to show, keyed by snap name
+        """
+        if not self.columns:
+            self.setup_columns()
+        self.index = ResultIndex(list(rows))
+        self.apply_view()
+
+    def apply_view(self):
+        """Redraw the rows from the index for the current filter and sort order
+
+        The cursor stays on the same snap if it is still shown.
+        """
+        cursor_snap = None
+        if self.row_count > 0:
+            cursor_snap = self.coordinate_to_cell_key(
+                self.cursor_coordinate
+            ).row_key.value
+        row_ids = self.index.view(
+            self.filter_query, self.sort_column, self.sort_reverse
+        )
+        self.clear()
+        for row_id in row_ids:
+            name, summary = self.index.rows[row_id]
+            self.add_row(name, summary, key=name)
+        self.table_position_count.total = self.row_count
         self.table_position_count.current_number = 0
-        for snap_result in response.results:
-            self.add_row(
-                snap_result.name,
-                snap_result.snap.summary,
-                key=snap_result.name,
+        if cursor_snap in self.rows:
+            self.move_cursor(row=self.get_row_index(cursor_snap))
+
+    def upsert_row(self, name: str, summary: str | None):
+        """Add or update a single row in place, without redrawing the other rows
+
+        New rows go to the end of the table, or into place when a sort is active.
+
+        Args:
+            name (str): snap name, the row key
+            summary (str | None): snap summary
+        """
+        row_id = self.index.upsert(name, summary)
+        shown = name in self.rows
+        if not self.index.matches(row_id, self.filter_query):
+            if shown:
+                self.remove_row(name)
+        elif shown:
+            self.update_cell(name, self.column_keys[1], summary)
+        else:
+            self.add_row(name, summary, key=name)
+        if self.sort_column is not None:
+            self.sort(
+                self.column_keys[self.sort_column],
+                key=lambda value: (value or "").casefold(),
+                reverse=self.sort_reverse,
             )
-        self.set_loading(False)
+        self.table_position_count.total = self.row_count
 
-    async def after_init(self):
-        self.add_columns(*self.table_columns)
+    def remove_snap_row(self, name: str):
+        """Remove a single row, without redrawing the other rows
+
+        Args:
+            name (str): snap name, the row key
+        """
+        self.index.remove(name)
+        if name in self.rows:
+            self.remove_row(name)
+        self.table_position_count.total = self.row_count
+
+    def filter_rows(self, query: str):
+        """Only show rows whose name or summary matches the query
+
+        Args:
+            query (str): filter text, empty to show every row
+        """
+        self.filter_query = query
+        self.apply_view()
+
+    def sort_by_column(self, column: int):
+        """Cycle a column through ascending, descending and the store's order
+
+        Args:
+            column (int): column index
+        """
+        if self.sort_column != column:
+            self.set_sort(column, reverse=False)
+        elif not self.sort_reverse:
+            self.set_sort(column, reverse=True)
+        else:
+            self.set_sort(None)
+
+    def action_cycle_sort(self):
+        """Step through every column's sort orders, then back to the store's order"""
+        if self.sort_column is None:
+            self.set_sort(0)
+        elif not self.sort_reverse:
+            self.set_sort(self.sort_column, reverse=True)
+        elif self.sort_column + 1 < len(self.table_columns):
+            self.set_sort(self.sort_column + 1)
+        else:
+            self.set_sort(None)
+
+    def set_sort(self, column: int | None, reverse: bool = False):
+        """Sort the rows by a column, or restore the store's order with None
+
+        Args:
+            column (int | None): column index
+            reverse (bool, optional): sort descending. Defaults to False.
+        """
+        self.sort_column, self.sort_reverse = column, reverse
+        for column_index, column_obj in enumerate(self.ordered_columns):
+            label = self.table_columns[column_index]
+            if column_index == self.sort_column:
+                label += SORT_INDICATORS[self.sort_reverse]
+            column_obj.label = Text(label)
+        self.apply_view()
+
+    @on(DataTable.HeaderSelected)
+    def on_data_table_header_selected(self, header_selected: DataTable.HeaderSelected):
+        self.sort_by_column(header_selected.column_index)
+
+    def get_rows(self, limit: int | None = None) -> list[tuple[str, str | None]]:
+        """Get the (name, summary) rows currently shown, in display order
+
+        Args:
+            limit (int | None, optional): maximum number of rows. Defaults to None.
+
+        Returns:
+            list[tuple[str, str | None]]: rows in the table
+        """
+        return [
+            (row.key.value, self.get_row(row.key)[1])
+            for row in self.ordered_rows[:limit]
+        ]
+
+    def setup_columns(self):
+        self.column_keys = self.add_columns(*self.table_columns)
         for column in self.columns.values():
             column.auto_width = True
         self.cursor_type = "row"
 
+    async def after_init(self):
+        if not self.columns:
+            self.setup_columns()
+
     @on(DataTable.RowHighlighted)
     def on_data_table_row_highlighted(self, row_highlighted: DataTable.RowHighlighted):
         try:
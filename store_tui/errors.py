@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+# one JSON object per reported error, see ErrorRecord.to_log
+record_logger = logging.getLogger("store_tui.errors.records")
+
+# distinct errors kept for the error details screen
+MAX_ERROR_RECORDS = 50
+NOTIFY_INTERVAL = 5.0
+
+
+def get_error_log_filepath() -> Path:
+    """Location of the error log, following the XDG base directory spec
+
+    Returns:
+        Path: $XDG_STATE_HOME/store-tui/errors.log
+    """
+    state_home = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(state_home) / "store-tui" / "errors.log"
+
+
+def start_error_log(
+    path: Path, max_bytes: int = 1024 * 1024, backup_count: int = 3
+) -> QueueListener:
+    """Write error records to a rotating file from a background thread
+
+    The UI only puts records on a queue, the file is written by the listener.
+
+    Args:
+        path (Path): log file, rotated to path.1, path.2, ... when full
+        max_bytes (int, optional): size at which the file is rotated
+        backup_count (int, optional): rotated files kept
+
+    Returns:
+        QueueListener: the started listener, stop it on exit to flush the file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    record_logger.addHandler(QueueHandler(records))
+    record_logger.setLevel(logging.INFO)
+    record_logger.propagate = False
+    listener = QueueListener(records, file_handler)
+    listener.start()
+    return listener
+
+
+def error_key(title: str, exc: BaseException) -> tuple[str, str, str]:
+    """Errors with the same title, type and message count as repeats of one error"""
+    return (title, type(exc).__qualname__, str(exc))
+
+
+@dataclass
+class ErrorRecord:
+    """A distinct error, with how often and when it happened
+
+    The traceback is only formatted when someone asks to see it.
+    """
+
+    title: str
+    exc: BaseException
+    first_seen: float
+    last_seen: float
+    count: int = 1
+    # repeats since the last notification about this error
+    unnotified: int = field(default=0, repr=False)
+    # formatted on first use, and again after a repeat replaced the exception
+    _traceback_text: str | None = field(default=None, repr=False)
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return error_key(self.title, self.exc)
+
+    @property
+    def summary(self) -> str:
+        return f"{type(self.exc).__name__}: {self.exc}"
+
+    @property
+    def traceback_text(self) -> str:
+        if self._traceback_text is None:
+            self._traceback_text = "".join(traceback.format_exception(self.exc))
+        return self._traceback_text
+
+    def location(self) -> str | None:
+        """file:line where the error was raised, without formatting the traceback"""
+        tb = self.exc.__traceback__
+        if tb is None:
+            return None
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        return f"{tb.tb_frame.f_code.co_filename}:{tb.tb_lineno}"
+
+    def to_log(self) -> str:
+        return json.dumps(
+            {
+                "time": self.last_seen,
+                "title": self.title,
+                "type": f"{type(self.exc).__module__}.{type(self.exc).__qualname__}",
+                "message": str(self.exc),
+                "location": self.location(),
+                "count": self.count,
+            }
+        )
+
+
+class ErrorReporter:
+    """Collect errors, folding repeats together and rate limiting notifications
+
+    The first occurrence of an error is notified at once. Repeats within
+    `interval` seconds are counted, and reported in one notification with the
+    count when the interval is over.
+    """
+
+    def __init__(
+        self,
+        notify: Callable[[ErrorRecord, int], None],
+        interval: float = NOTIFY_INTERVAL,
+        max_records: int = MAX_ERROR_RECORDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.notify = notify
+        self.interval = interval
+        self.max_records = max_records
+        self.clock = clock
+        self.records: OrderedDict[tuple[str, str, str], ErrorRecord] = OrderedDict()
+        self._last_notified: dict[tuple[str, str, str], float] = {}
+        self._flush_handles: dict[tuple[str, str, str], asyncio.TimerHandle] = {}
+
+    @property
+    def latest(self) -> ErrorRecord | None:
+        return next(reversed(self.records.values()), None)
+
+    def report(self, exc: BaseException, title: str = "Error") -> ErrorRecord:
+        """Record an error and notify about it, unless it was notified just now
+
+        Args:
+            exc (BaseException): the error
+            title (str, optional): what was being done when it happened
+
+        Returns:
+            ErrorRecord: the record the error was counted in
+        """
+        now = self.clock()
+        key = error_key(title, exc)
+        record = self.records.get(key)
+        if record is None:
+            record = ErrorRecord(title=title, exc=exc, first_seen=now, last_seen=now)
+            self.records[key] = record
+            while len(self.records) > self.max_records:
+                dropped, _ = self.records.popitem(last=False)
+                self._last_notified.pop(dropped, None)
+                handle = self._flush_handles.pop(dropped, None)
+                if handle is not None:
+                    handle.cancel()
+        else:
+            # keep the latest exception, its traceback is the one worth showing
+            record.exc = exc
+            record._traceback_text = None
+            record.count += 1
+            record.last_seen = now
+        self.records.move_to_end(key)
+        record_logger.info(record.to_log())
+
+        last_notified = self._last_notified.get(key)
+        if last_notified is None or now - last_notified >= self.interval:
+            self._notify(record)
+        else:
+            record.unnotified += 1
+            if key not in self._flush_handles:
+                delay = last_notified + self.interval - now
+                self._flush_handles[key] = asyncio.get_running_loop().call_later(
+                    delay, self._flush, key
+                )
+        return record
+
+    def _notify(self, record: ErrorRecord):
+        count = record.unnotified or 1
+        record.unnotified = 0
+        self._last_notified[record.key] = self.clock()
+        try:
+            self.notify(record, count)
+        except Exception:
+            logger.exception("Error notifying about %s", record.summary)
+
+    def _flush(self, key: tuple[str, str, str]):
+        self._flush_handles.pop(key, None)
+        record = self.records.get(key)
+        if record is not None and record.unnotified:
+            self._notify(record)
+
+    def close(self):
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
@@ -0,0 +1,705 @@
+"""Stand-in Snap Store and snapd servers for offline load and latency testing
+
+`FakeStoreServer` answers the store endpoints the app uses from a deterministic
+`SyntheticCatalog` of any size, and `FakeSnapdServer` answers snapd's on a unix
+socket. Both add configurable latency, jitter and error rates on top, and can
+be scripted with per-request faults. Point the app at them with the
+`store.base_url` and `snapd.socket` settings:
+
+    python -m store_tui.fake_store --snaps 5000 --latency 0.2 --jitter 0.05 \\
+        --error-rate 0.02 --snapd-socket /tmp/fake-snapd.socket
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from urllib.parse import parse_qs, unquote
+
+from store_tui.imaging import PLACEHOLDER_ICON_FILEPATH
+
+CATEGORY_NAMES = [
+    "art-and-design",
+    "books-and-reference",
+    "development",
+    "devices-and-iot",
+    "education",
+    "entertainment",
+    "finance",
+    "games",
+    "health-and-fitness",
+    "music-and-audio",
+    "news-and-weather",
+    "personalisation",
+    "photo-and-video",
+    "productivity",
+    "science",
+    "security",
+    "server-and-cloud",
+    "social",
+    "utilities",
+]
+NAME_WORDS = [
+    "aurora", "bolt", "cedar", "delta", "ember", "flux", "grove", "harbor",
+    "iris", "jade", "kite", "lumen", "maple", "nova", "orbit", "pixel",
+    "quartz", "raven", "sage", "tide", "umbra", "vale", "willow", "zephyr",
+]  # fmt: skip
+RISKS = ["stable", "candidate", "beta", "edge"]
+# the store caps find results, listings are never longer than this
+MAX_FIND_RESULTS = 100
+SPAWN_TIME = "2024-01-01T00:00:00Z"
+
+
+def snapd_response(result, status_code: int = 200, status: str = "OK") -> dict:
+    return {
+        "type": "sync" if status_code < 400 else "error",
+        "status-code": status_code,
+        "status": status,
+        "result": result,
+    }
+
+
+def installed_snap_json(name: str) -> dict:
+    return {
+        "name": name,
+        "summary": f"{name} summary",
+        "version": "1.0",
+        "revision": "10",
+        "channel": "latest/stable",
+        "tracking-channel": "latest/stable",
+        "confinement": "strict",
+        "ignore-validation": False,
+        "installed-size": 1024,
+        "jailmode": False,
+        "mounted-from": f"/var/lib/snapd/snaps/{name}_10.snap",
+        "status": "active",
+    }
+
+
+@dataclass(frozen=True)
+class SyntheticSnap:
+    name: str
+    snap_id: str
+    title: str
+    summary: str
+    categories: tuple[str, ...]
+    featured: bool
+
+
+class SyntheticCatalog:
+    """A deterministic, generated store catalog of any size
+
+    Snaps, their categories and their channel maps are derived from the seed and
+    the snap's index, so the same arguments always produce the same store. Snap
+    info is generated on demand, which keeps large catalogs cheap to create.
+    """
+
+    def __init__(
+        self,
+        snap_count: int = 500,
+        category_count: int = 12,
+        tracks: int = 2,
+        architectures: tuple[str, ...] = ("amd64", "arm64", "armhf"),
+        featured_count: int = 16,
+        seed: int = 0,
+    ) -> None:
+        self.seed = seed
+        self.tracks = ["latest", *(f"{track}.x" for track in range(1, tracks))]
+        self.architectures = architectures
+        self.category_names = ["featured", *CATEGORY_NAMES[:category_count]]
+        self.snaps: dict[str, SyntheticSnap] = {}
+        for index in range(snap_count):
+            snap = self._make_snap(index, featured=index < featured_count)
+            self.snaps[snap.name] = snap
+        self._by_category: dict[str, list[SyntheticSnap]] = {
+            category: [] for category in self.category_names
+        }
+        for snap in self.snaps.values():
+            for category in snap.categories:
+                self._by_category[category].append(snap)
+
+    def _make_snap(self, index: int, featured: bool) -> SyntheticSnap:
+        rng = random.Random(f"{self.seed}-{index}")
+        name = f"{rng.choice(NAME_WORDS)}-{rng.choice(NAME_WORDS)}-{index}"
+        categories = rng.sample(
+            self.category_names[1:], k=min(2, len(self.category_names) - 1)
+        )
+        if featured:
+            categories.insert(0, "featured")
+        return SyntheticSnap(
+            name=name,
+            snap_id=hashlib.sha256(name.encode()).hexdigest()[:32],
+            title=name.replace("-", " ").title(),
+            summary=f"{rng.choice(NAME_WORDS).title()} tools for {rng.choice(NAME_WORDS)}",
+            categories=tuple(categories),
+            featured=featured,
+        )
+
+    def categories(self) -> dict:
+        return {"categories": [{"name": name} for name in self.category_names]}
+
+    def find(self, query: str | None = None, category: str | None = None) -> dict:
+        if category is not None:
+            snaps = self._by_category.get(category, [])
+        else:
+            snaps = self.snaps.values()
+        if query:
+            query = query.lower()
+            snaps = [
+                snap
+                for snap in snaps
+                if query in snap.name or query in snap.summary.lower()
+            ]
+        return {
+            "results": [
+                {
+                    "name": snap.name,
+                    "snap-id": snap.snap_id,
+                    "snap": {
+                        "title": snap.title,
+                        "summary": snap.summary,
+                        "store-url": f"https://snapcraft.io/{snap.name}",
+                    },
+                }
+                for snap in list(snaps)[:MAX_FIND_RESULTS]
+            ]
+        }
+
+    def revision(self, snap: SyntheticSnap, track: str, risk: str, arch: str) -> int:
+        # riskier channels and newer tracks carry newer revisions, and every
+        # architecture gets its own revision numbers
+        stride = len(self.architectures)
+        return (
+            self._base_revision(snap)
+            + self.tracks.index(track) * 10 * stride
+            + RISKS.index(risk) * stride
+            + self.architectures.index(arch)
+        )
+
+    def _base_revision(self, snap: SyntheticSnap) -> int:
+        return int(snap.snap_id[:4], 16) % 500 + 1
+
+    def revision_exists(self, snap: SyntheticSnap, revision: int, arch: str) -> bool:
+        """Whether a revision, released or not, was built for an architecture"""
+        newest = self.revision(snap, self.tracks[-1], RISKS[-1], self.architectures[-1])
+        return 0 < revision <= newest and (revision - self._base_revision(snap)) % len(
+            self.architectures
+        ) == self.architectures.index(arch)
+
+    def revision_item(
+        self, snap: SyntheticSnap, revision: int, arch: str, base_url: str
+    ) -> dict:
+        return {
+            "architectures": [arch],
+            "base": "core22",
+            "confinement": "strict",
+            "created-at": SPAWN_TIME,
+            "download": {
+                "deltas": [],
+                "size": 1024 * 1024 * (revision % 90 + 10),
+                "url": f"{base_url}/download/{snap.name}_{revision}.snap",
+            },
+            "revision": revision,
+            "type": "app",
+            "version": f"{revision // 10}.{revision % 10}",
+        }
+
+    def channel_map_item(
+        self, snap: SyntheticSnap, track: str, risk: str, arch: str, base_url: str
+    ) -> dict:
+        revision = self.revision(snap, track, risk, arch)
+        return {
+            **self.revision_item(snap, revision, arch, base_url),
+            "channel": {
+                "architecture": arch,
+                "name": risk if track == "latest" else f"{track}/{risk}",
+                "released-at": SPAWN_TIME,
+                "risk": risk,
+                "track": track,
+            },
+        }
+
+    def info(self, name: str, base_url: str) -> dict | None:
+        snap = self.snaps.get(name)
+        if snap is None:
+            return None
+        icon_url = f"{base_url}/icons/{name}.png"
+        return {
+            "channel-map": [
+                self.channel_map_item(snap, track, risk, arch, base_url)
+                for track in self.tracks
+                for risk in RISKS
+                for arch in self.architectures
+            ],
+            "default-track": None,
+            "name": snap.name,
+            "snap-id": snap.snap_id,
+            "snap": {
+                "categories": [{"name": category} for category in snap.categories],
+                "contact": f"https://example.com/{snap.name}/issues",
+                "description": f"{snap.summary}.\n\nGenerated by the fake store.",
+                "license": "MIT",
+                "links": {"website": [f"https://example.com/{snap.name}"]},
+                "media": [{"type": "icon", "url": icon_url}],
+                "name": snap.name,
+                "prices": {},
+                "publisher": {
+                    "display-name": "Fake Publisher",
+                    "id": "fake-publisher-id",
+                    "username": "fake-publisher",
+                    "validation": "unproven",
+                },
+                "snap-id": snap.snap_id,
+                "store-url": f"https://snapcraft.io/{snap.name}",
+                "summary": snap.summary,
+                "title": snap.title,
+            },
+        }
+
+    def refresh(self, payload: dict, architecture: str, base_url: str) -> dict:
+        """Answer install actions by channel, and download actions by revision"""
+        results = []
+        for action in payload.get("actions", []):
+            name = action.get("name")
+            snap = self.snaps.get(name)
+            item = None
+            if snap is not None and architecture in self.architectures:
+                item = self._refresh_item(snap, action, architecture, base_url)
+            if item is None:
+                results.append(
+                    {
+                        "instance-key": action.get("instance-key"),
+                        "name": name,
+                        "result": "error",
+                        "error": {"code": "not-found", "message": "No snap or channel"},
+                    }
+                )
+                continue
+            results.append(
+                {
+                    "instance-key": action.get("instance-key"),
+                    "name": name,
+                    "result": action.get("action", "install"),
+                    "snap-id": snap.snap_id,
+                    "snap": {
+                        "name": name,
+                        "snap-id": snap.snap_id,
+                        "summary": snap.summary,
+                        "title": snap.title,
+                        **{
+                            key: item[key]
+                            for key in (
+                                "base",
+                                "confinement",
+                                "created-at",
+                                "download",
+                                "revision",
+                                "version",
+                            )
+                        },
+                    },
+                }
+            )
+        return {"error-list": [], "results": results}
+
+    def _refresh_item(
+        self, snap: SyntheticSnap, action: dict, architecture: str, base_url: str
+    ) -> dict | None:
+        if "revision" in action:
+            revision = int(action["revision"])
+            if not self.revision_exists(snap, revision, architecture):
+                return None
+            return self.revision_item(snap, revision, architecture, base_url)
+        track, _, risk = action.get("channel", "latest/stable").rpartition("/")
+        track = track or "latest"
+        if track not in self.tracks or risk not in RISKS:
+            return None
+        return self.channel_map_item(snap, track, risk, architecture, base_url)
+
+    def search_page(self, query: str, page: int, size: int) -> dict:
+        snaps = self.find(query)["results"] if query else None
+        names = (
+            [result["name"] for result in snaps]
+            if snaps is not None
+            else list(self.snaps)
+        )
+        start = (page - 1) * size
+        return {
+            "_embedded": {
+                "clickindex:package": [
+                    {
+                        "aliases": None,
+                        "apps": [name],
+                        "package_name": name,
+                        "summary": self.snaps[name].summary,
+                        "title": self.snaps[name].title,
+                        "version": "1.0",
+                    }
+                    for name in names[start : start + size]
+                ]
+            },
+            "total": len(names),
+        }
+
+
+class FakeHTTPServer(ABC):
+    """Minimal keep-alive HTTP/1.1 server with latency, jitter, errors and scripted faults
+
+    Subclasses start listening in `start` and answer requests in `respond`.
+
+    Each request first takes the next scripted fault from `faults` (or "ok" once
+    it is empty): "ok" answers normally, an int answers with that status code,
+    ("slow", seconds) answers after an extra delay and "drop" closes the connection
+    without answering. Unscripted requests wait `latency` ± `jitter` seconds and
+    fail with a 503 at `error_rate`. Connections and requests are counted.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.faults: deque = deque()
+        self.connections = 0
+        self.requests: list[str] = []
+        self._random = random.Random(seed)
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+
+    @abstractmethod
+    async def start(self): ...
+
+    async def stop(self):
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        await self._server.wait_closed()
+
+    @abstractmethod
+    def respond(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict | bytes]:
+        """Status code and JSON body (or raw bytes) answering a request"""
+
+    async def _answer(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict | bytes] | None:
+        fault = self.faults.popleft() if self.faults else "ok"
+        if fault == "drop":
+            return None
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        if isinstance(fault, tuple):
+            delay += fault[1]
+        if delay:
+            await asyncio.sleep(delay)
+        if isinstance(fault, int):
+            return fault, {}
+        if (
+            fault == "ok"
+            and self.error_rate
+            and self._random.random() < self.error_rate
+        ):
+            return 503, {"error-list": [{"code": "unavailable", "message": "fake"}]}
+        return self.respond(method, target, headers, body)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while request_line := await reader.readline():
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests.append(target)
+                answer = await self._answer(method, target, headers, body)
+                if answer is None:
+                    break
+                status, payload = answer
+                if isinstance(payload, bytes):
+                    content, content_type = payload, "image/png"
+                else:
+                    content, content_type = (
+                        json.dumps(payload).encode(),
+                        "application/json",
+                    )
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode()
+                    + content
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class FakeStoreServer(FakeHTTPServer):
+    """Snap Store stand-in, serving a `SyntheticCatalog` over TCP
+
+    Serves categories, find (search and category listings), snap info, the bulk
+    refresh endpoint, the paginated v1 search and icons. JSON registered in
+    `routes` for a path is served instead of the catalog's answer.
+    """
+
+    def __init__(
+        self,
+        catalog: SyntheticCatalog | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.catalog = catalog or SyntheticCatalog()
+        self.host = host
+        self.port = port
+        self.routes: dict[str, object] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    def respond(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict | bytes]:
+        path, _, query_string = target.partition("?")
+        path = unquote(path)
+        query = {key: values[0] for key, values in parse_qs(query_string).items()}
+        if path in self.routes:
+            return 200, self.routes[path]
+
+        if path == "/v2/snaps/categories":
+            return 200, self.catalog.categories()
+        if path == "/v2/snaps/find":
+            return 200, self.catalog.find(query.get("q"), query.get("category"))
+        if path.startswith("/v2/snaps/info/"):
+            info = self.catalog.info(path.removeprefix("/v2/snaps/info/"), self.url)
+            if info is None:
+                return 404, {
+                    "error-list": [
+                        {"code": "resource-not-found", "message": "No snap named"}
+                    ]
+                }
+            return 200, info
+        if path == "/v2/snaps/refresh" and method == "POST":
+            architecture = headers.get("snap-device-architecture", "amd64")
+            return 200, self.catalog.refresh(json.loads(body), architecture, self.url)
+        if path == "/api/v1/snaps/search":
+            page, size = int(query.get("page", 1)), int(query.get("size", 100))
+            return 200, self.catalog.search_page(query.get("q", ""), page, size)
+        if path.startswith("/icons/"):
+            return 200, PLACEHOLDER_ICON_FILEPATH.read_bytes()
+        return 404, {"error-list": [{"code": "not-found", "message": "not found"}]}
+
+
+class FakeSnapdServer(FakeHTTPServer):
+    """Keep-alive HTTP/1.1 server on a unix socket, answering like snapd
+
+    Serves `GET /`, `/v2/snaps` (optionally filtered with `?snaps=`),
+    `/v2/snaps/<name>`, `/v2/changes` (filtered with `?select=`) and
+    `/v2/changes/<id>`. A change added in progress is ready after it has been
+    polled by id `change_polls` times. Changes are numbered from `first_change_id`,
+    which is past 1 when snapd has pruned the changes before it.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        installed: list[str],
+        change_polls: int = 5,
+        first_change_id: int = 1,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.socket_path = socket_path
+        self.installed = {name: installed_snap_json(name) for name in installed}
+        self.change_polls = change_polls
+        self.first_change_id = first_change_id
+        self.changes: list[dict] = []
+        self._polls: dict[str, int] = {}
+
+    async def start(self):
+        self._server = await asyncio.start_unix_server(self._handle, self.socket_path)
+
+    def respond(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict]:
+        path, _, query = target.partition("?")
+        if path == "/":
+            return 200, {"result": ["TBD"]}
+        if path == "/v2/snaps":
+            names = parse_qs(query)["snaps"][0].split(",") if query else None
+            return 200, snapd_response(
+                [
+                    snap
+                    for name, snap in self.installed.items()
+                    if names is None or name in names
+                ]
+            )
+        if path.startswith("/v2/snaps/"):
+            name = path.removeprefix("/v2/snaps/")
+            if name in self.installed:
+                return 200, snapd_response(self.installed[name])
+            return 404, snapd_response(
+                {"message": "snap not installed", "kind": "snap-not-found"},
+                status_code=404,
+                status="Not Found",
+            )
+        if path == "/v2/changes":
+            select = parse_qs(query).get("select", ["in-progress"])[0]
+            return 200, snapd_response(
+                [
+                    change
+                    for change in self.changes
+                    if select == "all" or change["ready"] == (select == "ready")
+                ]
+            )
+        if path.startswith("/v2/changes/"):
+            change_id = path.removeprefix("/v2/changes/")
+            change = next((c for c in self.changes if c["id"] == change_id), None)
+            if change is None:
+                return 404, snapd_response(
+                    {
+                        "message": f'cannot find change with id "{change_id}"',
+                        "kind": "not-found",
+                    },
+                    status_code=404,
+                    status="Not Found",
+                )
+            if not change["ready"]:
+                polls = self._polls[change_id] = self._polls.get(change_id, 0) + 1
+                ready = polls >= self.change_polls
+                change["ready"] = ready
+                change["status"] = "Done" if ready else "Doing"
+                change["tasks"] = [
+                    {
+                        "id": "1",
+                        "kind": "download-snap",
+                        "summary": "Download snap",
+                        "status": change["status"],
+                        "progress": {
+                            "label": "",
+                            "done": polls,
+                            "total": self.change_polls,
+                        },
+                        "spawn-time": SPAWN_TIME,
+                    }
+                ]
+            return 200, snapd_response(change)
+        return 404, snapd_response(
+            {"message": "not found"}, status_code=404, status="Not Found"
+        )
+
+    def add_change(self, kind: str, snap_names: list[str], ready: bool = True) -> str:
+        """Record a change, as if made by another snapd client
+
+        Args:
+            kind (str): e.g. "install-snap"
+            snap_names (list[str]): snaps the change touches
+            ready (bool, optional): whether the change is done already, otherwise
+                it is done once polled by id `change_polls` times
+
+        Returns:
+            str: the change's id, numbered in order like snapd's
+        """
+        change_id = str(self.first_change_id + len(self.changes))
+        self.changes.append(
+            {
+                "id": change_id,
+                "kind": kind,
+                "summary": f"{kind} {' '.join(snap_names)}",
+                "status": "Done" if ready else "Doing",
+                "tasks": [],
+                "ready": ready,
+                "spawn-time": SPAWN_TIME,
+                "data": {"snap-names": snap_names},
+            }
+        )
+        return change_id
+
+
+parser = argparse.ArgumentParser(
+    prog="store_tui.fake_store",
+    description="Serve a synthetic Snap Store (and snapd) for offline testing",
+)
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument("--snaps", type=int, default=500, help="number of snaps")
+parser.add_argument("--categories", type=int, default=12, help="number of categories")
+parser.add_argument("--tracks", type=int, default=2, help="tracks per snap")
+parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+parser.add_argument("--jitter", type=float, default=0.0, help="± seconds per request")
+parser.add_argument(
+    "--error-rate", type=float, default=0.0, help="fraction of requests failing"
+)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument(
+    "--snapd-socket", help="also serve a fake snapd on this unix socket"
+)
+parser.add_argument(
+    "--installed", type=int, default=20, help="snaps installed in the fake snapd"
+)
+
+
+async def serve(args: argparse.Namespace):
+    catalog = SyntheticCatalog(
+        snap_count=args.snaps,
+        category_count=args.categories,
+        tracks=args.tracks,
+        seed=args.seed,
+    )
+    faults = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "seed": args.seed,
+    }
+    servers: list[FakeHTTPServer] = [
+        FakeStoreServer(catalog, host=args.host, port=args.port, **faults)
+    ]
+    if args.snapd_socket:
+        servers.append(
+            FakeSnapdServer(
+                args.snapd_socket,
+                installed=list(catalog.snaps)[: args.installed],
+                **faults,
+            )
+        )
+    for server in servers:
+        await server.start()
+
+    print(f"export STORE_TUI_STORE__BASE_URL={servers[0].url}", flush=True)
+    if args.snapd_socket:
+        print(f"export STORE_TUI_SNAPD__SOCKET={args.snapd_socket}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for server in servers:
+            await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
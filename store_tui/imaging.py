@@ -0,0 +1,90 @@
+import asyncio
+import functools
+import io
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+from rich.segment import Segment
+from rich_pixels import HalfcellRenderer, Pixels
+
+ICON_SIZE = (16, 16)
+PLACEHOLDER_ICON_FILEPATH = (
+    Path(__file__).parent / "schemas" / "images" / "placeholder.png"
+)
+
+
+def render_segments(image_bytes: bytes, resize: tuple[int, int]) -> list[Segment]:
+    """Decode an encoded image and render it to segments at the given size
+
+    Kept at module level (and returning plain segments) so that it can be
+    submitted to a ProcessPoolExecutor as well as a ThreadPoolExecutor.
+
+    Args:
+        image_bytes (bytes): encoded image (png, jpeg, ...)
+        resize (tuple[int, int]): target (width, height) in pixels
+
+    Returns:
+        list[Segment]: segments ready to be wrapped in a Pixels object
+    """
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # let the decoder skip work where it can (jpeg), then box-reduce large
+        # icons so the renderer only has to resize a small image
+        image.draft("RGB", resize)
+        factor = min(image.width // resize[0], image.height // resize[1])
+        if factor > 1:
+            image = image.convert("RGBA").reduce(factor)
+        return HalfcellRenderer().render(image, resize)
+
+
+@functools.cache
+def get_placeholder_icon(resize: tuple[int, int] = ICON_SIZE) -> Pixels:
+    """Placeholder icon, decoded once per process
+
+    Args:
+        resize (tuple[int, int], optional): target size. Defaults to ICON_SIZE.
+
+    Returns:
+        Pixels: rendered placeholder icon
+    """
+    segments = render_segments(PLACEHOLDER_ICON_FILEPATH.read_bytes(), resize)
+    return Pixels.from_segments(segments)
+
+
+class ImagingExecutor:
+    """Decode and resize icons in a worker pool, off the UI event loop"""
+
+    def __init__(self, executor: Executor | None = None, max_workers: int = 2):
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="store-tui-imaging"
+        )
+
+    def submit(
+        self, image_bytes: bytes, resize: tuple[int, int] = ICON_SIZE
+    ) -> Future[list[Segment]]:
+        """Schedule an image to be rendered, returning a future of its segments"""
+        return self._executor.submit(render_segments, image_bytes, resize)
+
+    async def render(
+        self, image_bytes: bytes, resize: tuple[int, int] = ICON_SIZE
+    ) -> Pixels:
+        """Render an image in the pool and wrap the result for display
+
+        Args:
+            image_bytes (bytes): encoded image
+            resize (tuple[int, int], optional): target size. Defaults to ICON_SIZE.
+
+        Returns:
+            Pixels: renderable icon
+        """
+        segments = await asyncio.wrap_future(self.submit(image_bytes, resize))
+        return Pixels.from_segments(segments)
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+@functools.cache
+def get_imaging_executor() -> ImagingExecutor:
+    """Process-wide imaging executor, created on first use"""
+    return ImagingExecutor()
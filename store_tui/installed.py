@@ -0,0 +1,163 @@
+import asyncio
+import logging
+
+import httpx
+from snap_python.client import SnapClient
+from snap_python.schemas.changes import ChangesResponse, ChangesResult
+from snap_python.schemas.common import BaseResponse
+from snap_python.schemas.snaps import InstalledSnap, SingleInstalledSnapResponse
+
+from store_tui.snap_state import SnapState, SnapStateStore
+
+logger = logging.getLogger(__name__)
+
+CHANGES_POLL_INTERVAL = 2.0
+
+
+class ChangesListResponse(BaseResponse):
+    result: list[ChangesResult]
+
+
+def snap_names(change: ChangesResult) -> list[str]:
+    return (change.data or {}).get("snap-names", [])
+
+
+class InstalledSnapsModel:
+    """Installed snaps, listed from snapd once and then kept current from snapd's changes
+
+    After the initial list, snapd is polled for the changes in progress, and for
+    the changes made since the last poll by id (snapd numbers them in order). Only
+    the snaps named by changes that finished since the last poll are queried again
+    (through the snap state store, which batches them), so keeping the list current
+    costs O(new changes) rather than a full relist, or a read of the whole change log.
+    Until snapd lists a first change to count on from, the finished ones are listed.
+    """
+
+    def __init__(self, api: SnapClient, snap_state: SnapStateStore) -> None:
+        self.api = api
+        self.snap_state = snap_state
+        self.snaps: dict[str, InstalledSnap] = {}
+        self.loaded = False
+        # highest change id seen, every change up to it has been accounted for,
+        # 0 until snapd lists a change
+        self._last_change_id = 0
+        # changes seen in progress, with the snaps they touch
+        self._in_progress: dict[str, list[str]] = {}
+
+    def rows(self) -> list[tuple[str, str | None]]:
+        """(name, summary) rows for the result table, sorted by name"""
+        return [(name, self.snaps[name].summary) for name in sorted(self.snaps)]
+
+    async def load(self):
+        """List the installed snaps, from where the changes made so far left them"""
+        changes, installed = await asyncio.gather(
+            self.get_changes("all"), self.api.snaps.list_installed_snaps()
+        )
+        self._last_change_id = max(
+            (int(change.id) for change in changes if change.id.isdigit()), default=0
+        )
+        self._in_progress = {
+            change.id: snap_names(change) for change in changes if not change.ready
+        }
+        self.snaps = {snap.name: snap for snap in installed.result}
+        for snap in installed.result:
+            self.snap_state.set_install_data(
+                snap.name,
+                SingleInstalledSnapResponse(
+                    status_code=installed.status_code,
+                    type=installed.type,
+                    status=installed.status,
+                    result=snap,
+                ),
+                publish=False,
+            )
+        self.loaded = True
+
+    async def get_changes(self, select: str = "in-progress") -> list[ChangesResult]:
+        response = await self.api.request("GET", "changes", params={"select": select})
+        return ChangesListResponse.model_validate_json(response.content).result
+
+    async def get_change(self, change_id: str) -> ChangesResult | None:
+        """A change by id, None if snapd has no such change (yet)"""
+        try:
+            response = await self.api.request("GET", f"changes/{change_id}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+        change = ChangesResponse.model_validate_json(response.content).result
+        return change if isinstance(change, ChangesResult) else None
+
+    async def sync(self) -> set[str]:
+        """Re-query the snaps touched by changes that finished since the last sync
+
+        The install state store publishes the snaps whose state changed, which
+        `apply` folds back into the model.
+
+        Returns:
+            set[str]: names of the snaps that were queried
+        """
+        changed = set()
+        in_progress = {change.id: change for change in await self.get_changes()}
+        for change_id in list(self._in_progress):
+            if change_id not in in_progress:
+                changed.update(self._in_progress.pop(change_id))
+
+        if not self._last_change_id:
+            # snapd had pruned its whole change log when it was loaded, so there is
+            # no id to count on from (snapd does not restart at 1): every change
+            # listed since is new, the changes in progress are taken up below
+            for change in await self.get_changes("ready"):
+                changed.update(snap_names(change))
+                self._anchor_on(change)
+
+        # changes made since the last sync, whether still in progress or done by now
+        while self._last_change_id:
+            change_id = str(self._last_change_id + 1)
+            change = in_progress.get(change_id) or await self.get_change(change_id)
+            if change is None:
+                break
+            self._last_change_id += 1
+            if change.ready:
+                changed.update(snap_names(change))
+            else:
+                self._in_progress[change.id] = snap_names(change)
+        # snapd numbers changes without gaps, should one be missing anyway, carry on
+        # from the newest change in progress rather than stopping at the gap for good
+        for change in in_progress.values():
+            if change.id not in self._in_progress and change.id.isdigit():
+                self._in_progress[change.id] = snap_names(change)
+                self._anchor_on(change)
+
+        await asyncio.gather(*(self.snap_state.fetch(name) for name in changed))
+        return changed
+
+    def _anchor_on(self, change: ChangesResult):
+        if change.id.isdigit():
+            self._last_change_id = max(self._last_change_id, int(change.id))
+
+    async def watch(self, interval: float = CHANGES_POLL_INTERVAL):
+        """Sync with snapd's changes until cancelled"""
+        while True:
+            try:
+                await self.sync()
+            except Exception:
+                logger.warning("Error syncing installed snaps", exc_info=True)
+            await asyncio.sleep(interval)
+
+    def apply(self, snap_name: str, state: SnapState) -> str | None:
+        """Fold a published install state into the model
+
+        Args:
+            snap_name (str): name of the snap
+            state (SnapState): its new install state
+
+        Returns:
+            str | None: "insert", "update" or "remove", None if nothing changed
+        """
+        installed_snap = state.installed_snap
+        if installed_snap is None:
+            return "remove" if self.snaps.pop(snap_name, None) is not None else None
+        operation = "update" if snap_name in self.snaps else "insert"
+        self.snaps[snap_name] = installed_snap
+        return operation
@@ -0,0 +1,172 @@
+"""Installed snap inventories, for comparing the snaps installed across machines
+
+An inventory is an NDJSON file: a header line describing the machine, then one
+line per installed snap, e.g.
+
+    {"inventory": 1, "machine": "web-1", "architecture": "amd64", "created-at": "..."}
+    {"name": "core22", "channel": "latest/stable", "revision": "1380", "confinement": "strict", "version": "20240111"}
+
+Inventories are read a line at a time, so diffing many of them only ever holds
+the baseline and the inventory being compared in memory.
+"""
+
+import json
+import platform
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import IO, Any, Iterable, Iterator, NamedTuple
+
+from snap_python.schemas.snaps import InstalledSnap
+
+from store_tui.elements.utils import get_platform_architecture
+
+INVENTORY_VERSION = 1
+# compared between inventories, in this order
+INVENTORY_FIELDS = ("channel", "revision", "confinement", "version")
+
+
+class InventoryError(ValueError):
+    """Raised when a file is not an inventory this version can read"""
+
+
+class InventoryEntry(NamedTuple):
+    name: str
+    channel: str | None
+    revision: str
+    confinement: str | None
+    version: str | None
+
+    @classmethod
+    def from_installed_snap(cls, snap: InstalledSnap) -> "InventoryEntry":
+        return cls(
+            name=snap.name,
+            channel=snap.tracking_channel or snap.channel,
+            revision=str(snap.revision),
+            confinement=snap.confinement,
+            version=snap.version,
+        )
+
+    @property
+    def is_local(self) -> bool:
+        """Locally installed (sideloaded) snaps have x-prefixed revisions"""
+        return self.revision.startswith("x")
+
+
+@dataclass
+class Inventory:
+    machine: str
+    architecture: str
+    created_at: str
+    entries: dict[str, InventoryEntry] = field(default_factory=dict)
+
+    @classmethod
+    def from_installed_snaps(
+        cls,
+        snaps: Iterable[InstalledSnap],
+        machine: str | None = None,
+        architecture: str | None = None,
+    ) -> "Inventory":
+        """Inventory of the snaps snapd lists as installed on this machine"""
+        entries = sorted(
+            (InventoryEntry.from_installed_snap(snap) for snap in snaps),
+            key=lambda entry: entry.name,
+        )
+        return cls(
+            machine=machine or platform.node(),
+            architecture=architecture or get_platform_architecture(),
+            created_at=datetime.now(timezone.utc).isoformat(),
+            entries={entry.name: entry for entry in entries},
+        )
+
+    def header(self) -> dict[str, Any]:
+        return {
+            "inventory": INVENTORY_VERSION,
+            "machine": self.machine,
+            "architecture": self.architecture,
+            "created-at": self.created_at,
+        }
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """The inventory as the lines of its file: the header, then each snap"""
+        yield self.header()
+        for entry in self.entries.values():
+            yield entry._asdict()
+
+
+def read_inventory(stream: IO[str], source: str = "<stream>") -> Inventory:
+    """Read an inventory written by `Inventory.records`
+
+    Args:
+        stream (IO[str]): NDJSON lines
+        source (str, optional): name of the stream, for error messages
+
+    Raises:
+        InventoryError: the header is missing or of another version, or a line
+            is not a snap entry
+
+    Returns:
+        Inventory: the inventory
+    """
+    inventory = None
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if inventory is None:
+                if record.get("inventory") != INVENTORY_VERSION:
+                    raise InventoryError(
+                        f"{source}: not a version {INVENTORY_VERSION} inventory"
+                    )
+                inventory = Inventory(
+                    machine=record["machine"],
+                    architecture=record["architecture"],
+                    created_at=record["created-at"],
+                )
+                continue
+            entry = InventoryEntry(**record)
+        except InventoryError:
+            raise
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            raise InventoryError(f"{source}:{line_number}: {e}") from e
+        inventory.entries[entry.name] = entry
+    if inventory is None:
+        raise InventoryError(f"{source}: empty inventory")
+    return inventory
+
+
+def diff_inventories(
+    baseline: Inventory, inventory: Inventory
+) -> Iterator[dict[str, Any]]:
+    """Differences of an inventory from a baseline, one record per snap
+
+    Records have a "change" of "added", "removed" or "changed". Changed snaps list
+    each differing field as [baseline value, inventory value].
+
+    Args:
+        baseline (Inventory): inventory to compare against
+        inventory (Inventory): inventory to compare
+
+    Yields:
+        dict[str, Any]: differences, in snap name order
+    """
+    for name in sorted(baseline.entries.keys() | inventory.entries.keys()):
+        before = baseline.entries.get(name)
+        after = inventory.entries.get(name)
+        if before == after:
+            continue
+        record: dict[str, Any] = {"machine": inventory.machine, "name": name}
+        if before is None:
+            yield {**record, "change": "added", **after._asdict()}
+        elif after is None:
+            yield {**record, "change": "removed", **before._asdict()}
+        else:
+            yield {
+                **record,
+                "change": "changed",
+                **{
+                    key: [getattr(before, key), getattr(after, key)]
+                    for key in INVENTORY_FIELDS
+                    if getattr(before, key) != getattr(after, key)
+                },
+            }
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+OPEN_COMMAND = ("xdg-open",)
+# repeat clicks on the same url within this many seconds are ignored
+DEBOUNCE_INTERVAL = 1.0
+
+ErrorCallback = Callable[[str, Exception], None]
+
+
+class LaunchError(RuntimeError):
+    """The external opener could not be started or exited with an error"""
+
+
+class ExternalLauncher:
+    """Open urls with the system handler without blocking the event loop
+
+    Each url is handed to the opener in a child process, which is waited on in a
+    background task so it is always reaped. Failures are reported to a callback
+    once the opener has exited, rather than to the code that asked for the url.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] = OPEN_COMMAND,
+        debounce: float = DEBOUNCE_INTERVAL,
+        on_error: ErrorCallback | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.command = tuple(command)
+        self.debounce = debounce
+        self.on_error = on_error
+        self.clock = clock
+        self._last_launch: dict[str, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> int:
+        """Number of openers that have not exited yet"""
+        return len(self._tasks)
+
+    def launch(
+        self, url: str, on_error: ErrorCallback | None = None
+    ) -> asyncio.Task | None:
+        """Start opening a url and return at once
+
+        Args:
+            url (str): url to open
+            on_error (ErrorCallback | None): called with the url and the error if
+                opening fails, instead of the launcher's own callback
+
+        Returns:
+            asyncio.Task | None: task waiting on the opener, or None if the url was
+            opened less than `debounce` seconds ago
+        """
+        now = self.clock()
+        last_launch = self._last_launch.get(url)
+        if last_launch is not None and now - last_launch < self.debounce:
+            logger.debug("Ignoring repeated request to open %s", url)
+            return None
+        self._last_launch = {
+            other: launched
+            for other, launched in self._last_launch.items()
+            if now - launched < self.debounce
+        }
+        self._last_launch[url] = now
+
+        task = asyncio.create_task(self._run(url, on_error or self.on_error))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, url: str, on_error: ErrorCallback | None):
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.command,
+                url,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                # keep a browser started by the opener alive after the TUI exits
+                start_new_session=True,
+            )
+        except OSError as e:
+            self._report(
+                url, LaunchError(f"Could not run {self.command[0]}: {e}"), on_error
+            )
+            return
+        returncode = await process.wait()
+        if returncode != 0:
+            self._report(
+                url,
+                LaunchError(f"{self.command[0]} exited with status {returncode}"),
+                on_error,
+            )
+
+    def _report(self, url: str, error: Exception, on_error: ErrorCallback | None):
+        logger.warning("Error opening %s: %s", url, error)
+        if on_error is None:
+            return
+        try:
+            on_error(url, error)
+        except Exception:
+            logger.exception("Error reporting a failure to open %s", url)
+
+    async def aclose(self):
+        """Stop waiting on openers that are still running; they keep running detached"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,33 +2,69 @@ import argparse
 import asyncio
 import logging
 import re
+import time
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Coroutine
 
 from snap_python.client import SnapClient
-from snap_python.schemas.store.categories import CategoryResponse
-from snap_python.schemas.store.info import VALID_SNAP_INFO_FIELDS
+from snap_python.schemas.store.info import VALID_SNAP_INFO_FIELDS, InfoResponse
 from snap_python.schemas.store.search import SearchResponse
 from textual import on, work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal
 from textual.widgets import DataTable, Footer, Header, Input
 
-from store_tui.elements.category_modal import CategoryModal
-from store_tui.elements.error_modal import ErrorModal
+from store_tui.api.batching import SnapInfoBatcher
+from store_tui.api.client import create_snap_client
+from store_tui.api.resilience import ResilientClient
+from store_tui.categories import (
+    CategoryCatalog,
+    CategoryEntry,
+    get_categories_filepath,
+    load_catalog,
+    revalidate_catalog,
+    save_catalog,
+)
+from store_tui.config import (
+    Settings,
+    SettingsError,
+    get_config_filepath,
+    load_settings,
+)
+from store_tui.elements.filter_bar import FilterBar
+from store_tui.elements.instrumentation_overlay import InstrumentationOverlay
 from store_tui.elements.position_count import PositionCount
-from store_tui.elements.search_modal import SnapSearchModal
-from store_tui.elements.snap_modal import SnapModal
 from store_tui.elements.snap_result_table import SnapResultTable
-from store_tui.elements.utils import convert_snaps_to_search_response
+from store_tui.errors import (
+    ErrorRecord,
+    ErrorReporter,
+    get_error_log_filepath,
+    start_error_log,
+)
+from store_tui.installed import InstalledSnapsModel
+from store_tui.launcher import ExternalLauncher
+from store_tui.memory import MemoryGovernor, RecentSnap
+from store_tui.navigation import LoadedSnap, SnapNavigator
+from store_tui.revisions import RevisionHistoryCache
+from store_tui.scheduling import LoadPriority, TableLoadScheduler
+from store_tui.session import (
+    MAX_SESSION_ROWS,
+    SessionRow,
+    SessionState,
+    get_session_filepath,
+    load_session,
+    save_session,
+)
+from store_tui.snap_state import SnapStateStore
+from store_tui.startup import DEFERRED_MODULES, preload_modules
+from store_tui.view_model import SnapViewModel
+
+if TYPE_CHECKING:
+    from store_tui.elements.snap_modal import SnapModal
 
 logger = logging.getLogger(__name__)
 
-snaps_api = SnapClient(
-    store_base_url="https://api.snapcraft.io",
-    version="v2",
-    store_headers={"Snap-Device-Series": "16", "X-Ubuntu-Series": "16"},
-    prompt_for_authentication=True,
-)
 TABLE_COLUMNS = ("Name", "Description")
 
 parser = argparse.ArgumentParser(description="Snap Store TUI")
@@ -41,121 +77,412 @@ class SnapStoreTUI(App):
         ("c", "choose_category", "Category"),
         ("s", "search_snaps", "Search"),
         ("i", "list_installed_snaps", "Installed"),
+        ("/", "filter_table", "Filter"),
+        ("m", "toggle_instrumentation", "Stats"),
+        # "o" is taken by the result table, which has focus most of the time
+        ("comma", "show_settings", "Settings"),
+        ("e", "show_last_error", "Last Error"),
     ]
     CSS_PATH = Path(__file__).parent / "styles" / "main.tcss"
 
-    def __init__(self, api: SnapClient, preload_snap: str | None = None) -> None:
+    def __init__(
+        self,
+        api: SnapClient,
+        preload_snap: str | None = None,
+        session_path: Path | None = None,
+        categories_path: Path | None = None,
+        settings: Settings | None = None,
+        config_path: Path | None = None,
+    ) -> None:
         super().__init__()
+        self.settings = settings or Settings()
+        self.config_path = config_path
         self.current_category = "featured"
-        self.all_categories: list[str] = []
-        self.api = api
+        self.search_query: str | None = None
+        self.category_catalog = CategoryCatalog()
+        self.categories_path = categories_path
+        # retries, timeouts and circuit breakers around the read-only store/snapd calls
+        self.api = ResilientClient(api, policies=self.settings.store.retry_policies())
+        # install state of snaps, shared by every screen
+        self.snap_state = SnapStateStore(
+            self.api, batch_window=self.settings.batching.window
+        )
+        self.installed_snaps = InstalledSnapsModel(self.api, self.snap_state)
+        self.showing_installed = False
         self.preload_snap = preload_snap
+        self.session_path = session_path
+        self.restored_session: SessionState | None = None
 
         self.update_title()
         self.table_position_count = PositionCount(id="table-position-count")
         self.data_table = SnapResultTable(
             table_position_count=self.table_position_count, table_columns=TABLE_COLUMNS
         )
+        self.memory_governor = MemoryGovernor(
+            max_recent_snaps=self.settings.cache.recent_snaps,
+            max_retained_bytes=self.settings.cache.recent_snaps_bytes,
+        )
+        self.instrumentation_overlay = InstrumentationOverlay(
+            self.memory_governor.stats,
+            refresh_interval=self.settings.instrumentation.refresh_interval,
+            show=self.settings.instrumentation.overlay,
+        )
+        self.filter_bar = FilterBar(id="filter-bar")
         self.header = Header()
         self.header.tall = False
+        self.footer = Footer(show_command_palette=False)
         self.snapd_api_available = False
+        # table loads supersede each other, and background fetches make way for them
+        self.load_scheduler = TableLoadScheduler()
+        # failures are folded into notifications, their details shown on request
+        self.errors = ErrorReporter(
+            self.notify_error, interval=self.settings.errors.notify_interval
+        )
+
+    @cached_property
+    def info_batcher(self) -> SnapInfoBatcher:
+        return SnapInfoBatcher(
+            self.api.store,
+            window=self.settings.batching.window,
+            max_concurrency=self.settings.concurrency.store_requests,
+            max_batch_size=self.settings.batching.max_batch_size,
+        )
+
+    @cached_property
+    def revision_history(self) -> RevisionHistoryCache:
+        return RevisionHistoryCache(
+            self.api.store, max_histories=self.settings.cache.revision_histories
+        )
+
+    def report_error(self, exc: BaseException, title: str):
+        self.errors.report(exc, title)
+
+    def notify_error(self, record: ErrorRecord, count: int):
+        repeats = f" ({count} times)" if count > 1 else ""
+        self.notify(
+            f"{record.summary}{repeats}\nPress e for details",
+            title=record.title,
+            severity="error",
+        )
+
+    def action_show_last_error(self):
+        record = self.errors.latest
+        if record is None:
+            self.notify("No errors so far")
+            return
+        from store_tui.elements.error_modal import ErrorModal
+
+        self.push_screen(ErrorModal.from_record(record))
+
+    @cached_property
+    def launcher(self) -> ExternalLauncher:
+        return ExternalLauncher()
 
     def compose(self) -> ComposeResult:
         yield self.header
+        yield self.instrumentation_overlay
+        yield self.filter_bar
         yield self.data_table
         with Horizontal(id="footer-outer"):
             with Horizontal(id="footer-inner"):
-                yield Footer(show_command_palette=False)
+                yield self.footer
             yield self.table_position_count
 
     async def action_quit(self):
+        self.save_session()
+        self.save_categories()
+        await self.launcher.aclose()
+        self.snap_navigator.close()
+        self.load_scheduler.cancel()
+        self.errors.close()
         self.exit()
 
+    def save_session(self):
+        """Save the current category, search, cursor and visible rows for the next launch"""
+        if self.session_path is None:
+            return
+        cursor_snap = None
+        if self.data_table.row_count > 0:
+            cursor_snap = self.data_table.coordinate_to_cell_key(
+                self.data_table.cursor_coordinate
+            ).row_key.value
+        state = SessionState(
+            current_category=self.current_category,
+            search_query=self.search_query,
+            cursor_row=self.data_table.cursor_row,
+            cursor_snap=cursor_snap,
+            rows=[
+                SessionRow(name=name, summary=summary)
+                for name, summary in self.data_table.get_rows(limit=MAX_SESSION_ROWS)
+            ],
+        )
+        try:
+            save_session(state, self.session_path)
+        except OSError:
+            logger.exception("Error saving session")
+
+    def restore_session(self) -> bool:
+        """Synchronously restore the saved session, before any network I/O
+
+        Returns:
+            bool: True if a session with rows was restored
+        """
+        if self.session_path is None:
+            return False
+        self.restored_session = load_session(self.session_path)
+        if self.restored_session is None:
+            return False
+        self.current_category = self.restored_session.current_category
+        self.search_query = self.restored_session.search_query
+        self.update_title()
+        self.data_table.set_rows(
+            (row.name, row.summary) for row in self.restored_session.rows
+        )
+        self.restore_cursor()
+        return self.data_table.row_count > 0
+
+    def restore_cursor(self):
+        """Move the cursor back to the saved snap, or the saved row if it is gone"""
+        if self.restored_session is None or self.data_table.row_count == 0:
+            return
+        row = self.restored_session.cursor_row
+        if self.restored_session.cursor_snap in self.data_table.rows:
+            row = self.data_table.get_row_index(self.restored_session.cursor_snap)
+        self.data_table.move_cursor(row=min(row, self.data_table.row_count - 1))
+
+    def restore_categories(self):
+        """Synchronously load the cached categories, before any network I/O"""
+        if self.categories_path is not None:
+            self.category_catalog = (
+                load_catalog(self.categories_path) or self.category_catalog
+            )
+        if self.category_catalog.get("featured") is None:
+            self.category_catalog.categories.append(CategoryEntry(name="featured"))
+
+    def save_categories(self):
+        if self.categories_path is None:
+            return
+        try:
+            save_catalog(self.category_catalog, self.categories_path)
+        except OSError:
+            logger.exception("Error saving category cache")
+
+    @work(exclusive=True, group="categories", exit_on_error=False)
+    async def revalidate_categories(self):
+        """Refresh the category list and the stale listings of recent categories"""
+        recent = self.category_catalog.recently_opened(
+            self.settings.cache.recent_categories
+        )
+        try:
+            await revalidate_catalog(
+                self.category_catalog,
+                self.api.store,
+                max_age=self.settings.cache.category_ttl,
+                max_concurrency=self.settings.concurrency.category_requests,
+                slot=lambda: self.load_scheduler.slot(LoadPriority.PREWARM),
+                names={self.current_category, *recent},
+            )
+        except Exception:
+            logger.exception("Error revalidating categories")
+        self.save_categories()
+
     @work
     async def action_choose_category(self):
-        self.current_category = await self.push_screen(
+        from store_tui.elements.category_modal import CategoryModal
+
+        category = await self.push_screen(
             CategoryModal(
-                categories=self.all_categories,
+                categories=self.category_catalog.categories,
                 current_category=self.current_category,
             ),
             wait_for_dismiss=True,
         )
-        top_snaps = self.api.store.get_top_snaps_from_category(self.current_category)
-        await self.data_table.update_table(top_snaps=top_snaps)
+        if category is None:
+            return
+        await self.run_table_load(
+            lambda generation: self.load_category(category, generation)
+        )
+
+    async def load_category(self, category: str, generation: int):
+        self.current_category = category
+        self.category_catalog.mark_opened(category, now=time.time())
+        self.search_query = None
+        self.stop_showing_installed()
         self.update_title()
 
+        # show the cached listing straight away, then replace it with a fresh one
+        entry = self.category_catalog.get(category)
+        if entry is not None and entry.rows:
+            self.data_table.set_rows((row.name, row.summary) for row in entry.rows)
+        try:
+            top_snaps = await self.get_current_listing()
+        except Exception as e:
+            if not self.load_scheduler.is_current(generation):
+                return
+            if entry is None or not entry.rows:
+                self.data_table.clear()
+            self.report_error(e, "Error - getting top snaps")
+            return
+        self.category_catalog.record_listing(category, top_snaps, now=time.time())
+        if self.load_scheduler.is_current(generation):
+            await self.data_table.update_table(top_snaps=top_snaps)
+
     @work
     async def action_search_snaps(self):
+        from store_tui.elements.search_modal import SnapSearchModal
+
         # open modal
         # get search query
         search_query: Input.Submitted = await self.push_screen(
             SnapSearchModal(), wait_for_dismiss=True
         )
-        self.current_category = "Search"
-        # send to update table to use "find" method
-        top_snaps = self.api.store.find(
-            query=search_query.value, fields=["title", "store-url", "summary"]
+        await self.run_table_load(
+            lambda generation: self.load_search(search_query.value, generation)
         )
-        await self.data_table.update_table(top_snaps=top_snaps)
+
+    async def load_search(self, query: str, generation: int):
+        self.current_category = "Search"
+        self.search_query = query
+        self.stop_showing_installed()
         self.update_title()
+        self.data_table.clear()
+        self.data_table.loading = True
+        # use the "find" method
+        try:
+            top_snaps = await self.get_current_listing()
+        except Exception as e:
+            if self.load_scheduler.is_current(generation):
+                self.report_error(e, "Error - searching snaps")
+            return
+        finally:
+            if self.load_scheduler.is_current(generation):
+                self.data_table.loading = False
+        if self.load_scheduler.is_current(generation):
+            await self.data_table.update_table(top_snaps=top_snaps)
+
+    async def run_table_load(self, load: Callable[[int], Awaitable[None]]):
+        """Fill the result table with `load`, cancelling the load running before it
+
+        Args:
+            load (Callable[[int], Awaitable[None]]): called with the load's
+                generation, it may only change the table while that is current
+        """
+        # the superseded load may have left the table in its loading state
+        self.data_table.loading = False
+        await self.load_scheduler.run(load)
+
+    def get_current_listing(self) -> Coroutine[None, None, SearchResponse]:
+        """Get the snaps for the current category, or the current search query"""
+        if self.current_category == "Search" and self.search_query is not None:
+            return self.api.store.find(
+                query=self.search_query, fields=["title", "store-url", "summary"]
+            )
+        return self.api.store.get_top_snaps_from_category(self.current_category)
 
     @work
     async def action_list_installed_snaps(self):
+        await self.run_table_load(self.load_installed_snaps)
+
+    async def load_installed_snaps(self, generation: int):
         if not self.snapd_api_available:
-            self.push_screen(
-                ErrorModal(
-                    ConnectionError(
-                        "Snapd API not available - need snapd-control interface connected"
-                    ),
-                    error_title="Error - listing installed snaps",
-                )
+            self.report_error(
+                ConnectionError(
+                    "Snapd API not available - need snapd-control interface connected"
+                ),
+                "Error - listing installed snaps",
             )
             return
 
-        try:
-            installed_snaps = await self.api.snaps.list_installed_snaps()
-            installed_snaps = convert_snaps_to_search_response(installed_snaps.result)
-        except Exception as e:
-            self.push_screen(
-                ErrorModal(e, error_title="Error - listing installed snaps")
+        # snapd is listed once, afterwards the model follows snapd's changes
+        if not self.installed_snaps.loaded:
+            self.data_table.loading = True
+            try:
+                await self.installed_snaps.load()
+            except Exception as e:
+                if self.load_scheduler.is_current(generation):
+                    self.report_error(e, "Error - listing installed snaps")
+                return
+            finally:
+                if self.load_scheduler.is_current(generation):
+                    self.data_table.loading = False
+            if not self.load_scheduler.is_current(generation):
+                return
+
+        self.showing_installed = True
+        self.data_table.set_rows(self.installed_snaps.rows())
+        self.watch_installed_snaps()
+
+    @work(exclusive=True, group="installed-snaps", exit_on_error=False)
+    async def watch_installed_snaps(self):
+        await self.installed_snaps.watch(
+            interval=self.settings.cache.installed_poll_interval
+        )
+
+    def stop_showing_installed(self):
+        self.showing_installed = False
+        self.workers.cancel_group(self, "installed-snaps")
+
+    @on(SnapStateStore.InstallStateChanged)
+    def on_install_state_changed(self, event: SnapStateStore.InstallStateChanged):
+        """Apply a snap's new state to the installed snaps, row by row while listed"""
+        if not self.installed_snaps.loaded:
+            return
+        operation = self.installed_snaps.apply(event.snap_name, event.state)
+        if not self.showing_installed or operation is None:
+            return
+        if operation == "remove":
+            self.data_table.remove_snap_row(event.snap_name)
+        else:
+            self.data_table.upsert_row(
+                event.snap_name, event.state.installed_snap.summary
             )
-            installed_snaps = SearchResponse(results=[])  # type: ignore
 
-        if installed_snaps:
-            await self.data_table.update_table(top_snaps=installed_snaps)
+    def action_filter_table(self):
+        self.filter_bar.open()
+
+    @on(Input.Changed, "#filter-bar")
+    def on_filter_changed(self, changed: Input.Changed):
+        self.data_table.filter_rows(changed.value)
+
+    @on(Input.Submitted, "#filter-bar")
+    def on_filter_submitted(self):
+        self.data_table.focus()
+
+    def action_toggle_instrumentation(self):
+        self.instrumentation_overlay.toggle()
+
+    def action_show_settings(self):
+        from store_tui.elements.settings_modal import SettingsModal
+
+        self.push_screen(SettingsModal(self.settings, self.config_path))
 
     def update_title(self):
         """Set title based on the current category"""
         self.title = f"store-tui - {self.current_category.capitalize()}"
 
     async def on_mount(self):
-        self.data_table.loading = True
+        self.snap_state.subscribe(self)
+        # show the previous session straight away, then revalidate it in the background
+        self.restore_categories()
+        if not self.restore_session():
+            self.data_table.loading = True
         self.call_after_refresh(self.init_main_screen)
         if self.preload_snap:
             self.call_after_refresh(self.load_snap_screen, snap_name=self.preload_snap)
 
+    def on_ready(self):
+        # the first frame is up, import the screens it did not need before they open
+        self.preload_deferred_modules()
+
+    @work(thread=True, exclusive=True, group="preload")
+    def preload_deferred_modules(self):
+        preload_modules(DEFERRED_MODULES)
+
     async def init_main_screen(self):
-        try:
-            categories_response = await self.api.store.get_categories()
-            self.all_categories = [
-                category.name or ""
-                for category in (categories_response.categories or [])
-            ]
-            top_snaps = self.api.store.get_top_snaps_from_category(
-                self.current_category
-            )
-        except Exception as e:
-            logger.exception("Error getting categories or top snaps")
-            categories_response = CategoryResponse(categories=[])
-            self.all_categories = ["featured"]
-            top_snaps = None  # type: ignore
-            self.push_screen(
-                ErrorModal(e, error_title="Error - getting categories or top snaps")
-            )
-        await self.data_table.update_table(top_snaps=top_snaps)
-        self.data_table.loading = False
+        await self.load_scheduler.run(self.load_initial_listing)
         if self.data_table.row_count > 0:
             self.data_table.focus()
+        self.revalidate_categories()
 
         # check snapd api access
         try:
@@ -164,36 +491,140 @@ class SnapStoreTUI(App):
         except Exception:
             self.snapd_api_available = False
 
+    async def load_initial_listing(self, generation: int):
+        try:
+            top_snaps = await self.get_current_listing()
+        except Exception as e:
+            logger.exception("Error getting top snaps")
+            top_snaps = None  # type: ignore
+            self.report_error(e, "Error - getting top snaps")
+        else:
+            if self.current_category != "Search":
+                self.category_catalog.mark_opened(
+                    self.current_category, now=time.time()
+                )
+                self.category_catalog.record_listing(
+                    self.current_category, top_snaps, now=time.time()
+                )
+        finally:
+            if self.load_scheduler.is_current(generation):
+                self.data_table.loading = False
+        if not self.load_scheduler.is_current(generation):
+            return
+        if top_snaps is not None or self.restored_session is None:
+            await self.data_table.update_table(top_snaps=top_snaps)
+            self.restore_cursor()
+
     async def load_snap_screen(self, snap_name: str):
         try:
             self.data_table.loading = True
-            if self.snapd_api_available:
-                snap_install_data = self.api.snaps.get_snap_info(snap_name)
-            else:
-                # empty await
-                snap_install_data = asyncio.sleep(0)
-            snap_info = self.api.store.retry_get_snap_info(
-                snap_name=snap_name, fields=VALID_SNAP_INFO_FIELDS
-            )
-            snap_install_data, snap_info = await asyncio.gather(
-                snap_install_data, snap_info
-            )
+            loaded_snap = await self.fetch_snap(snap_name)
         except Exception as e:
-            self.push_screen(ErrorModal(e, error_title="Error - retrieving snap info"))
-            snap_info = None
-            snap_install_data = None
+            self.report_error(e, "Error - retrieving snap info")
+            return
         finally:
             self.data_table.loading = False
 
-        if snap_info is None:
-            return
+        from store_tui.elements.snap_modal import SnapModal
+
         snap_modal = SnapModal(
             snap_name=snap_name,
             api=self.api,
+            snap_info=loaded_snap.snap_info,
+            snap_install_data=loaded_snap.install_data,
+            snap_state=self.snap_state,
+            icon=loaded_snap.icon,
+            icon_timeout=self.settings.store.icon_timeout
+            * self.settings.store.timeout_scale,
+            revision_history=self.revision_history,
+            launcher=self.launcher,
+            view_model=loaded_snap.view_model,
+            navigator=self.snap_navigator,
+        )
+        self.push_screen(
+            snap_modal, callback=lambda _: self.on_snap_modal_dismissed(snap_modal)
+        )
+
+    async def fetch_snap(self, snap_name: str) -> LoadedSnap:
+        """Get everything the snap screen shows for a snap
+
+        Recently viewed (and prefetched) snaps come from memory, only their install
+        state is fetched again.
+        """
+        recent_snap = self.memory_governor.recall(snap_name)
+        if self.snapd_api_available:
+            snap_install_data = self.snap_state.fetch(snap_name)
+        else:
+            # empty await
+            snap_install_data = asyncio.sleep(0)
+        async with self.load_scheduler.slot(LoadPriority.USER):
+            snap_install_data, (snap_info, view_model) = await asyncio.gather(
+                snap_install_data, self.load_view_model(snap_name, recent_snap)
+            )
+        return LoadedSnap(
+            snap_name=snap_name,
             snap_info=snap_info,
-            snap_install_data=snap_install_data,
+            view_model=view_model,
+            install_data=snap_install_data,
+            icon=recent_snap.icon if recent_snap is not None else None,
+        )
+
+    async def prefetch_snap(self, snap_name: str):
+        """Fetch a snap's info and view model into the recent snaps, if it is not there"""
+        if snap_name in self.memory_governor:
+            return
+        async with self.load_scheduler.slot(LoadPriority.PREFETCH):
+            snap_info, view_model = await self.load_view_model(snap_name, None)
+        # the snap may have been opened, with its icon, in the meantime
+        if snap_name not in self.memory_governor:
+            self.memory_governor.remember(snap_name, snap_info, None, view_model)
+
+    def remember_snap(self, loaded_snap: LoadedSnap):
+        self.memory_governor.remember(
+            loaded_snap.snap_name,
+            loaded_snap.snap_info,
+            loaded_snap.icon,
+            view_model=loaded_snap.view_model,
+        )
+
+    @cached_property
+    def snap_navigator(self) -> SnapNavigator:
+        return SnapNavigator(
+            self.data_table,
+            load=self.fetch_snap,
+            prefetch=self.prefetch_snap,
+            remember=self.remember_snap,
+            depth=self.settings.cache.prefetch_depth,
         )
-        self.push_screen(snap_modal)
+
+    async def load_view_model(
+        self, snap_name: str, recent_snap: RecentSnap | None
+    ) -> tuple[InfoResponse, SnapViewModel]:
+        """Get a snap's info and view model, reusing those of a recently viewed snap
+
+        A new view model is derived in a thread, while snapd is being asked for
+        the install state.
+        """
+        if recent_snap is not None and recent_snap.view_model is not None:
+            return recent_snap.snap_info, recent_snap.view_model
+        if recent_snap is not None:
+            snap_info = recent_snap.snap_info
+        else:
+            snap_info = await self.info_batcher.get_snap_info(
+                snap_name=snap_name, fields=VALID_SNAP_INFO_FIELDS
+            )
+        view_model = await asyncio.to_thread(
+            SnapViewModel.from_info, snap_name, snap_info
+        )
+        return snap_info, view_model
+
+    def on_snap_modal_dismissed(self, snap_modal: "SnapModal"):
+        """Keep the dismissed snap in the recent LRU and release the modal's own references"""
+        self.remember_snap(snap_modal.current_snap())
+        snap_modal.release()
+        # the footer is recomposed on every screen change, but only drops the data
+        # bindings of its old keys when its `compact` reactive fires
+        self.call_after_refresh(self.footer.mutate_reactive, Footer.compact)
 
     @on(DataTable.RowSelected)
     async def on_data_table_row_selected(self, row_selected: DataTable.RowSelected):
@@ -211,4 +642,25 @@ if __name__ == "__main__":
 
         args.snap = re.sub(r"^snap://", "", args.snap)
 
-    SnapStoreTUI(api=snaps_api, preload_snap=args.snap).run()
+    config_path = get_config_filepath()
+    try:
+        settings = load_settings(config_path)
+    except SettingsError as e:
+        parser.error(str(e))
+
+    error_log = start_error_log(
+        get_error_log_filepath(),
+        max_bytes=settings.errors.log_bytes,
+        backup_count=settings.errors.log_backups,
+    )
+    try:
+        SnapStoreTUI(
+            api=create_snap_client(prompt_for_authentication=True, settings=settings),
+            settings=settings,
+            config_path=config_path,
+            preload_snap=args.snap,
+            session_path=get_session_filepath(),
+            categories_path=get_categories_filepath(),
+        ).run()
+    finally:
+        error_log.stop()
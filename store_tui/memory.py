@@ -0,0 +1,130 @@
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from snap_python.schemas.store.info import InfoResponse
+
+from store_tui.view_model import SnapViewModel
+
+if TYPE_CHECKING:
+    # rendering icons pulls in PIL, which the first frame does not need
+    from rich_pixels import Pixels
+
+logger = logging.getLogger(__name__)
+
+# rough in-memory cost of one rendered icon segment (Segment tuple, text and Style)
+SEGMENT_SIZE_ESTIMATE = 160
+
+
+def get_rss() -> int | None:
+    """Resident set size of the current process in bytes, if it can be read
+
+    Returns:
+        int | None: RSS in bytes, None where /proc is unavailable
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def estimate_info_size(snap_info: InfoResponse) -> int:
+    """Approximate the retained size of a snap info response by its JSON size"""
+    return len(snap_info.model_dump_json())
+
+
+def estimate_icon_size(icon: "Pixels | None") -> int:
+    if icon is None or icon._segments is None:
+        return 0
+    return len(icon._segments.segments) * SEGMENT_SIZE_ESTIMATE
+
+
+@dataclass
+class RecentSnap:
+    snap_info: InfoResponse
+    icon: "Pixels | None"
+    size: int
+    view_model: SnapViewModel | None = None
+
+
+class MemoryGovernor:
+    """Bound the memory kept for snaps the user has already looked at
+
+    Dismissed snap screens hand their info response and rendered icon over to a
+    small LRU, so reopening a recent snap is instant. Entries are evicted once
+    either the entry count or the estimated retained size goes over its limit.
+    """
+
+    def __init__(
+        self, max_recent_snaps: int = 32, max_retained_bytes: int = 16 * 1024 * 1024
+    ) -> None:
+        self.max_recent_snaps = max_recent_snaps
+        self.max_retained_bytes = max_retained_bytes
+        self.retained_bytes = 0
+        self._recent: OrderedDict[str, RecentSnap] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def __contains__(self, snap_name: str) -> bool:
+        return snap_name in self._recent
+
+    def remember(
+        self,
+        snap_name: str,
+        snap_info: InfoResponse,
+        icon: "Pixels | None",
+        view_model: SnapViewModel | None = None,
+    ):
+        """Keep a snap's info, icon and view model for instant reopening
+
+        Args:
+            snap_name (str): name of the snap
+            snap_info (InfoResponse): store info for the snap
+            icon (Pixels | None): rendered icon, if it is specific to this snap
+            view_model (SnapViewModel | None, optional): view model derived from
+                the info, it is mostly references into the info and not counted
+        """
+        self.forget(snap_name)
+        entry = RecentSnap(
+            snap_info=snap_info,
+            icon=icon,
+            size=estimate_info_size(snap_info) + estimate_icon_size(icon),
+            view_model=view_model,
+        )
+        self._recent[snap_name] = entry
+        self.retained_bytes += entry.size
+        self._evict()
+
+    def recall(self, snap_name: str) -> RecentSnap | None:
+        entry = self._recent.get(snap_name)
+        if entry is not None:
+            self._recent.move_to_end(snap_name)
+        return entry
+
+    def forget(self, snap_name: str):
+        entry = self._recent.pop(snap_name, None)
+        if entry is not None:
+            self.retained_bytes -= entry.size
+
+    def _evict(self):
+        while self._recent and (
+            len(self._recent) > self.max_recent_snaps
+            or self.retained_bytes > self.max_retained_bytes
+        ):
+            snap_name, entry = self._recent.popitem(last=False)
+            self.retained_bytes -= entry.size
+            logger.debug(
+                "Evicted %s from recent snaps (%d bytes)", snap_name, entry.size
+            )
+
+    def stats(self) -> dict[str, int | None]:
+        return {
+            "rss": get_rss(),
+            "retained_bytes": self.retained_bytes,
+            "recent_snaps": len(self._recent),
+        }
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from snap_python.schemas.snaps import SingleInstalledSnapResponse
+from snap_python.schemas.store.info import InfoResponse
+from textual.widgets import DataTable
+from textual.widgets.data_table import RowDoesNotExist
+
+from store_tui.view_model import SnapViewModel
+
+if TYPE_CHECKING:
+    from rich_pixels import Pixels
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_DEPTH = 2
+
+
+@dataclass
+class LoadedSnap:
+    """Everything the snap screen needs to show a snap"""
+
+    snap_name: str
+    snap_info: InfoResponse
+    view_model: SnapViewModel
+    install_data: SingleInstalledSnapResponse | None
+    icon: "Pixels | None" = None
+
+
+class SnapNavigator:
+    """Move from the snap screen to the next or previous row of the result table
+
+    The snaps around the one being shown are fetched ahead, so stepping through
+    the rows does not wait on the store. Prefetches that fall out of the window
+    around the current snap are cancelled.
+    """
+
+    def __init__(
+        self,
+        table: DataTable,
+        load: Callable[[str], Awaitable[LoadedSnap]],
+        prefetch: Callable[[str], Awaitable[None]],
+        remember: Callable[[LoadedSnap], None],
+        depth: int = PREFETCH_DEPTH,
+    ) -> None:
+        self.table = table
+        self.load = load
+        self.remember = remember
+        self._prefetch = prefetch
+        self.depth = depth
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def neighbour(self, snap_name: str, step: int) -> str | None:
+        """Name of the snap `step` rows away from a snap, in the table's current order
+
+        Args:
+            snap_name (str): snap to start from
+            step (int): rows to move, negative to move up
+
+        Returns:
+            str | None: the snap's name, None past either end of the table or if
+            the snap is no longer shown
+        """
+        try:
+            index = self.table.get_row_index(snap_name)
+        except RowDoesNotExist:
+            return None
+        target = index + step
+        if not 0 <= target < self.table.row_count:
+            return None
+        return self.table.ordered_rows[target].key.value
+
+    def move_cursor(self, snap_name: str):
+        """Keep the table's cursor on the snap being shown"""
+        try:
+            self.table.move_cursor(row=self.table.get_row_index(snap_name))
+        except RowDoesNotExist:
+            pass
+
+    def prefetch_around(self, snap_name: str):
+        """Fetch the snaps up to `depth` rows away, nearest first"""
+        window = []
+        for distance in range(1, self.depth + 1):
+            for step in (distance, -distance):
+                name = self.neighbour(snap_name, step)
+                if name is not None:
+                    window.append(name)
+
+        for name, task in list(self._pending.items()):
+            if name not in window:
+                task.cancel()
+                del self._pending[name]
+        for name in window:
+            if name in self._pending:
+                continue
+            task = asyncio.create_task(self._prefetch_one(name))
+            self._pending[name] = task
+            task.add_done_callback(self._forget_task)
+
+    def _forget_task(self, task: asyncio.Task):
+        for name, pending in list(self._pending.items()):
+            if pending is task:
+                del self._pending[name]
+
+    async def _prefetch_one(self, snap_name: str):
+        try:
+            await self._prefetch(snap_name)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # the snap is fetched again, and the error shown, if it is opened
+            logger.debug("Error prefetching %s", snap_name, exc_info=True)
+
+    def close(self):
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
@@ -0,0 +1,76 @@
+import math
+import time
+from typing import Callable
+
+import humanize
+
+# time constant of the rate smoothing, in seconds
+RATE_SMOOTHING = 2.0
+
+
+class RateEstimator:
+    """Exponentially smoothed transfer rate and ETA from (done, total) samples
+
+    snapd reports a download task's progress in bytes. Samples arrive at uneven
+    intervals, so each one is weighted by the time since the previous sample.
+    """
+
+    def __init__(
+        self,
+        smoothing: float = RATE_SMOOTHING,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.smoothing = smoothing
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.rate: float | None = None
+        self.done = 0
+        self.total = 0
+        self._last_sample: tuple[float, int] | None = None
+
+    def add(self, done: int, total: int):
+        """Record a progress sample
+
+        Args:
+            done (int): units (bytes) done so far
+            total (int): total units
+        """
+        now = self.clock()
+        if self._last_sample is not None and (done < self.done or total != self.total):
+            # a new task (or a restarted one) starts its own estimate
+            self.reset()
+        self.done, self.total = done, total
+        if self._last_sample is None:
+            self._last_sample = (now, done)
+            return
+
+        last_time, last_done = self._last_sample
+        elapsed = now - last_time
+        if elapsed <= 0 or done == last_done:
+            return
+        instant_rate = (done - last_done) / elapsed
+        weight = 1 - math.exp(-elapsed / self.smoothing)
+        self.rate = (
+            instant_rate
+            if self.rate is None
+            else weight * instant_rate + (1 - weight) * self.rate
+        )
+        self._last_sample = (now, done)
+
+    @property
+    def eta(self) -> float | None:
+        """Seconds until done at the current rate, if known"""
+        if not self.rate:
+            return None
+        return max(self.total - self.done, 0) / self.rate
+
+    def describe(self) -> str:
+        """Human readable rate and ETA, empty until a rate is known"""
+        if self.rate is None or self.eta is None:
+            return ""
+        return (
+            f"{humanize.naturalsize(self.rate)}/s, "
+            f"{humanize.naturaldelta(self.eta)} left"
+        )
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import humanize
+from snap_python.components.store import StoreEndpoints
+from snap_python.schemas.store.info import ChannelMapItem
+from snap_python.schemas.store.refresh import RefreshResultData
+
+from store_tui.api.batching import REVISION_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# revision numbers scanned per store request; revisions are shared by every
+# architecture, so only some of the numbers in a span exist for a given one
+REVISION_SPAN = 25
+# spans scanned at most for one page, before handing back an empty page
+MAX_EMPTY_SPANS = 4
+
+
+@dataclass(frozen=True)
+class RevisionEntry:
+    """A snap revision with its display strings formatted once, up front"""
+
+    revision: int
+    version: str | None
+    confinement: str | None
+    created_at: datetime | None
+    size: str
+    created: str
+
+    @classmethod
+    def create(
+        cls,
+        revision: int,
+        version: str | None,
+        confinement: str | None,
+        created_at: datetime | None,
+        size: float | None,
+    ) -> "RevisionEntry":
+        return cls(
+            revision=revision,
+            version=version,
+            confinement=confinement,
+            created_at=created_at,
+            size=humanize.naturalsize(size) if size is not None else "unknown size",
+            created=(
+                humanize.naturaltime(created_at)
+                if created_at is not None
+                else "unknown"
+            ),
+        )
+
+    @classmethod
+    def from_channel(cls, channel: ChannelMapItem) -> "RevisionEntry":
+        return cls.create(
+            revision=channel.revision,
+            version=channel.version,
+            confinement=channel.confinement,
+            created_at=channel.channel.released_at,
+            size=channel.download.size if channel.download else None,
+        )
+
+    @classmethod
+    def from_refresh(cls, result: RefreshResultData) -> "RevisionEntry":
+        snap = result.snap
+        return cls.create(
+            revision=snap.revision,
+            version=snap.version,
+            confinement=snap.confinement,
+            created_at=snap.created_at,
+            size=snap.download.size if snap.download else None,
+        )
+
+    @property
+    def label(self) -> str:
+        version = f"v{self.version}" if self.version else "no version"
+        return f"{self.revision}: {version}, {self.size}, {self.created}"
+
+
+@dataclass
+class RevisionHistory:
+    """Revisions of a snap older than a channel's current one, loaded page by page"""
+
+    snap_name: str
+    architecture: str
+    # next (highest) revision number that has not been scanned yet
+    next_revision: int
+    entries: list[RevisionEntry] = field(default_factory=list)
+    _loading: asyncio.Task | None = field(default=None, repr=False)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.next_revision < 1
+
+
+class RevisionHistoryCache:
+    """Revision histories per (snap, channel, architecture), kept for the whole session
+
+    Pages are fetched from the store's refresh endpoint, which answers for many
+    revisions in one request. Nothing is fetched until a page is asked for, and a
+    page that is already loading is shared with every caller asking for it.
+    """
+
+    def __init__(
+        self,
+        store: StoreEndpoints,
+        max_histories: int = 64,
+        span: int = REVISION_SPAN,
+    ) -> None:
+        self.store = store
+        self.max_histories = max_histories
+        self.span = span
+        self._histories: OrderedDict[tuple[str, str, str], RevisionHistory] = (
+            OrderedDict()
+        )
+
+    def get(
+        self, snap_name: str, channel: ChannelMapItem, architecture: str
+    ) -> RevisionHistory:
+        """Get the (possibly partly loaded) history below a channel's current revision"""
+        key = (
+            snap_name,
+            f"{channel.channel.track}/{channel.channel.name}",
+            architecture,
+        )
+        history = self._histories.get(key)
+        if history is None:
+            history = RevisionHistory(
+                snap_name=snap_name,
+                architecture=architecture,
+                next_revision=(channel.revision or 1) - 1,
+            )
+            self._histories[key] = history
+            while len(self._histories) > self.max_histories:
+                self._histories.popitem(last=False)
+        self._histories.move_to_end(key)
+        return history
+
+    async def load_more(self, history: RevisionHistory) -> list[RevisionEntry]:
+        """Load the next page of older revisions
+
+        Spans of revision numbers are scanned until one holds a revision for the
+        history's architecture, up to MAX_EMPTY_SPANS spans per call.
+
+        Args:
+            history (RevisionHistory): history to extend
+
+        Returns:
+            list[RevisionEntry]: the newly loaded revisions, newest first
+        """
+        if history._loading is None or history._loading.done():
+            history._loading = asyncio.ensure_future(self._load_page(history))
+        return await asyncio.shield(history._loading)
+
+    async def _load_page(self, history: RevisionHistory) -> list[RevisionEntry]:
+        for _ in range(MAX_EMPTY_SPANS):
+            if history.exhausted:
+                break
+            top = history.next_revision
+            revisions = range(top, max(top - self.span, 0), -1)
+            entries = await self._fetch(history, revisions)
+            history.next_revision = revisions[-1] - 1
+            if entries:
+                history.entries.extend(entries)
+                return entries
+        return []
+
+    async def _fetch(
+        self, history: RevisionHistory, revisions: range
+    ) -> list[RevisionEntry]:
+        payload = {
+            "context": [],
+            "actions": [
+                {
+                    "action": "download",
+                    "instance-key": str(revision),
+                    "name": history.snap_name,
+                    "revision": revision,
+                }
+                for revision in revisions
+            ],
+            "fields": REVISION_FIELDS,
+        }
+        response = await self.store.snap_refresh(
+            snap_name=history.snap_name,
+            payload=payload,
+            extra_headers={"Snap-Device-Architecture": history.architecture},
+        )
+        response.raise_for_status()
+        entries = []
+        for result in response.json().get("results", []):
+            # revisions that do not exist for this architecture come back as errors
+            if result.get("result") == "error":
+                continue
+            try:
+                entries.append(
+                    RevisionEntry.from_refresh(RefreshResultData.model_validate(result))
+                )
+            except ValueError:
+                logger.debug("Skipping unreadable revision %s", result, exc_info=True)
+        return sorted(entries, key=lambda entry: entry.revision, reverse=True)
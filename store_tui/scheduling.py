@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LoadPriority(IntEnum):
+    # warming caches the user has not asked for, e.g. stale category listings
+    PREWARM = 0
+    # data the user is likely to ask for next, e.g. the snaps around the open one
+    PREFETCH = 1
+    # what the user is waiting on
+    USER = 2
+
+
+class TableLoadScheduler:
+    """Run the loads that fill the result table one at a time, newest first
+
+    Every load gets a generation number. Starting a load cancels the one before
+    it, along with any request it is awaiting, and only the latest generation is
+    current, so a superseded load can never write to the table. Background work
+    waits for a slot, which is only given out while no higher priority work is
+    running.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self._current: asyncio.Task | None = None
+        self._active: Counter[LoadPriority] = Counter()
+        self._waiting: Counter[LoadPriority] = Counter()
+        self._released = asyncio.Event()
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    @property
+    def loading(self) -> bool:
+        return self._current is not None and not self._current.done()
+
+    async def run(self, load: Callable[[int], Awaitable[T]]) -> T | None:
+        """Run a table load, superseding the running one
+
+        Args:
+            load (Callable[[int], Awaitable[T]]): called with the load's generation,
+                which it should check with `is_current` before changing the table
+                after any await
+
+        Returns:
+            T | None: the load's result, None if a newer load superseded it
+        """
+        self.generation += 1
+        generation = self.generation
+        if self._current is not None and not self._current.done():
+            logger.debug("Load %d superseded by %d", generation - 1, generation)
+            self._current.cancel()
+
+        task = asyncio.ensure_future(self._run_user(load, generation))
+        self._current = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                # the caller itself is being cancelled
+                raise
+            return None
+
+    async def _run_user(
+        self, load: Callable[[int], Awaitable[T]], generation: int
+    ) -> T:
+        async with self.slot(LoadPriority.USER):
+            return await load(generation)
+
+    def _busy_above(self, priority: LoadPriority) -> bool:
+        """Whether higher priority work is running, or waiting for its turn"""
+        return any(
+            self._active[other] or self._waiting[other]
+            for other in LoadPriority
+            if other > priority
+        )
+
+    def _wake(self):
+        # wake every waiter to check again, with a fresh event for the next wait
+        released, self._released = self._released, asyncio.Event()
+        released.set()
+
+    @asynccontextmanager
+    async def slot(self, priority: LoadPriority) -> AsyncIterator[None]:
+        """Wait until no work of a higher priority is running, and hold a slot
+
+        Args:
+            priority (LoadPriority): priority of the work done in the slot
+        """
+        # waiters count as busy too, so when a release wakes waiters of different
+        # priorities, the lower ones keep waiting until the higher ones are done
+        while self._busy_above(priority):
+            self._waiting[priority] += 1
+            try:
+                await self._released.wait()
+            except asyncio.CancelledError:
+                self._waiting[priority] -= 1
+                self._wake()
+                raise
+            self._waiting[priority] -= 1
+        self._active[priority] += 1
+        try:
+            yield
+        finally:
+            self._active[priority] -= 1
+            self._wake()
+
+    def cancel(self):
+        if self._current is not None:
+            self._current.cancel()
@@ -0,0 +1,67 @@
+import logging
+import os
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# only keep enough rows to fill the first screens of the table
+MAX_SESSION_ROWS = 200
+
+
+def get_session_filepath() -> Path:
+    """Location of the session file, following the XDG base directory spec
+
+    Returns:
+        Path: $XDG_STATE_HOME/store-tui/session.json
+    """
+    state_home = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(state_home) / "store-tui" / "session.json"
+
+
+class SessionRow(BaseModel):
+    name: str
+    summary: str | None = None
+
+
+class SessionState(BaseModel):
+    """State of the main screen, saved on quit and restored on the next launch"""
+
+    current_category: str = "featured"
+    search_query: str | None = None
+    cursor_row: int = 0
+    cursor_snap: str | None = None
+    rows: list[SessionRow] = Field(default_factory=list)
+
+
+def load_session(path: Path) -> SessionState | None:
+    """Load a saved session, ignoring missing or unreadable files
+
+    Args:
+        path (Path): session file
+
+    Returns:
+        SessionState | None: the saved session, if any
+    """
+    try:
+        return SessionState.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValidationError):
+        logger.warning("Ignoring unreadable session file %s", path, exc_info=True)
+        return None
+
+
+def save_session(state: SessionState, path: Path):
+    """Atomically write the session file
+
+    Args:
+        state (SessionState): session to save
+        path (Path): session file
+    """
+    state.rows = state.rows[:MAX_SESSION_ROWS]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(state.model_dump_json())
+    tmp_path.replace(path)
@@ -0,0 +1,191 @@
+import weakref
+from dataclasses import dataclass
+
+from snap_python.client import SnapClient
+from snap_python.schemas.changes import ChangesResponse
+from snap_python.schemas.common import BaseErrorResult
+from snap_python.schemas.snaps import InstalledSnap, SingleInstalledSnapResponse
+from textual.message import Message
+from textual.message_pump import MessagePump
+
+from store_tui.api.batching import SnapdStatusBatcher
+
+
+@dataclass
+class SnapState:
+    """What snapd last reported for a snap, and the change running on it, if any"""
+
+    install_data: SingleInstalledSnapResponse | None = None
+    change_id: str | None = None
+
+    @property
+    def installed_snap(self) -> InstalledSnap | None:
+        if self.install_data is None or not isinstance(
+            self.install_data.result, InstalledSnap
+        ):
+            return None
+        return self.install_data.result
+
+    @property
+    def is_installed(self) -> bool:
+        return self.installed_snap is not None
+
+
+class SnapStateStore:
+    """Single source of truth for the install state of snaps
+
+    Screens subscribe to the store and receive its events as Textual messages,
+    so every open screen re-renders from the same state instead of querying
+    snapd on its own. Subscribers are weakly referenced: a dismissed screen
+    drops out of the store without unsubscribing.
+    """
+
+    class InstallStateChanged(Message):
+        """The installed revision or channel of a snap changed"""
+
+        bubble = False
+
+        def __init__(self, snap_name: str, state: SnapState) -> None:
+            super().__init__()
+            self.snap_name = snap_name
+            self.state = state
+
+    class ChangeProgress(Message):
+        """A snapd change (install, remove, ...) on a snap made progress
+
+        `done` and `total` add up every task of the change. `task_kind`,
+        `task_done` and `task_total` are those of the task currently running, in
+        bytes for "download-snap" tasks.
+        """
+
+        bubble = False
+
+        def __init__(
+            self,
+            snap_name: str,
+            change_id: str,
+            done: int,
+            total: int,
+            summary: str,
+            task_kind: str = "",
+            task_done: int = 0,
+            task_total: int = 0,
+        ) -> None:
+            super().__init__()
+            self.snap_name = snap_name
+            self.change_id = change_id
+            self.done = done
+            self.total = total
+            self.summary = summary
+            self.task_kind = task_kind
+            self.task_done = task_done
+            self.task_total = task_total
+
+    class ChangeFinished(Message):
+        """A snapd change on a snap is ready, `error` is set if it failed"""
+
+        bubble = False
+
+        def __init__(self, snap_name: str, change_id: str, error: str | None) -> None:
+            super().__init__()
+            self.snap_name = snap_name
+            self.change_id = change_id
+            self.error = error
+
+    def __init__(self, api: SnapClient, batch_window: float = 0.005) -> None:
+        self.api = api
+        self.states: dict[str, SnapState] = {}
+        self.status_batcher = SnapdStatusBatcher(api, window=batch_window)
+        self._subscribers: weakref.WeakSet[MessagePump] = weakref.WeakSet()
+
+    def subscribe(self, subscriber: MessagePump):
+        self._subscribers.add(subscriber)
+
+    def unsubscribe(self, subscriber: MessagePump):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, message_type: type[Message], *args, **kwargs):
+        """Post a new message of `message_type` to every subscriber"""
+        for subscriber in list(self._subscribers):
+            # messages carry per-delivery state, so each subscriber gets its own
+            subscriber.post_message(message_type(*args, **kwargs))
+
+    def get(self, snap_name: str) -> SnapState:
+        return self.states.setdefault(snap_name, SnapState())
+
+    async def fetch(self, snap_name: str) -> SingleInstalledSnapResponse:
+        """Query snapd for a snap's install state, batched with concurrent queries
+
+        Args:
+            snap_name (str): name of the snap
+
+        Returns:
+            SingleInstalledSnapResponse: snapd's response
+        """
+        install_data = await self.status_batcher.get_snap_info(snap_name)
+        self.set_install_data(snap_name, install_data)
+        return install_data
+
+    def set_install_data(
+        self,
+        snap_name: str,
+        install_data: SingleInstalledSnapResponse | None,
+        publish: bool = True,
+    ):
+        """Record a snap's install state, publishing an event only if it changed
+
+        Args:
+            snap_name (str): name of the snap
+            install_data (SingleInstalledSnapResponse | None): snapd's response
+            publish (bool, optional): publish the change, False when seeding the
+                store from a full listing. Defaults to True.
+        """
+        state = self.get(snap_name)
+        if state.install_data == install_data:
+            return
+        state.install_data = install_data
+        if publish:
+            self.publish(self.InstallStateChanged, snap_name, state)
+
+    async def track_change(self, snap_name: str, change_id: str):
+        """Follow a snapd change to completion, publishing its progress
+
+        The snap's install state is queried once, when the change is ready.
+
+        Args:
+            snap_name (str): snap the change operates on
+            change_id (str): snapd change id
+        """
+        state = self.get(snap_name)
+        state.change_id = change_id
+        error = None
+        last_progress = None
+        try:
+            change: ChangesResponse
+            async for change in self.api.get_changes_by_id_generator(change_id):
+                if isinstance(change.result, BaseErrorResult):
+                    error = change.result.message
+                    break
+                if change.ready:
+                    error = change.result.err
+                    break
+                active_tasks = [t for t in change.result.tasks if t.status == "Doing"]
+                active_task = active_tasks[0] if active_tasks else None
+                overall = change.result.overall_progress
+                progress = dict(
+                    done=overall.done,
+                    total=overall.total,
+                    summary=active_task.summary if active_task else "",
+                    task_kind=active_task.kind if active_task else "",
+                    task_done=active_task.progress.done if active_task else 0,
+                    task_total=active_task.progress.total if active_task else 0,
+                )
+                # snapd is polled far more often than its progress moves
+                if progress == last_progress:
+                    continue
+                last_progress = progress
+                self.publish(self.ChangeProgress, snap_name, change_id, **progress)
+        finally:
+            state.change_id = None
+        self.publish(self.ChangeFinished, snap_name, change_id, error)
+        await self.fetch(snap_name)
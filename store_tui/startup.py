@@ -0,0 +1,166 @@
+"""What the first frame imports, and loading everything else after it
+
+Launched from the snap, every module is read from squashfs, so the main screen
+only imports what it draws. The other screens (and PIL, markdown and the text
+area behind them) are imported where they are opened, and preloaded in a thread
+once the first frame is up. `snapshot` records the modules imported by the time
+of the first frame, in import order, and fails if a deferred one is among them:
+
+    python -m store_tui.startup snapshot --output first-frame-modules.txt
+
+`first-frame` starts the app headless and prints when its first frame was
+drawn, which tests/benchmarks/bench_startup.py compares across launch modes.
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# imported after the first frame, in this order
+DEFERRED_MODULES = (
+    "store_tui.elements.snap_modal",
+    "store_tui.elements.error_modal",
+    "store_tui.elements.category_modal",
+    "store_tui.elements.search_modal",
+    "store_tui.elements.settings_modal",
+)
+# imported by the deferred screens only, so they must not be in the snapshot either
+DEFERRED_DEPENDENCIES = (
+    "PIL",
+    "rich_pixels",
+    "markdown_it",
+    "textual.widgets._markdown",
+    "textual.widgets._text_area",
+)
+
+
+def preload_modules(modules: Iterable[str] = DEFERRED_MODULES) -> list[str]:
+    """Import modules ahead of their first use
+
+    Args:
+        modules (Iterable[str]): module names, imported in order
+
+    Returns:
+        list[str]: the modules that were imported, failures are logged and skipped
+    """
+    loaded = []
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            # the error is raised again where the module is used
+            logger.exception("Error preloading %s", module)
+            continue
+        loaded.append(module)
+    return loaded
+
+
+def deferred_in(modules: Iterable[str]) -> list[str]:
+    """The deferred modules (or their dependencies) among `modules`"""
+    deferred = DEFERRED_MODULES + DEFERRED_DEPENDENCIES
+    return [
+        module
+        for module in modules
+        if module in deferred or module.split(".", 1)[0] in DEFERRED_DEPENDENCIES
+    ]
+
+
+class FirstFrame(NamedTuple):
+    # time.monotonic() when the first frame was drawn, comparable across processes
+    ready_at: float
+    # sys.modules at the first frame, in import order
+    modules: list[str]
+
+
+def run_to_first_frame(eager: bool = False) -> FirstFrame:
+    """Start the app headless, and exit as soon as its first frame is drawn
+
+    The app is built as a launch builds it, but without a session or category
+    cache to restore.
+
+    Args:
+        eager (bool, optional): import the deferred modules before the app, as
+            every launch did before they were deferred
+
+    Returns:
+        FirstFrame: when the first frame was drawn, and what was imported by then
+    """
+    if eager:
+        preload_modules(DEFERRED_MODULES)
+
+    from store_tui.api.client import create_snap_client
+    from store_tui.config import get_config_filepath, load_settings
+    from store_tui.main import SnapStoreTUI
+
+    first_frame: list[FirstFrame] = []
+
+    class FirstFrameApp(SnapStoreTUI):
+        def on_ready(self):
+            first_frame.append(FirstFrame(time.monotonic(), list(sys.modules)))
+            self.exit()
+
+    settings = load_settings(get_config_filepath())
+    app = FirstFrameApp(api=create_snap_client(settings=settings), settings=settings)
+    app.run(headless=True)
+    if not first_frame:
+        raise RuntimeError("The app exited before drawing its first frame")
+    return first_frame[0]
+
+
+parser = argparse.ArgumentParser(
+    prog="store_tui.startup",
+    description="Inspect and time what the TUI imports before its first frame",
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+snapshot_parser = subparsers.add_parser(
+    "snapshot", help="list the modules imported by the first frame, in import order"
+)
+snapshot_parser.add_argument(
+    "--output", type=Path, help="file to write the list to, instead of stdout"
+)
+first_frame_parser = subparsers.add_parser(
+    "first-frame", help="print when the first frame was drawn, as JSON"
+)
+first_frame_parser.add_argument(
+    "--eager", action="store_true", help="import the deferred modules up front"
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parser.parse_args(argv)
+    if args.command == "first-frame":
+        first_frame = run_to_first_frame(eager=args.eager)
+        print(
+            json.dumps(
+                {
+                    "ready_at": first_frame.ready_at,
+                    "modules": len(first_frame.modules),
+                }
+            )
+        )
+        return 0
+
+    first_frame = run_to_first_frame()
+    snapshot = "\n".join(first_frame.modules) + "\n"
+    if args.output is None:
+        sys.stdout.write(snapshot)
+    else:
+        args.output.write_text(snapshot)
+    deferred = deferred_in(first_frame.modules)
+    if deferred:
+        print(
+            f"Imported before the first frame: {', '.join(deferred)}", file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+import humanize
+from snap_python.schemas.common import BaseErrorResult, Media
+from snap_python.schemas.snaps import SingleInstalledSnapResponse
+from snap_python.schemas.store.info import InfoResponse
+
+from store_tui.channel_matrix import ChannelMatrix
+from store_tui.elements.utils import get_platform_architecture
+
+
+def get_icon_url(media: list[Media] | None) -> str | None:
+    """Get the icon_url from the media list"""
+    if media is None:
+        return None
+    for media_obj in media:
+        if media_obj.type == "icon":
+            return media_obj.url
+    return None
+
+
+def get_installed_message(
+    snap_install_data: SingleInstalledSnapResponse | None,
+) -> str:
+    if snap_install_data is None:
+        return "Installed: 🚫 (snapd unaccessible)"
+    if isinstance(snap_install_data.result, BaseErrorResult):
+        return "Installed: ❌"
+    installed_version = (
+        f"v{snap_install_data.result.version}"
+        if snap_install_data.result.version
+        else f"rev. {snap_install_data.result.revision}"
+    )
+    return f"Installed: ✅ ({installed_version})"
+
+
+def get_last_updated_message(
+    last_updated: datetime | None, now: datetime | None = None
+) -> str:
+    """Relative to `now` (the current time by default), so formatted when shown"""
+    if last_updated is None:
+        return "Last Updated: Unknown"
+    return f"Last Updated: {humanize.naturaltime(last_updated, when=now)}"
+
+
+@dataclass(frozen=True)
+class SnapViewModel:
+    """Everything the snap screen shows, derived once from a snap's info
+
+    Building it scans the channel map and formats every label, so it is built off
+    the UI path while the snap loads, and kept with the snap info for reopening.
+    Only the last update time is formatted when shown, as it is relative to now.
+    """
+
+    snap_name: str
+    title: str
+    publisher: str
+    summary: str
+    description: str
+    license: str
+    store_url: str | None
+    app_center_url: str
+    icon_url: str | None
+    architectures: tuple[str, ...]
+    architectures_label: str
+    supported_label: str
+    last_updated: datetime | None
+    channel_matrix: ChannelMatrix
+    installed_message: str = get_installed_message(None)
+
+    @classmethod
+    def from_info(
+        cls,
+        snap_name: str,
+        snap_info: InfoResponse,
+        snap_install_data: SingleInstalledSnapResponse | None = None,
+    ) -> "SnapViewModel":
+        """Derive the view model of a snap
+
+        Args:
+            snap_name (str): name of the snap
+            snap_info (InfoResponse): store info for the snap
+            snap_install_data (SingleInstalledSnapResponse | None, optional):
+                snapd's install data, None when snapd is not accessible
+
+        Raises:
+            ValueError: the info response has no snap
+
+        Returns:
+            SnapViewModel: the view model
+        """
+        snap = snap_info.snap
+        if not snap:
+            raise ValueError(f"Snap with name {snap_name} not found")
+
+        architectures = set()
+        last_updated = None
+        for channel in snap_info.channel_map:
+            if channel.architectures:
+                architectures.update(channel.architectures)
+            if channel.created_at is not None and (
+                last_updated is None or channel.created_at > last_updated
+            ):
+                last_updated = channel.created_at
+        sorted_architectures = tuple(sorted(architectures))
+
+        platform_architecture = get_platform_architecture()
+        supported = "✅" if platform_architecture in architectures else "❌"
+        return cls(
+            snap_name=snap_name,
+            title=snap.title,
+            publisher=snap.publisher.display_name,
+            summary=snap.summary,
+            description=snap.description,
+            license=f"License: {snap.license or 'unset'}",
+            store_url=snap.store_url,
+            app_center_url=f"snap://{snap_name}",
+            icon_url=get_icon_url(snap.media),
+            architectures=sorted_architectures,
+            architectures_label=f"Architectures: {', '.join(sorted_architectures)}",
+            supported_label=f"Supported: {supported} on {platform_architecture}",
+            last_updated=last_updated,
+            channel_matrix=ChannelMatrix.from_channel_map(snap_info.channel_map),
+            installed_message=get_installed_message(snap_install_data),
+        )
+
+    def with_install_data(
+        self, snap_install_data: SingleInstalledSnapResponse | None
+    ) -> "SnapViewModel":
+        """The same view model, with the install state of `snap_install_data`"""
+        installed_message = get_installed_message(snap_install_data)
+        if installed_message == self.installed_message:
+            return self
+        return replace(self, installed_message=installed_message)
@@ -0,0 +1,83 @@
+"""Benchmark icon rendering: inline decoding vs the imaging executor
+
+Icons in the store are mostly 256x256 or 512x512 PNGs, with some publishers
+uploading much larger images. For each size, this measures the time spent
+rendering a batch of icons and the longest stall seen by the event loop.
+
+Run with: python tests/benchmarks/bench_imaging.py
+"""
+
+import asyncio
+import io
+import random
+import time
+
+from PIL import Image
+from rich_pixels import Pixels
+
+from store_tui.imaging import ICON_SIZE, ImagingExecutor
+
+ICON_SIZES = (64, 128, 256, 512, 1024, 2048)
+ICONS_PER_SIZE = 8
+
+
+def make_icon(size: int) -> bytes:
+    # random noise compresses badly, which is a pessimistic stand-in for real icons
+    image = Image.frombytes("RGBA", (size, size), random.randbytes(size * size * 4))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def measure_loop_stall(work) -> tuple[float, float]:
+    """Run `work` while a ticker measures the longest gap between loop iterations"""
+    max_gap = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal max_gap
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            max_gap = max(max_gap, now - last)
+            last = now
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker_task
+    return elapsed, max_gap
+
+
+async def main():
+    executor = ImagingExecutor()
+    print(
+        f"{'size':>6} {'inline total':>13} {'inline stall':>13} "
+        f"{'pool total':>11} {'pool stall':>11}"
+    )
+    for size in ICON_SIZES:
+        icons = [make_icon(size) for _ in range(ICONS_PER_SIZE)]
+
+        async def inline():
+            for icon in icons:
+                with Image.open(io.BytesIO(icon)) as image:
+                    Pixels.from_image(image, resize=ICON_SIZE)
+                await asyncio.sleep(0)
+
+        async def pooled():
+            await asyncio.gather(*(executor.render(icon) for icon in icons))
+
+        inline_total, inline_stall = await measure_loop_stall(inline)
+        pool_total, pool_stall = await measure_loop_stall(pooled)
+        print(
+            f"{size:>6} {inline_total * 1000:>11.1f}ms {inline_stall * 1000:>11.1f}ms "
+            f"{pool_total * 1000:>9.1f}ms {pool_stall * 1000:>9.1f}ms"
+        )
+    executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
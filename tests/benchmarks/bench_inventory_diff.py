@@ -0,0 +1,113 @@
+"""Benchmark diffing many machines' inventories against a baseline, or the store
+
+Writes one inventory file per machine, each a baseline of installed snaps with
+a few revisions changed and snaps added or removed, then times the `diff` CLI
+command over all of them and the peak memory it used. `--command diff-store`
+times `diff-store` instead, against a fake store serving the same snaps; its
+peak memory should stay flat as machines are added, like that of `diff`.
+
+Run with: python tests/benchmarks/bench_inventory_diff.py [--machines N]
+    [--command diff|diff-store]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import IO
+
+from snap_python.client import SnapClient
+
+from store_tui.api.client import create_snap_client
+from store_tui.cli import NDJSONWriter, parser, run
+from store_tui.config import Settings
+from store_tui.fake_store import FakeStoreServer, SyntheticCatalog
+from store_tui.inventory import Inventory, InventoryEntry
+
+SNAPS_PER_MACHINE = 60
+CHANGES_PER_MACHINE = 3
+CATALOG = SyntheticCatalog(snap_count=SNAPS_PER_MACHINE + 50, seed=0)
+SNAP_NAMES = list(CATALOG.snaps)
+
+
+def make_inventory(machine: str, rng: random.Random) -> Inventory:
+    entries = {
+        name: InventoryEntry(name, "latest/stable", str(100 + index), "strict", "1.0")
+        for index, name in enumerate(SNAP_NAMES[:SNAPS_PER_MACHINE])
+    }
+    for _ in range(CHANGES_PER_MACHINE):
+        name = rng.choice(list(entries))
+        entries[name] = entries[name]._replace(revision=str(rng.randint(1, 1000)))
+    entries.pop(rng.choice(list(entries)))
+    extra = rng.choice(SNAP_NAMES[SNAPS_PER_MACHINE:])
+    entries[extra] = InventoryEntry(extra, "latest/edge", "1", "classic", None)
+    return Inventory(machine, "amd64", "2024-06-01T00:00:00+00:00", entries)
+
+
+def write(path: Path, inventory: Inventory):
+    with open(path, "w") as f:
+        writer = NDJSONWriter(f)
+        for record in inventory.records():
+            writer.write(record)
+
+
+async def run_command(args, output: IO[str]):
+    if args.command == "diff":
+        await run(args, SnapClient(), NDJSONWriter(output))
+        return
+    server = FakeStoreServer(CATALOG)
+    await server.start()
+    try:
+        settings = Settings(store={"base_url": server.url})
+        api = create_snap_client(settings=settings)
+        await run(args, api, NDJSONWriter(output), settings)
+    finally:
+        await server.stop()
+
+
+def main(machines: int, command: str):
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = Path(directory) / "baseline.ndjson"
+        write(baseline, make_inventory("baseline", random.Random(1)))
+        paths = []
+        for index in range(machines):
+            path = Path(directory) / f"machine-{index}.ndjson"
+            write(path, make_inventory(f"machine-{index}", rng))
+            paths.append(str(path))
+
+        if command == "diff":
+            args = parser.parse_args(["diff", str(baseline), *paths])
+        else:
+            args = parser.parse_args(["diff-store", *paths])
+        output = io.StringIO()
+        start = time.perf_counter()
+        asyncio.run(run_command(args, output))
+        elapsed = time.perf_counter() - start
+        # traced separately, tracing slows the diff down several times, and without
+        # keeping the output, which would grow with the machines compared
+        with open(os.devnull, "w") as devnull:
+            tracemalloc.start()
+            asyncio.run(run_command(args, devnull))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    differences = output.getvalue().count("\n")
+    print(
+        f"{command}, {machines} machines x {SNAPS_PER_MACHINE} snaps: {elapsed:.2f}s"
+        f" ({elapsed / machines * 1e3:.2f}ms per machine),"
+        f" {differences} differences, peak {peak / 1024 / 1024:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--machines", type=int, default=2000)
+    arg_parser.add_argument("--command", choices=("diff", "diff-store"), default="diff")
+    args = arg_parser.parse_args()
+    main(args.machines, args.command)
@@ -0,0 +1,78 @@
+"""Soak test: open and dismiss 1,000 snaps, sampling RSS and retained state
+
+The store and snapd are replaced with in-memory responses built from the test
+fixtures, so only the app's own memory behaviour is measured. A healthy run
+shows RSS levelling off once the recent-snaps LRU is full.
+
+Run with: python tests/benchmarks/bench_memory_soak.py [number of snaps]
+"""
+
+import asyncio
+import pathlib
+import sys
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import humanize
+from snap_python.client import SnapClient
+from snap_python.schemas.store.categories import CategoryResponse
+from snap_python.schemas.store.info import InfoResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.imaging import PLACEHOLDER_ICON_FILEPATH
+from store_tui.main import SnapStoreTUI
+from store_tui.memory import get_rss
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent.parent / "data"
+SAMPLE_EVERY = 100
+
+
+def make_api() -> SnapClient:
+    api = SnapClient()
+    with open(TESTS_DATA_DIR / "snap_info_response_success.json") as f:
+        snap_info = InfoResponse.model_validate_json(f.read())
+
+    async def get_snap_info(snap_name, fields=None):
+        # a distinct object per snap, as a real response would be
+        return snap_info.model_copy(update={"name": snap_name}, deep=True)
+
+    api.store.get_categories = AsyncMock(return_value=CategoryResponse(categories=[]))
+    api.store.get_top_snaps_from_category = AsyncMock(
+        return_value=SearchResponse(results=[])
+    )
+    api.store.get_snap_info = AsyncMock(side_effect=get_snap_info)
+    api.store.store_client.get = AsyncMock(
+        return_value=httpx.Response(
+            200,
+            content=PLACEHOLDER_ICON_FILEPATH.read_bytes(),
+            request=httpx.Request("GET", "https://example.com/icon.png"),
+        )
+    )
+    return api
+
+
+async def main(snap_count: int):
+    app = SnapStoreTUI(api=make_api())
+    print(f"{'snaps':>6} {'rss':>10} {'retained':>10} {'recent':>7} {'ms/snap':>8}")
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        start = time.perf_counter()
+        for index in range(1, snap_count + 1):
+            await app.load_snap_screen(f"snap-{index}")
+            await pilot.pause()
+            await pilot.press("q")
+            await pilot.pause()
+            if index % SAMPLE_EVERY == 0:
+                stats = app.memory_governor.stats()
+                elapsed = (time.perf_counter() - start) * 1000 / SAMPLE_EVERY
+                print(
+                    f"{index:>6} {humanize.naturalsize(get_rss() or 0):>10} "
+                    f"{humanize.naturalsize(stats['retained_bytes']):>10} "
+                    f"{stats['recent_snaps']:>7} {elapsed:>8.1f}"
+                )
+                start = time.perf_counter()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,97 @@
+"""Benchmark the snap screen's per-compose work: inline formatting vs a view model
+
+The inline path is what SnapModal.compose used to do each time it was built:
+look up the platform twice, scan the channel map for architectures and the last
+update, and format every label. The view model does that once per snap in a
+thread while the snap loads (building its channel matrix too), and a reopened
+snap reuses it, formatting only the last update time again. The FreeCAD fixture's channel map is repeated to
+show how each path scales with bigger channel maps.
+
+Run with: python tests/benchmarks/bench_snap_view_model.py
+"""
+
+import json
+import platform
+import timeit
+from pathlib import Path
+
+import humanize
+from snap_python.schemas.store.info import InfoResponse
+
+from store_tui.view_model import SnapViewModel, get_last_updated_message
+
+FIXTURE = Path(__file__).parent.parent / "notebooks" / "freecad_snap_info_response.json"
+CHANNEL_MAP_SCALES = (1, 10, 100)
+NUMBER = 200
+
+
+def platform_architecture() -> str:
+    # get_platform_architecture before it was cached
+    machine_arch = platform.machine()
+    if machine_arch == "x86_64":
+        return "amd64"
+    if machine_arch == "aarch64":
+        return "arm64"
+    return machine_arch
+
+
+def inline_labels(snap_info: InfoResponse) -> list[str]:
+    snap = snap_info.snap
+    architectures = set()
+    for channel in snap_info.channel_map:
+        if channel.architectures:
+            architectures.update(channel.architectures)
+    supported_architectures = sorted(architectures)
+    last_modified_date = None
+    for channel in snap_info.channel_map:
+        if last_modified_date is None:
+            last_modified_date = channel.created_at
+            continue
+        last_modified_date = max(last_modified_date, channel.created_at)
+    return [
+        snap.title,
+        snap.publisher.display_name,
+        f"License: {snap.license or 'unset'}",
+        f"Supported: {'✅' if platform_architecture() in supported_architectures else '❌'} on {platform_architecture()}",
+        f"snap://{snap.name}",
+        f"Last Updated: {humanize.naturaltime(last_modified_date)}",
+        f"Architectures: {', '.join(supported_architectures)}",
+    ]
+
+
+def view_model_labels(view_model: SnapViewModel) -> list[str]:
+    return [
+        view_model.title,
+        view_model.publisher,
+        view_model.license,
+        view_model.supported_label,
+        view_model.app_center_url,
+        get_last_updated_message(view_model.last_updated),
+        view_model.architectures_label,
+    ]
+
+
+def main():
+    data = json.loads(FIXTURE.read_text())
+    print(
+        f"{'channels':>9} {'inline':>10} {'build once':>11} {'reopen':>10}"
+        "   (per compose)"
+    )
+    for scale in CHANNEL_MAP_SCALES:
+        scaled = dict(data, channel_map=data["channel_map"] * scale)
+        snap_info = InfoResponse.model_validate(scaled)
+        view_model = SnapViewModel.from_info("freecad", snap_info)
+
+        inline = timeit.timeit(lambda: inline_labels(snap_info), number=NUMBER)
+        build = timeit.timeit(
+            lambda: SnapViewModel.from_info("freecad", snap_info), number=NUMBER
+        )
+        reopen = timeit.timeit(lambda: view_model_labels(view_model), number=NUMBER)
+        print(
+            f"{len(snap_info.channel_map):>9} {inline / NUMBER * 1e6:>8.1f}us"
+            f" {build / NUMBER * 1e6:>9.1f}us {reopen / NUMBER * 1e6:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
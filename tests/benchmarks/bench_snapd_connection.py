@@ -0,0 +1,120 @@
+"""Benchmark snapd calls: default client vs the persistent, batched client
+
+A fake snapd answers on a unix socket, so only connection handling and request
+count are measured. The default client is a plain SnapClient, whose pool drops
+idle connections after 5s. `--idle` inserts a pause like a user's between
+actions. The persistent client keeps its connections and batches status queries.
+
+Run with: python tests/benchmarks/bench_snapd_connection.py [--idle seconds]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from snap_python.client import SnapClient
+
+from store_tui.api.batching import SnapdStatusBatcher
+from store_tui.api.client import create_snap_client
+from store_tui.fake_store import FakeSnapdServer
+
+INSTALLED_SNAPS = [f"snap-{index}" for index in range(60)]
+CHANGE_POLLS = 200
+STATUS_QUERIES = 20
+REPEATS = 5
+
+
+async def install_polling(server: FakeSnapdServer, client: SnapClient, status):
+    # the polls get_changes_by_id_generator makes, without its sleep between them
+    change_id = server.add_change("install-snap", ["snap-0"], ready=False)
+    for _ in range(CHANGE_POLLS):
+        await client.request("GET", f"changes/{change_id}")
+
+
+async def installed_list(server: FakeSnapdServer, client: SnapClient, status):
+    await client.snaps.list_installed_snaps()
+
+
+async def status_queries(server: FakeSnapdServer, client: SnapClient, status):
+    await asyncio.gather(*(status(name) for name in INSTALLED_SNAPS[:STATUS_QUERIES]))
+
+
+# workload name: (workload, number of logical queries it makes)
+WORKLOADS = {
+    "install polling": (install_polling, CHANGE_POLLS),
+    "installed list": (installed_list, 1),
+    "status queries": (status_queries, STATUS_QUERIES),
+}
+
+
+async def measure(server: FakeSnapdServer, client: SnapClient, status, idle: float):
+    results = {}
+    for name, (workload, _) in WORKLOADS.items():
+        durations = []
+        requests, connections = len(server.requests), server.connections
+        for _ in range(REPEATS):
+            if idle:
+                await asyncio.sleep(idle)
+            start = time.perf_counter()
+            await workload(server, client, status)
+            durations.append(time.perf_counter() - start)
+        calls = (len(server.requests) - requests) / REPEATS
+        results[name] = (
+            min(durations),
+            calls,
+            (server.connections - connections) / REPEATS,
+        )
+    return results
+
+
+async def main(idle: float):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = str(Path(tmp_dir) / "snapd.socket")
+        server = FakeSnapdServer(
+            socket_path, installed=INSTALLED_SNAPS, change_polls=CHANGE_POLLS
+        )
+        await server.start()
+
+        default_client = SnapClient(snapd_socket_location=socket_path)
+        default = await measure(
+            server, default_client, default_client.snaps.get_snap_info, idle
+        )
+
+        persistent_client = create_snap_client(snapd_socket=socket_path)
+        batcher = SnapdStatusBatcher(persistent_client)
+        persistent = await measure(
+            server, persistent_client, batcher.get_snap_info, idle
+        )
+
+        for client in (default_client, persistent_client):
+            await client.snapd_client.aclose()
+        await server.stop()
+
+    print(f"idle before each run: {idle}s, latency per query, best of {REPEATS}")
+    print(
+        f"{'workload':<16} {'queries':>8} {'default':>10} {'requests':>9} {'conns':>6}"
+        f" {'persistent':>11} {'requests':>9} {'conns':>6}"
+    )
+    for name, (_, queries) in WORKLOADS.items():
+        default_time, default_requests, default_conns = default[name]
+        persistent_time, persistent_requests, persistent_conns = persistent[name]
+        print(
+            f"{name:<16} {queries:>8} {default_time / queries * 1e6:>8.0f}us"
+            f" {default_requests:>9.0f} {default_conns:>6.1f}"
+            f" {persistent_time / queries * 1e6:>9.0f}us"
+            f" {persistent_requests:>9.0f} {persistent_conns:>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--idle",
+        type=float,
+        default=0.0,
+        help="pause before each run, e.g. 6 to outlast httpx's default keep-alive",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.idle))
@@ -0,0 +1,110 @@
+"""Benchmark the time from launch to the TUI's first frame, per launch mode
+
+The snap runs store_tui from read-only squashfs. Its dependencies were compiled
+to bytecode by pip, but store_tui itself never was, and Python cannot write its
+__pycache__ there, so every launch compiled it from source. Every launch also
+imported every screen (with PIL, markdown and the text area) before drawing.
+
+Each mode runs a copy of store_tui without any __pycache__, optionally compiled
+ahead of time as the snap build now does, and with `PYTHONDONTWRITEBYTECODE`
+set, like the read-only snap. The time is from spawning the interpreter to the
+first frame being drawn, see `python -m store_tui.startup first-frame`; no store
+is reachable, the listing only loads after the first frame. Files are read from
+the page cache here, a cold squashfs read makes every import costlier still.
+
+Run with: python tests/benchmarks/bench_startup.py
+"""
+
+import compileall
+import json
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).parent.parent.parent
+LAUNCHES = 20
+# name: (precompiled, deferred imports)
+MODES = {
+    "before (source, eager imports)": (False, False),
+    "precompiled, eager imports": (True, False),
+    "source, deferred imports": (False, True),
+    "optimized (precompiled, deferred)": (True, True),
+}
+
+
+def prepare(root: Path, precompiled: bool) -> Path:
+    shutil.copytree(
+        REPO_DIR / "store_tui",
+        root / "store_tui",
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    if precompiled:
+        compileall.compile_dir(
+            root / "store_tui",
+            quiet=1,
+            workers=0,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+    return root
+
+
+def launch(root: Path, deferred: bool, config_home: str) -> tuple[float, int]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(root),
+        "PYTHONDONTWRITEBYTECODE": "1",
+        "XDG_CONFIG_HOME": config_home,
+        "STORE_TUI_STORE__BASE_URL": "http://127.0.0.1:9",
+        "STORE_TUI_SNAPD__SOCKET": os.path.join(config_home, "snapd.socket"),
+    }
+    command = [sys.executable, "-m", "store_tui.startup", "first-frame"]
+    if not deferred:
+        command.append("--eager")
+    started = time.monotonic()
+    result = subprocess.run(
+        command,
+        cwd=root,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    first_frame = json.loads(result.stdout.splitlines()[-1])
+    return first_frame["ready_at"] - started, first_frame["modules"]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = {
+            name: prepare(Path(tmp) / f"mode-{index}", precompiled)
+            for index, (name, (precompiled, _)) in enumerate(MODES.items())
+        }
+        timings: dict[str, list[float]] = {name: [] for name in MODES}
+        modules: dict[str, int] = {}
+        # one warm-up launch, then the modes take turns so drift hits them alike
+        launch(roots[next(iter(MODES))], True, tmp)
+        for _ in range(LAUNCHES):
+            for name, (_, deferred) in MODES.items():
+                seconds, modules[name] = launch(roots[name], deferred, tmp)
+                timings[name].append(seconds)
+
+    print(f"Launch to first frame, {LAUNCHES} launches per mode")
+    print(f"{'mode':<36}{'median':>10}{'min':>10}{'modules':>9}")
+    baseline = statistics.median(timings[next(iter(MODES))])
+    for name, seconds in timings.items():
+        median = statistics.median(seconds)
+        print(
+            f"{name:<36}{median * 1000:>8.0f}ms{min(seconds) * 1000:>8.0f}ms"
+            f"{modules[name]:>9}  ({median / baseline:.0%} of before)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import pytest_asyncio
+
+from store_tui.fake_store import FakeSnapdServer, FakeStoreServer, SyntheticCatalog
+
+
+@pytest_asyncio.fixture
+async def make_store_server():
+    """Start fake stores serving a catalog, stopped once the test is done"""
+    servers: list[FakeStoreServer] = []
+
+    async def make_store_server(
+        catalog: SyntheticCatalog | None = None, **kwargs
+    ) -> FakeStoreServer:
+        server = FakeStoreServer(catalog, **kwargs)
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield make_store_server
+    for server in servers:
+        await server.stop()
+
+
+@pytest_asyncio.fixture
+async def fault_server(make_store_server):
+    return await make_store_server()
+
+
+@pytest_asyncio.fixture
+async def fake_snapd(tmp_path):
+    server = FakeSnapdServer(
+        str(tmp_path / "snapd.socket"), installed=["firefox", "vlc", "core22"]
+    )
+    await server.start()
+    yield server
+    await server.stop()
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from snap_python.schemas.common import BaseErrorResult
+
+from store_tui.api.batching import SnapdStatusBatcher, SnapInfoBatcher
+from store_tui.api.client import create_snap_client
+from store_tui.api.resilience import ResilientClient, RetryPolicy
+
+
+def refresh_result(action: dict) -> dict:
+    if action["name"] == "missing":
+        return {
+            "instance-key": action["instance-key"],
+            "name": action["name"],
+            "result": "error",
+            "error": {"code": "name-not-found", "message": "name not found"},
+        }
+    return {
+        "instance-key": action["instance-key"],
+        "name": action["name"],
+        "snap-id": f"{action['name']}-id",
+        "result": "install",
+        "snap": {"name": action["name"], "revision": 42, "version": "1.0"},
+    }
+
+
+@pytest.fixture
+def store():
+    async def snap_refresh(snap_name, payload, extra_headers=None):
+        results = [refresh_result(action) for action in payload["actions"]]
+        return httpx.Response(
+            200,
+            json={"results": results},
+            request=httpx.Request("POST", "https://api.snapcraft.io"),
+        )
+
+    store = MagicMock()
+    store.snap_refresh = AsyncMock(side_effect=snap_refresh)
+    store.get_snap_info = AsyncMock(return_value=MagicMock())
+    return store
+
+
+@pytest.mark.asyncio
+async def test_revisions_batched_into_one_request(store):
+    batcher = SnapInfoBatcher(store)
+    names = ["firefox", "vlc", "missing", "code", "firefox"]
+    results = await asyncio.gather(
+        *(batcher.get_channel_revision(name, architecture="amd64") for name in names),
+        return_exceptions=True,
+    )
+
+    store.snap_refresh.assert_awaited_once()
+    # duplicate lookups share a single action
+    assert len(store.snap_refresh.await_args.kwargs["payload"]["actions"]) == 4
+    assert results[0].snap.revision == 42
+    assert results[0] is results[4]
+    assert isinstance(results[2], LookupError)
+
+
+@pytest.mark.asyncio
+async def test_revisions_split_by_architecture_and_batch_size(store):
+    batcher = SnapInfoBatcher(store, max_batch_size=2)
+    await asyncio.gather(
+        *(
+            batcher.get_channel_revision(name, architecture=arch)
+            for name in ["a", "b", "c"]
+            for arch in ["amd64", "arm64"]
+        )
+    )
+    assert store.snap_refresh.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_info_requests_deduplicated(store):
+    batcher = SnapInfoBatcher(store)
+    await asyncio.gather(
+        batcher.get_snap_info("firefox", fields=["title"]),
+        batcher.get_snap_info("firefox", fields=["title"]),
+        batcher.get_snap_info("vlc", fields=["title"]),
+    )
+    assert store.get_snap_info.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_snapd_status_batched_over_one_connection(fake_snapd):
+    client = create_snap_client(snapd_socket=fake_snapd.socket_path)
+    batcher = SnapdStatusBatcher(client)
+
+    firefox, vlc, missing = await asyncio.gather(
+        batcher.get_snap_info("firefox"),
+        batcher.get_snap_info("vlc"),
+        batcher.get_snap_info("missing"),
+    )
+    assert (firefox.result.name, vlc.result.name) == ("firefox", "vlc")
+    assert isinstance(missing.result, BaseErrorResult)
+    assert fake_snapd.requests == [
+        "/v2/snaps?snaps=firefox%2Cvlc%2Cmissing",
+        "/v2/snaps/missing",
+    ]
+
+    for _ in range(10):
+        await batcher.get_snap_info("vlc")
+    change_id = fake_snapd.add_change("install-snap", ["vlc"], ready=False)
+    async for change in client.get_changes_by_id_generator(change_id):
+        if change.ready:
+            break
+    # every call reused the same keep-alive connection
+    assert fake_snapd.connections == 1
+    await client.snapd_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_snapd_status_times_out_on_a_hung_snapd(fake_snapd):
+    client = ResilientClient(
+        create_snap_client(snapd_socket=fake_snapd.socket_path),
+        policies={"snapd.status": RetryPolicy(timeout=0.05, attempts=1)},
+    )
+    batcher = SnapdStatusBatcher(client)
+    fake_snapd.faults.append(("slow", 5))
+
+    with pytest.raises(TimeoutError):
+        await asyncio.gather(
+            batcher.get_snap_info("firefox"), batcher.get_snap_info("vlc")
+        )
+    assert client.metrics["snapd.status"].failures == 1
+    await client.snapd_client.aclose()
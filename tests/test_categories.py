@@ -0,0 +1,149 @@
+import asyncio
+import pathlib
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from snap_python.client import SnapClient
+from snap_python.schemas.store.categories import Category, CategoryResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.categories import (
+    CategoryCatalog,
+    load_catalog,
+    revalidate_catalog,
+    save_catalog,
+)
+from store_tui.main import SnapStoreTUI
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def categories_response() -> CategoryResponse:
+    with open(TESTS_DATA_DIR / "categories_response.json") as f:
+        return CategoryResponse.model_validate_json(f.read())
+
+
+@pytest.fixture
+def top_snaps() -> SearchResponse:
+    with open(TESTS_DATA_DIR / "featured_snaps_response.json") as f:
+        return SearchResponse.model_validate_json(f.read())
+
+
+def test_set_categories_keeps_cached_listings(tmp_path, top_snaps):
+    catalog = CategoryCatalog()
+    catalog.set_categories([Category(name="games"), Category(name="art")], now=1)
+    catalog.record_listing("games", top_snaps, now=2)
+    catalog.set_categories([Category(name="games", title="Games")], now=3)
+
+    assert [entry.name for entry in catalog.categories] == ["games"]
+    games = catalog.get("games")
+    assert (games.label, games.count, games.updated_at) == ("Games", 16, 2)
+    assert games.rows[0].name == top_snaps.results[0].name
+
+    path = tmp_path / "categories.json"
+    save_catalog(catalog, path)
+    assert load_catalog(path) == catalog
+    path.write_text("{not json")
+    assert load_catalog(path) is None
+
+
+@pytest.mark.asyncio
+async def test_revalidate_bounds_concurrency_and_skips_fresh(
+    categories_response, top_snaps
+):
+    in_flight = max_in_flight = 0
+
+    async def get_top_snaps_from_category(category):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return top_snaps
+
+    store = AsyncMock()
+    store.get_categories.return_value = categories_response
+    store.get_top_snaps_from_category.side_effect = get_top_snaps_from_category
+    catalog = CategoryCatalog()
+
+    await revalidate_catalog(catalog, store, max_concurrency=3, clock=lambda: 100)
+    assert len(catalog.categories) == 20
+    assert all(entry.count == 16 for entry in catalog.categories)
+    assert store.get_top_snaps_from_category.await_count == 20
+    assert max_in_flight == 3
+
+    await revalidate_catalog(catalog, store, max_age=60, clock=lambda: 150)
+    store.get_categories.assert_awaited_once()
+    assert store.get_top_snaps_from_category.await_count == 20
+
+
+@pytest.mark.asyncio
+async def test_revalidate_only_named_categories(categories_response, top_snaps):
+    store = AsyncMock()
+    store.get_categories.return_value = categories_response
+    store.get_top_snaps_from_category.return_value = top_snaps
+    catalog = CategoryCatalog()
+    catalog.set_categories(categories_response.categories, now=100)
+    catalog.mark_opened("games", now=10)
+    catalog.mark_opened("science", now=30)
+    catalog.mark_opened("social", now=20)
+    assert catalog.recently_opened(2) == ["science", "social"]
+
+    names = {"featured", *catalog.recently_opened(2)}
+    await revalidate_catalog(catalog, store, clock=lambda: 100, names=names)
+    refreshed = {
+        call.args[0] for call in store.get_top_snaps_from_category.await_args_list
+    }
+    assert refreshed == names
+    assert catalog.get("games").updated_at is None
+
+
+@pytest.mark.asyncio
+async def test_category_picker_uses_cached_listing(
+    tmp_path, categories_response, top_snaps
+):
+    # a fresh cache, so the background revalidation has nothing to refetch
+    catalog = CategoryCatalog()
+    catalog.set_categories(categories_response.categories, now=time.time())
+    for entry in catalog.categories:
+        catalog.record_listing(entry.name, top_snaps, now=time.time())
+    categories_path = tmp_path / "categories.json"
+    save_catalog(catalog, categories_path)
+
+    api = SnapClient()
+    api.store.get_categories = AsyncMock(return_value=categories_response)
+    listing_requested = asyncio.Event()
+    release_listing = asyncio.Event()
+
+    async def get_top_snaps_from_category(category):
+        if category == "games":
+            listing_requested.set()
+            await release_listing.wait()
+        return SearchResponse(results=top_snaps.results[:3])
+
+    api.store.get_top_snaps_from_category = AsyncMock(
+        side_effect=get_top_snaps_from_category
+    )
+    app = SnapStoreTUI(api=api, categories_path=categories_path)
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.press("c", "g", "a", "m", "e", "s")
+        option_list = app.screen.option_list
+        assert option_list.get_option_at_index(0).id == "games"
+        assert str(option_list.get_option_at_index(0).prompt) == "games (16)"
+
+        await pilot.press("enter")
+        await listing_requested.wait()
+        # the cached listing is shown while the store is still being queried
+        assert app.data_table.row_count == 16
+        release_listing.set()
+        await pilot.pause()
+        assert app.data_table.row_count == 3
+
+        await pilot.press("q")
+
+    assert load_catalog(categories_path).get("games").count == 3
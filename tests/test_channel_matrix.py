@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+
+import pytest
+from snap_python.schemas.store.info import InfoResponse
+from textual.app import App
+from textual.widgets import DataTable
+
+from store_tui.channel_matrix import (
+    ChannelMatrix,
+    MatrixCell,
+    channel_name,
+    channel_sort_key,
+)
+from store_tui.elements.architecture_modal import ArchitectureMatrixModal
+from store_tui.fake_store import SyntheticCatalog
+
+SNAP_INFO_RESPONSE = Path(__file__).parent / "data" / "snap_info_response_success.json"
+
+
+@pytest.fixture
+def snap_info() -> InfoResponse:
+    return InfoResponse.model_validate(json.loads(SNAP_INFO_RESPONSE.read_text()))
+
+
+def synthetic_info(tracks: int = 2) -> InfoResponse:
+    catalog = SyntheticCatalog(snap_count=1, tracks=tracks)
+    name = next(iter(catalog.snaps))
+    return InfoResponse.model_validate(catalog.info(name, "http://localhost"))
+
+
+def test_channel_sort_key_orders_latest_first_and_risks_stable_to_edge():
+    names = ["1.0/edge", "latest/edge", "2.0/stable", "latest/stable", "1.0/stable"]
+    assert sorted(names, key=channel_sort_key) == [
+        "latest/stable",
+        "latest/edge",
+        "2.0/stable",
+        "1.0/stable",
+        "1.0/edge",
+    ]
+
+
+def test_matrix_has_a_cell_for_every_channel_map_item():
+    info = synthetic_info()
+    matrix = ChannelMatrix.from_channel_map(info.channel_map)
+
+    assert len(matrix.cells) == len(info.channel_map)
+    assert len(matrix.channels) * len(matrix.architectures) == len(info.channel_map)
+    for item in info.channel_map:
+        assert matrix.get(channel_name(item), item.channel.architecture) is item
+    assert matrix.channels[0] == "latest/stable"
+
+
+def test_matrix_groups_channels_by_architecture(snap_info):
+    matrix = ChannelMatrix.from_channel_map(snap_info.channel_map)
+    by_architecture = matrix.by_architecture()
+
+    assert sorted(by_architecture) == matrix.architectures
+    for architecture, items in by_architecture.items():
+        assert all(item.channel.architecture == architecture for item in items)
+        released = [item.channel.released_at for item in items]
+        assert released == sorted(released, reverse=True)
+
+
+def test_versions_differ_between_architectures(snap_info):
+    items = [item for item in snap_info.channel_map if item.version]
+    first, second = items[0], items[1].model_copy(deep=True)
+    second.channel.architecture = "other"
+    second.channel.track = first.channel.track
+    second.channel.name = first.channel.name
+    second.version = f"{first.version}-other"
+
+    matrix = ChannelMatrix.from_channel_map([first, second])
+
+    assert matrix.versions_differ(channel_name(first))
+    second.version = first.version
+    assert not matrix.versions_differ(channel_name(first))
+
+
+def test_cell_text_is_formatted_on_first_render(snap_info):
+    cell = MatrixCell(snap_info.channel_map[0])
+    assert cell._text is None
+    assert str(snap_info.channel_map[0].revision) in cell.text.plain
+    assert MatrixCell(None).text.plain == "-"
+
+
+class MatrixApp(App):
+    def __init__(self, matrix: ChannelMatrix):
+        super().__init__()
+        self.matrix = matrix
+
+    def on_mount(self):
+        self.push_screen(ArchitectureMatrixModal("Test", self.matrix))
+
+
+@pytest.mark.asyncio
+async def test_architecture_modal_shows_a_row_per_channel():
+    matrix = ChannelMatrix.from_channel_map(synthetic_info(tracks=3).channel_map)
+    app = MatrixApp(matrix)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        table = app.screen.query_one(DataTable)
+        assert table.row_count == len(matrix.channels)
+        assert len(table.columns) == len(matrix.architectures) + 1
+
+        await pilot.press("escape")
+        await pilot.pause()
+        assert not isinstance(app.screen, ArchitectureMatrixModal)
@@ -0,0 +1,129 @@
+import io
+import json
+import pathlib
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from snap_python.schemas.store.info import InfoResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.api.client import create_snap_client
+from store_tui.cli import NDJSONWriter, parser, run
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent / "data"
+REPO_DIR = pathlib.Path(__file__).parent.parent
+
+
+def read_lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_cli_does_not_import_textual():
+    code = (
+        "import sys, store_tui.cli; "
+        "print(any(m.split('.')[0] in ('textual', 'rich_pixels') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.asyncio
+async def test_search_streams_ndjson():
+    api = create_snap_client()
+    with open(TESTS_DATA_DIR / "featured_snaps_response.json") as f:
+        api.store.find = AsyncMock(
+            return_value=SearchResponse.model_validate_json(f.read())
+        )
+    stream = io.StringIO()
+
+    exit_code = await run(
+        parser.parse_args(["search", "vlc"]), api, NDJSONWriter(stream)
+    )
+
+    lines = read_lines(stream)
+    assert exit_code == 0
+    assert len(lines) == 16
+    assert lines[0]["name"] == "vivaldi"
+
+
+@pytest.mark.asyncio
+async def test_info_reports_errors_per_snap():
+    api = create_snap_client()
+    with open(TESTS_DATA_DIR / "snap_info_response_success.json") as f:
+        snap_info = InfoResponse.model_validate_json(f.read())
+
+    async def get_snap_info(snap_name, fields=None):
+        if snap_name == "missing":
+            raise LookupError("not found")
+        return snap_info
+
+    api.store.get_snap_info = AsyncMock(side_effect=get_snap_info)
+    stream = io.StringIO()
+
+    exit_code = await run(
+        parser.parse_args(["info", snap_info.name, "missing"]),
+        api,
+        NDJSONWriter(stream),
+    )
+
+    lines = read_lines(stream)
+    assert exit_code == 1
+    assert {line.get("name") for line in lines} == {snap_info.name, "missing"}
+    assert any("channel-map" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_outdated_uses_one_bulk_request():
+    api = create_snap_client()
+    installed = [
+        SimpleNamespace(
+            name=name, revision=revision, version="1", tracking_channel="latest/stable"
+        )
+        for name, revision in [("a", "5"), ("b", "7"), ("local", "x1")]
+    ]
+    api.snaps.list_installed_snaps = AsyncMock(
+        return_value=SimpleNamespace(result=installed)
+    )
+
+    async def snap_refresh(snap_name, payload, extra_headers=None):
+        results = [
+            {
+                "instance-key": action["instance-key"],
+                "name": action["name"],
+                "snap-id": action["name"],
+                "result": "install",
+                "snap": {"revision": 7, "version": "2"},
+            }
+            for action in payload["actions"]
+        ]
+        return httpx.Response(
+            200, json={"results": results}, request=httpx.Request("POST", "http://x")
+        )
+
+    api.store.snap_refresh = AsyncMock(side_effect=snap_refresh)
+    stream = io.StringIO()
+
+    exit_code = await run(parser.parse_args(["outdated"]), api, NDJSONWriter(stream))
+
+    assert exit_code == 0
+    api.store.snap_refresh.assert_awaited_once()
+    assert read_lines(stream) == [
+        {
+            "name": "a",
+            "channel": "latest/stable",
+            "installed-revision": 5,
+            "installed-version": "1",
+            "store-revision": 7,
+            "store-version": "2",
+        }
+    ]
@@ -0,0 +1,113 @@
+import pytest
+from snap_python.client import SnapClient
+
+from store_tui.api.client import create_snap_client
+from store_tui.api.resilience import DEFAULT_POLICIES
+from store_tui.config import Settings, SettingsError, load_settings
+from store_tui.elements.settings_modal import SettingsModal
+from store_tui.main import SnapStoreTUI
+
+
+def test_missing_config_file_uses_defaults(tmp_path):
+    assert load_settings(tmp_path / "config.toml", environ={}) == Settings()
+
+
+def test_environment_overrides_config_file(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(
+        "[cache]\nrecent_snaps = 8\nrecent_snaps_megabytes = 2\n"
+        "[snapd]\nmax_connections = 2\n"
+    )
+
+    settings = load_settings(
+        config_path,
+        environ={"STORE_TUI_CACHE__RECENT_SNAPS": "4", "HOME": "/home/user"},
+    )
+
+    assert settings.cache.recent_snaps == 4
+    assert settings.cache.recent_snaps_bytes == 2 * 1024 * 1024
+    assert settings.snapd.max_connections == 2
+    assert ("cache.recent_snaps", 4, True) in settings.describe()
+    assert ("concurrency.store_requests", 8, False) in settings.describe()
+
+
+@pytest.mark.parametrize(
+    "contents, environ",
+    [
+        ("[cache\n", {}),
+        ("[cache]\nrecent_snaps = -1\n", {}),
+        ("[cache]\nrecnt_snaps = 1\n", {}),
+        ("", {"STORE_TUI_SNAPD__MAX_CONNECTIONS": "many"}),
+    ],
+)
+def test_invalid_settings_are_reported(tmp_path, contents, environ):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(contents)
+    with pytest.raises(SettingsError):
+        load_settings(config_path, environ=environ)
+
+
+def test_store_timeouts_are_scaled():
+    policies = Settings(store={"timeout_scale": 3}).store.retry_policies()
+    find_policy = DEFAULT_POLICIES["store.find"]
+    assert policies["store.find"].timeout == find_policy.timeout * 3
+    assert policies["store.find"].hedge_after == find_policy.hedge_after * 3
+    assert "snapd.ping" not in policies
+
+
+def test_client_uses_settings():
+    settings = Settings(
+        store={"base_url": "http://localhost:8000"}, snapd={"max_connections": 1}
+    )
+    client = create_snap_client(settings=settings)
+    assert client.store.base_url.startswith("http://localhost:8000")
+    assert client.snapd_client.timeout.connect == settings.snapd.connect_timeout
+    assert client.snapd_client._transport._pool._max_connections == 1
+
+
+@pytest.mark.asyncio
+async def test_settings_screen_lists_settings(tmp_path):
+    api = SnapClient(store_base_url="https://api.snapcraft.io", version="v2")
+    settings = Settings(cache={"recent_snaps": 2}, instrumentation={"overlay": True})
+    app = SnapStoreTUI(api=api, settings=settings, config_path=tmp_path / "config.toml")
+    # keep the app off the network
+    app.init_main_screen = lambda: None
+
+    async with app.run_test() as pilot:
+        assert app.memory_governor.max_recent_snaps == 2
+        assert app.instrumentation_overlay.display
+        await pilot.press("comma")
+        assert isinstance(app.screen, SettingsModal)
+        table = app.screen.settings_table
+        assert table.get_row("cache.recent_snaps") == [
+            "cache.recent_snaps",
+            "2",
+            "configured",
+        ]
+        assert table.row_count == len(list(settings.describe()))
+        await pilot.press("escape")
+        assert not isinstance(app.screen, SettingsModal)
+
+
+@pytest.mark.asyncio
+async def test_settings_open_while_the_result_table_has_focus(tmp_path):
+    api = SnapClient(store_base_url="https://api.snapcraft.io", version="v2")
+    app = SnapStoreTUI(api=api, config_path=tmp_path / "config.toml")
+    app.init_main_screen = lambda: None
+
+    async with app.run_test() as pilot:
+        # as once the listing has loaded
+        app.data_table.set_rows([("firefox", "Browser"), ("vlc", "Player")])
+        app.data_table.loading = False
+        app.data_table.focus()
+        await pilot.pause()
+        await pilot.press("comma")
+        assert isinstance(app.screen, SettingsModal)
+        assert app.data_table.sort_column is None
+        await pilot.press("escape")
+        await pilot.pause()
+
+        # the table keeps "o" for sorting
+        await pilot.press("o")
+        assert not isinstance(app.screen, SettingsModal)
+        assert app.data_table.sort_column == 0
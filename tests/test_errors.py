@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from snap_python.client import SnapClient
+from textual.widgets import TextArea
+
+from store_tui.elements.error_modal import ErrorModal
+from store_tui.errors import ErrorReporter, record_logger, start_error_log
+from store_tui.main import SnapStoreTUI
+
+
+def raise_error(message: str) -> Exception:
+    try:
+        raise ConnectionError(message)
+    except ConnectionError as e:
+        return e
+
+
+@pytest.mark.asyncio
+async def test_repeated_errors_are_folded_into_one_notification():
+    notifications = []
+    reporter = ErrorReporter(
+        lambda record, count: notifications.append((record.title, count)),
+        interval=0.05,
+    )
+    for _ in range(5):
+        reporter.report(raise_error("store down"), "Error - getting top snaps")
+    reporter.report(raise_error("snapd down"), "Error - listing installed snaps")
+
+    assert notifications == [
+        ("Error - getting top snaps", 1),
+        ("Error - listing installed snaps", 1),
+    ]
+    assert len(reporter.records) == 2
+    assert reporter.latest.title == "Error - listing installed snaps"
+
+    await asyncio.sleep(0.1)
+    assert notifications[-1] == ("Error - getting top snaps", 4)
+    assert (
+        reporter.records[
+            ("Error - getting top snaps", "ConnectionError", "store down")
+        ].count
+        == 5
+    )
+    reporter.close()
+
+
+@pytest.mark.asyncio
+async def test_tracebacks_are_not_formatted_when_reported(monkeypatch):
+    formatted = []
+    monkeypatch.setattr(
+        "traceback.format_exception", lambda exc: formatted.append(exc) or ["tb"]
+    )
+    reporter = ErrorReporter(lambda record, count: None)
+    record = reporter.report(raise_error("store down"), "Error")
+
+    assert formatted == []
+    assert record.traceback_text == "tb"
+    assert record.traceback_text == "tb"
+    assert len(formatted) == 1
+
+    # a repeat keeps its own traceback, formatted again when asked for
+    assert reporter.report(raise_error("store down"), "Error") is record
+    assert len(formatted) == 1
+    assert record.traceback_text == "tb"
+    assert formatted[-1] is record.exc
+    assert len(formatted) == 2
+    reporter.close()
+
+
+@pytest.mark.asyncio
+async def test_error_records_are_logged_as_json(tmp_path):
+    log_path = tmp_path / "errors.log"
+    listener = start_error_log(log_path, max_bytes=1024, backup_count=1)
+    reporter = ErrorReporter(lambda record, count: None)
+    try:
+        for _ in range(20):
+            reporter.report(raise_error("store down"), "Error - getting top snaps")
+    finally:
+        listener.stop()
+        for handler in list(record_logger.handlers):
+            record_logger.removeHandler(handler)
+        record_logger.setLevel(logging.NOTSET)
+        record_logger.propagate = True
+        reporter.close()
+
+    # the file was rotated once it reached max_bytes
+    assert (tmp_path / "errors.log.1").exists()
+    entry = json.loads(log_path.read_text().splitlines()[-1])
+    assert entry["title"] == "Error - getting top snaps"
+    assert entry["type"] == "builtins.ConnectionError"
+    assert entry["message"] == "store down"
+    assert entry["count"] == 20
+    assert entry["location"].endswith(
+        f"test_errors.py:{raise_error.__code__.co_firstlineno + 2}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_listing_notifies_instead_of_stacking_modals():
+    api = SnapClient(store_base_url="https://api.snapcraft.io", version="v2")
+    app = SnapStoreTUI(api=api)
+
+    async def failing_listing():
+        raise raise_error("store down")
+
+    app.get_current_listing = failing_listing
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        for _ in range(3):
+            await app.init_main_screen()
+        assert not isinstance(app.screen, ErrorModal)
+        assert len(app._notifications) == 1
+        assert app.errors.latest.count == 4
+
+        await pilot.press("e")
+        assert isinstance(app.screen, ErrorModal)
+        assert not app.screen.query(TextArea)
+        # nothing is formatted until the traceback is expanded
+        assert app.errors.latest._traceback_text is None
+        await pilot.click("#error-traceback CollapsibleTitle")
+        await pilot.pause()
+        assert "ConnectionError: store down" in app.screen.query_one(TextArea).text
+        assert app.errors.latest._traceback_text is not None
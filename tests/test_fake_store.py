@@ -0,0 +1,98 @@
+import httpx
+import pytest
+import pytest_asyncio
+from snap_python.schemas.store.info import VALID_SNAP_INFO_FIELDS
+
+from store_tui.api.batching import SnapInfoBatcher
+from store_tui.api.client import create_snap_client
+from store_tui.config import Settings
+from store_tui.fake_store import FakeHTTPServer, SyntheticCatalog
+from store_tui.main import SnapStoreTUI
+
+
+@pytest_asyncio.fixture
+async def store_server(make_store_server):
+    return await make_store_server(SyntheticCatalog(snap_count=300, seed=1))
+
+
+@pytest.fixture
+def settings(store_server, fake_snapd):
+    return Settings(
+        store={"base_url": store_server.url}, snapd={"socket": fake_snapd.socket_path}
+    )
+
+
+def test_servers_must_answer_requests():
+    class SilentServer(FakeHTTPServer):
+        async def start(self):
+            pass
+
+    with pytest.raises(TypeError, match="respond"):
+        SilentServer()
+
+
+def test_catalog_is_deterministic():
+    first, second = SyntheticCatalog(seed=3), SyntheticCatalog(seed=3)
+    name = list(first.snaps)[42]
+    assert list(first.snaps) == list(second.snaps)
+    assert first.info(name, "http://x") == second.info(name, "http://x")
+    assert list(SyntheticCatalog(seed=4).snaps) != list(first.snaps)
+
+
+@pytest.mark.asyncio
+async def test_store_endpoints_parse_through_the_client(store_server, settings):
+    api = create_snap_client(settings=settings)
+    catalog = store_server.catalog
+
+    categories = await api.store.get_categories()
+    assert categories.categories[0].name == "featured"
+
+    featured = await api.store.get_top_snaps_from_category("featured")
+    assert len(featured.results) == 16
+
+    name = featured.results[0].name
+    info = await api.store.get_snap_info(name, fields=VALID_SNAP_INFO_FIELDS)
+    assert len(info.channel_map) == (
+        len(catalog.tracks) * 4 * len(catalog.architectures)
+    )
+
+    revision = await SnapInfoBatcher(api.store).get_channel_revision(
+        name, "latest/edge", architecture="arm64"
+    )
+    assert revision.snap.revision == catalog.revision(
+        catalog.snaps[name], "latest", "edge", "arm64"
+    )
+
+    first_page = await api.store.get_snap_search_paginated(page=1, limit=100)
+    assert first_page.total == 300
+    assert first_page.results[0].package_name == list(catalog.snaps)[0]
+
+
+@pytest.mark.asyncio
+async def test_latency_and_error_rate(store_server):
+    store_server.latency = 0.05
+    store_server.error_rate = 1.0
+    async with httpx.AsyncClient(base_url=store_server.url) as client:
+        response = await client.get("/v2/snaps/categories")
+        store_server.error_rate = 0.0
+        store_server.faults.append(418)
+        scripted = await client.get("/v2/snaps/categories")
+    assert response.status_code == 503
+    assert scripted.status_code == 418
+    # both requests shared one keep-alive connection
+    assert store_server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_app_runs_against_fake_servers(store_server, settings):
+    app = SnapStoreTUI(api=create_snap_client(settings=settings), settings=settings)
+    async with app.run_test() as pilot:
+        while app.data_table.loading or app.data_table.row_count == 0:
+            await pilot.pause(0.01)
+        assert app.data_table.row_count == 16
+        while not app.snapd_api_available:
+            await pilot.pause(0.01)
+        await pilot.press("i")
+        while not app.showing_installed:
+            await pilot.pause(0.01)
+        assert app.data_table.row_count == 3
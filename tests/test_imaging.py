@@ -0,0 +1,37 @@
+import io
+
+import pytest
+from PIL import Image
+from rich_pixels import Pixels
+
+from store_tui.imaging import (
+    ImagingExecutor,
+    get_placeholder_icon,
+    render_segments,
+)
+
+
+def make_png(size: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", (size, size), (200, 40, 40, 255)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_render_segments_resizes_large_icons():
+    segments = render_segments(make_png(512), (16, 16))
+    # half-cell renderer: 8 rows of 16 cells, each row terminated by a newline
+    assert sum(1 for segment in segments if segment.text == "\n") == 8
+
+
+def test_placeholder_icon_is_memoized():
+    assert get_placeholder_icon() is get_placeholder_icon()
+
+
+@pytest.mark.asyncio
+async def test_imaging_executor_render():
+    executor = ImagingExecutor(max_workers=1)
+    try:
+        pixels = await executor.render(make_png(256))
+    finally:
+        executor.shutdown()
+    assert isinstance(pixels, Pixels)
@@ -0,0 +1,115 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from snap_python.schemas.store.categories import CategoryResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.api.client import create_snap_client
+from store_tui.fake_store import installed_snap_json
+from store_tui.main import SnapStoreTUI
+
+
+@pytest.fixture
+def app(fake_snapd):
+    api = create_snap_client(snapd_socket=fake_snapd.socket_path)
+    api.store.get_categories = AsyncMock(return_value=CategoryResponse(categories=[]))
+    api.store.get_top_snaps_from_category = AsyncMock(
+        return_value=SearchResponse(results=[])
+    )
+    return SnapStoreTUI(api=api)
+
+
+@pytest.mark.asyncio
+async def test_installed_view_applies_snapd_changes_row_by_row(app, fake_snapd):
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await pilot.press("i")
+        while not app.showing_installed:
+            await pilot.pause(0.01)
+        assert [name for name, _ in app.data_table.get_rows()] == [
+            "core22",
+            "firefox",
+            "vlc",
+        ]
+        list_requests = fake_snapd.requests.count("/v2/snaps")
+
+        # another snapd client removes vlc, installs mpv and refreshes firefox
+        del fake_snapd.installed["vlc"]
+        fake_snapd.installed["mpv"] = installed_snap_json("mpv")
+        fake_snapd.installed["firefox"]["summary"] = "Refreshed firefox"
+        fake_snapd.add_change("remove-snap", ["vlc"])
+        fake_snapd.add_change("install-snap", ["mpv"])
+        fake_snapd.add_change("refresh-snap", ["firefox"])
+        rows_before = {name: app.data_table.rows[name] for name in ("core22",)}
+
+        assert await app.installed_snaps.sync() == {"vlc", "mpv", "firefox"}
+        await pilot.pause()
+        assert app.data_table.get_rows() == [
+            ("core22", "core22 summary"),
+            ("firefox", "Refreshed firefox"),
+            ("mpv", "mpv summary"),
+        ]
+        # untouched rows are kept, and snapd was never asked for a full relist
+        assert app.data_table.rows["core22"] is rows_before["core22"]
+        assert fake_snapd.requests.count("/v2/snaps") == list_requests
+
+        # nothing new in the change log, so nothing is queried
+        assert await app.installed_snaps.sync() == set()
+        await pilot.press("q")
+
+
+@pytest.mark.asyncio
+async def test_sync_reads_only_changes_made_since_the_last_one(app, fake_snapd):
+    installed_snaps = app.installed_snaps
+    for _ in range(50):
+        fake_snapd.add_change("refresh-snap", ["firefox"])
+    running = fake_snapd.add_change("install-snap", ["mpv"], ready=False)
+    await installed_snaps.load()
+
+    # changes made before the load are neither read again nor their snaps queried
+    fake_snapd.requests.clear()
+    assert await installed_snaps.sync() == set()
+    assert fake_snapd.requests == ["/v2/changes?select=in-progress", "/v2/changes/52"]
+
+    # the running change finishes, and another one is made and done between syncs
+    fake_snapd.installed["mpv"] = installed_snap_json("mpv")
+    fake_snapd.changes[int(running) - 1]["ready"] = True
+    del fake_snapd.installed["vlc"]
+    fake_snapd.add_change("remove-snap", ["vlc"])
+    fake_snapd.requests.clear()
+    assert await installed_snaps.sync() == {"mpv", "vlc"}
+    assert fake_snapd.requests[:3] == [
+        "/v2/changes?select=in-progress",
+        "/v2/changes/52",
+        "/v2/changes/53",
+    ]
+    assert not any("select=all" in request for request in fake_snapd.requests)
+    # under the snapd policy and circuit breaker
+    assert app.api.metrics["snapd.changes"].successes
+
+
+@pytest.mark.asyncio
+async def test_sync_anchors_on_the_first_change_after_a_pruned_change_log(
+    app, fake_snapd
+):
+    # snapd pruned every change before the load, and numbers on from where it was
+    fake_snapd.first_change_id = 4821
+    installed_snaps = app.installed_snaps
+    await installed_snaps.load()
+    assert await installed_snaps.sync() == set()
+
+    # a quick remove is done between two syncs
+    del fake_snapd.installed["vlc"]
+    fake_snapd.add_change("remove-snap", ["vlc"])
+    assert await installed_snaps.sync() == {"vlc"}
+
+    # from then on, changes are read by id from the first one
+    fake_snapd.installed["mpv"] = installed_snap_json("mpv")
+    fake_snapd.add_change("install-snap", ["mpv"])
+    fake_snapd.requests.clear()
+    assert await installed_snaps.sync() == {"mpv"}
+    assert fake_snapd.requests[:3] == [
+        "/v2/changes?select=in-progress",
+        "/v2/changes/4822",
+        "/v2/changes/4823",
+    ]
@@ -0,0 +1,232 @@
+import io
+import json
+import weakref
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from store_tui.api.client import create_snap_client
+from store_tui.cli import NDJSONWriter, parser, run
+from store_tui.config import Settings
+from store_tui.inventory import (
+    Inventory,
+    InventoryEntry,
+    InventoryError,
+    diff_inventories,
+    read_inventory,
+)
+
+
+@pytest.fixture
+def settings(fake_snapd):
+    return Settings(snapd={"socket": fake_snapd.socket_path})
+
+
+def make_inventory(machine: str, architecture: str = "amd64", **revisions) -> Inventory:
+    return Inventory(
+        machine=machine,
+        architecture=architecture,
+        created_at="2024-06-01T00:00:00+00:00",
+        entries={
+            name: InventoryEntry(name, "latest/stable", revision, "strict", "1.0")
+            for name, revision in revisions.items()
+        },
+    )
+
+
+def write_inventory(path, inventory: Inventory):
+    with open(path, "w") as f:
+        writer = NDJSONWriter(f)
+        for record in inventory.records():
+            writer.write(record)
+
+
+def read_lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+async def snap_refresh(snap_name, payload, extra_headers=None):
+    # every channel is at revision 7 in the store
+    results = [
+        {
+            "instance-key": action["instance-key"],
+            "name": action["name"],
+            "snap-id": action["name"],
+            "result": "install",
+            "snap": {"revision": 7, "version": "2"},
+        }
+        for action in payload["actions"]
+    ]
+    return httpx.Response(
+        200, json={"results": results}, request=httpx.Request("POST", "http://x")
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_round_trips_through_ndjson(settings):
+    stream = io.StringIO()
+    exit_code = await run(
+        parser.parse_args(["export", "--machine", "web-1"]),
+        create_snap_client(settings=settings),
+        NDJSONWriter(stream),
+        settings,
+    )
+    assert exit_code == 0
+
+    stream.seek(0)
+    inventory = read_inventory(stream)
+    assert inventory.machine == "web-1"
+    assert list(inventory.entries) == ["core22", "firefox", "vlc"]
+    assert inventory.entries["vlc"].revision == "10"
+
+
+def test_read_inventory_rejects_other_files():
+    with pytest.raises(InventoryError):
+        read_inventory(io.StringIO('{"name": "vlc"}\n'))
+    header = json.dumps(make_inventory("web-1").header())
+    with pytest.raises(InventoryError, match=":2:"):
+        read_inventory(io.StringIO(f'{header}\n{{"name": "vlc", "extra": 1}}\n'))
+
+
+def test_diff_lists_added_removed_and_changed_snaps():
+    baseline = make_inventory("baseline", core22="10", firefox="20", vlc="30")
+    inventory = make_inventory("web-1", core22="10", firefox="21", htop="5")
+
+    assert list(diff_inventories(baseline, inventory)) == [
+        {
+            "machine": "web-1",
+            "name": "firefox",
+            "change": "changed",
+            "revision": ["20", "21"],
+        },
+        {
+            "machine": "web-1",
+            "name": "htop",
+            "change": "added",
+            "channel": "latest/stable",
+            "revision": "5",
+            "confinement": "strict",
+            "version": "1.0",
+        },
+        {
+            "machine": "web-1",
+            "name": "vlc",
+            "change": "removed",
+            "channel": "latest/stable",
+            "revision": "30",
+            "confinement": "strict",
+            "version": "1.0",
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_diff_command_compares_every_inventory_with_the_baseline(tmp_path):
+    write_inventory(tmp_path / "baseline.ndjson", make_inventory("baseline", vlc="30"))
+    for machine, revision in [("web-1", "30"), ("web-2", "31")]:
+        write_inventory(
+            tmp_path / f"{machine}.ndjson", make_inventory(machine, vlc=revision)
+        )
+    (tmp_path / "broken.ndjson").write_text("not json\n")
+    stream = io.StringIO()
+
+    exit_code = await run(
+        parser.parse_args(
+            [
+                "diff",
+                str(tmp_path / "baseline.ndjson"),
+                str(tmp_path / "web-1.ndjson"),
+                str(tmp_path / "web-2.ndjson"),
+                str(tmp_path / "broken.ndjson"),
+            ]
+        ),
+        create_snap_client(),
+        NDJSONWriter(stream),
+    )
+
+    lines = read_lines(stream)
+    assert exit_code == 1
+    assert lines[0] == {
+        "machine": "web-2",
+        "name": "vlc",
+        "change": "changed",
+        "revision": ["30", "31"],
+    }
+    assert lines[1]["inventory"].endswith("broken.ndjson")
+
+
+@pytest.mark.asyncio
+async def test_diff_store_looks_up_each_channel_once(tmp_path):
+    paths = []
+    for machine, architecture, revision in [
+        ("web-1", "amd64", "7"),
+        ("web-2", "amd64", "6"),
+        ("pi-1", "arm64", "6"),
+    ]:
+        path = tmp_path / f"{machine}.ndjson"
+        write_inventory(
+            path, make_inventory(machine, architecture, vlc=revision, local="x1")
+        )
+        paths.append(str(path))
+    api = create_snap_client()
+    api.store.snap_refresh = AsyncMock(side_effect=snap_refresh)
+    stream = io.StringIO()
+
+    exit_code = await run(
+        parser.parse_args(["diff-store", *paths]), api, NDJSONWriter(stream)
+    )
+
+    assert exit_code == 0
+    # one bulk request per architecture, for all machines
+    assert api.store.snap_refresh.await_count == 2
+    assert [
+        (line["machine"], line["installed-revision"]) for line in read_lines(stream)
+    ] == [
+        ("web-2", "6"),
+        ("pi-1", "6"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_diff_store_streams_many_inventories(tmp_path, monkeypatch):
+    paths = []
+    for index in range(200):
+        path = tmp_path / f"machine-{index}.ndjson"
+        revision = "6" if index % 10 == 0 else "7"
+        write_inventory(
+            path, make_inventory(f"machine-{index}", vlc=revision, firefox="7")
+        )
+        paths.append(str(path))
+    api = create_snap_client()
+    api.store.snap_refresh = AsyncMock(side_effect=snap_refresh)
+
+    # inventories are read one at a time, twice each, and never all kept
+    alive = most_alive = 0
+
+    def collected():
+        nonlocal alive
+        alive -= 1
+
+    def load_inventory(path):
+        nonlocal alive, most_alive
+        with open(path) as f:
+            inventory = read_inventory(f, source=str(path))
+        weakref.finalize(inventory, collected)
+        alive += 1
+        most_alive = max(most_alive, alive)
+        return inventory
+
+    monkeypatch.setattr("store_tui.cli.load_inventory", load_inventory)
+    stream = io.StringIO()
+
+    exit_code = await run(
+        parser.parse_args(["diff-store", *paths]), api, NDJSONWriter(stream)
+    )
+
+    assert exit_code == 0
+    assert api.store.snap_refresh.await_count == 1
+    assert [line["machine"] for line in read_lines(stream)] == [
+        f"machine-{index}" for index in range(0, 200, 10)
+    ]
+    assert most_alive <= 2
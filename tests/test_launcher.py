@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import time
+
+import pytest
+from textual.app import App
+
+from store_tui.elements.clickable_link import ClickableLink
+from store_tui.launcher import ExternalLauncher, LaunchError
+
+# an opener that takes as long as a browser starting up; the url is ignored
+SLOW_OPENER = (sys.executable, "-c", "import time; time.sleep(1)")
+FAILING_OPENER = (sys.executable, "-c", "raise SystemExit(3)")
+
+
+@pytest.mark.asyncio
+async def test_launch_returns_before_the_opener_exits_and_reaps_it():
+    launcher = ExternalLauncher(command=SLOW_OPENER)
+    started = time.perf_counter()
+    task = launcher.launch("https://snapcraft.io/firefox")
+    assert time.perf_counter() - started < 0.1
+    assert launcher.running == 1
+
+    await task
+    assert launcher.running == 0
+
+
+@pytest.mark.asyncio
+async def test_repeated_launches_are_debounced():
+    now = 0.0
+    launcher = ExternalLauncher(
+        command=(sys.executable, "-c", "pass"), debounce=1.0, clock=lambda: now
+    )
+    first = launcher.launch("snap://firefox")
+    assert launcher.launch("snap://firefox") is None
+    other = launcher.launch("snap://vlc")
+    assert other is not None
+
+    now = 1.5
+    again = launcher.launch("snap://firefox")
+    assert again is not None
+    await asyncio.gather(first, other, again)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_reported_to_the_callback():
+    errors = []
+    launcher = ExternalLauncher(
+        command=FAILING_OPENER, on_error=lambda url, e: errors.append((url, e))
+    )
+    await launcher.launch("snap://firefox")
+    missing = ExternalLauncher(
+        command=("/nonexistent/xdg-open",),
+        on_error=lambda url, e: errors.append((url, e)),
+    )
+    await missing.launch("snap://vlc")
+
+    assert [url for url, _ in errors] == ["snap://firefox", "snap://vlc"]
+    assert all(isinstance(e, LaunchError) for _, e in errors)
+    assert "status 3" in str(errors[0][1])
+
+
+class LinkApp(App):
+    def __init__(self, launcher: ExternalLauncher):
+        super().__init__()
+        self.launcher = launcher
+        self.keys = 0
+
+    def compose(self):
+        yield ClickableLink(
+            "Store Page", "https://snapcraft.io", launcher=self.launcher
+        )
+
+    def on_key(self):
+        self.keys += 1
+
+
+@pytest.mark.asyncio
+async def test_clicking_a_link_does_not_block_the_ui():
+    launcher = ExternalLauncher(command=SLOW_OPENER)
+    app = LinkApp(launcher)
+    async with app.run_test() as pilot:
+        started = time.perf_counter()
+        await pilot.click(ClickableLink)
+        await pilot.press("x")
+        await pilot.pause()
+        assert time.perf_counter() - started < 0.5
+        assert app.keys == 1
+        assert launcher.running == 1
+        await launcher.aclose()
+        assert launcher.running == 0
@@ -0,0 +1,99 @@
+import pathlib
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from snap_python.client import SnapClient
+from snap_python.schemas.store.categories import CategoryResponse
+from snap_python.schemas.store.info import InfoResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.config import Settings
+from store_tui.elements.snap_modal import SnapModal
+from store_tui.imaging import PLACEHOLDER_ICON_FILEPATH
+from store_tui.main import SnapStoreTUI
+from store_tui.memory import MemoryGovernor, estimate_info_size
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def snap_info() -> InfoResponse:
+    with open(TESTS_DATA_DIR / "snap_info_response_success.json") as f:
+        return InfoResponse.model_validate_json(f.read())
+
+
+@pytest.fixture
+def mocked_snaps_api(snap_info):
+    api = SnapClient(
+        store_base_url="https://api.snapcraft.io",
+        version="v2",
+        store_headers={"Snap-Device-Series": "16", "X-Ubuntu-Series": "16"},
+    )
+    api.store.get_categories = AsyncMock(return_value=CategoryResponse(categories=[]))
+    with open(TESTS_DATA_DIR / "featured_snaps_response.json") as f:
+        api.store.get_top_snaps_from_category = AsyncMock(
+            return_value=SearchResponse.model_validate_json(f.read())
+        )
+    api.store.get_snap_info = AsyncMock(return_value=snap_info)
+    api.store.store_client.get = AsyncMock(
+        return_value=httpx.Response(
+            200,
+            content=PLACEHOLDER_ICON_FILEPATH.read_bytes(),
+            request=httpx.Request("GET", "https://example.com/icon.png"),
+        )
+    )
+    return api
+
+
+def test_governor_evicts_least_recently_used(snap_info):
+    governor = MemoryGovernor(max_recent_snaps=2)
+    for name in ["a", "b"]:
+        governor.remember(name, snap_info, None)
+    governor.recall("a")
+    governor.remember("c", snap_info, None)
+
+    assert governor.recall("b") is None
+    assert governor.recall("a") is not None
+    assert governor.retained_bytes == 2 * estimate_info_size(snap_info)
+
+
+def test_governor_bounds_retained_bytes(snap_info):
+    size = estimate_info_size(snap_info)
+    governor = MemoryGovernor(max_retained_bytes=size * 3 - 1)
+    for name in ["a", "b", "c", "d"]:
+        governor.remember(name, snap_info, None)
+
+    assert len(governor) == 2
+    assert governor.retained_bytes <= governor.max_retained_bytes
+    assert governor.stats()["recent_snaps"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reopened_snap_served_from_memory(mocked_snaps_api):
+    # without prefetching the neighbouring rows, only vlc is ever fetched
+    app = SnapStoreTUI(
+        api=mocked_snaps_api, settings=Settings(cache={"prefetch_depth": 0})
+    )
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        view_models = []
+        for _ in range(2):
+            await app.load_snap_screen("vlc")
+            await pilot.pause()
+            snap_modal = app.screen
+            assert isinstance(snap_modal, SnapModal)
+            view_models.append(snap_modal.view_model)
+            await pilot.press("q")
+            await pilot.pause()
+            # dismissed modal no longer holds on to its response
+            assert snap_modal.snap_info is None
+
+        mocked_snaps_api.store.get_snap_info.assert_awaited_once()
+        # the view model is derived once and reopened with the info
+        assert view_models[1] is view_models[0]
+        assert len(app.memory_governor) == 1
+
+        await pilot.press("m")
+        assert "RSS" in str(app.instrumentation_overlay.renderable)
@@ -0,0 +1,76 @@
+import pytest
+import pytest_asyncio
+
+from store_tui.api.client import create_snap_client
+from store_tui.config import Settings
+from store_tui.elements.snap_modal import SnapModal
+from store_tui.fake_store import FakeStoreServer, SyntheticCatalog
+from store_tui.main import SnapStoreTUI
+
+
+@pytest_asyncio.fixture
+async def store_server(make_store_server):
+    return await make_store_server(SyntheticCatalog(snap_count=100, seed=2))
+
+
+def info_requests(server: FakeStoreServer, snap_name: str) -> int:
+    return sum(
+        target.startswith(f"/v2/snaps/info/{snap_name}?") for target in server.requests
+    )
+
+
+async def wait_for(pilot, condition):
+    for _ in range(500):
+        if condition():
+            return
+        await pilot.pause(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.mark.asyncio
+async def test_next_and_previous_show_adjacent_rows_in_place(store_server):
+    settings = Settings(
+        store={"base_url": store_server.url}, cache={"prefetch_depth": 1}
+    )
+    app = SnapStoreTUI(api=create_snap_client(settings=settings), settings=settings)
+    async with app.run_test() as pilot:
+        table = app.data_table
+        await wait_for(pilot, lambda: not table.loading and table.row_count > 0)
+        rows = [row.key.value for row in table.ordered_rows]
+
+        await app.load_snap_screen(rows[0])
+        await pilot.pause()
+        snap_modal = app.screen
+        assert isinstance(snap_modal, SnapModal)
+        # the next row is fetched while the first one is shown
+        await wait_for(pilot, lambda: rows[1] in app.memory_governor)
+
+        await pilot.press("n")
+        await wait_for(pilot, lambda: snap_modal.snap_name == rows[1])
+        assert app.screen is snap_modal
+        assert str(snap_modal.title_label.renderable) == snap_modal.view_model.title
+        assert snap_modal.snap_info.name == rows[1]
+        assert table.cursor_row == 1
+        assert info_requests(store_server, rows[1]) == 1
+        # the snap shown before is kept for going back, the one after is prefetched
+        assert rows[0] in app.memory_governor
+        await wait_for(pilot, lambda: rows[2] in app.memory_governor)
+
+        await pilot.press("p")
+        await wait_for(pilot, lambda: snap_modal.snap_name == rows[0])
+        assert info_requests(store_server, rows[0]) == 1
+        assert table.cursor_row == 0
+
+        # there is nothing above the first row
+        await pilot.press("p")
+        await pilot.pause()
+        assert snap_modal.snap_name == rows[0]
+
+        # presses made while a snap loads move on from the snap being loaded
+        await pilot.press("n", "n", "n")
+        await wait_for(pilot, lambda: snap_modal.snap_name == rows[3])
+        assert table.cursor_row == 3
+
+        await pilot.press("q")
+        await pilot.pause()
+        assert snap_modal.snap_info is None
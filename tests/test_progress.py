@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+from textual.app import App
+
+from store_tui.elements.progress_bar_with_message import ProgressBarWithMessage
+from store_tui.progress import RateEstimator
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_is_smoothed_and_restarts_with_a_new_task():
+    clock = FakeClock()
+    estimator = RateEstimator(clock=clock)
+    for second in range(5):
+        clock.now = second
+        estimator.add(second * 1_000_000, 10_000_000)
+    assert estimator.rate == pytest.approx(1_000_000)
+    assert estimator.eta == pytest.approx(6)
+    assert estimator.describe() == "1.0 MB/s, 6 seconds left"
+
+    # a burst moves the estimate only part of the way
+    clock.now = 5
+    estimator.add(9_000_000, 10_000_000)
+    assert 1_000_000 < estimator.rate < 5_000_000
+
+    clock.now = 6
+    estimator.add(0, 20_000_000)
+    assert estimator.rate is None
+    assert estimator.describe() == ""
+
+
+class ProgressApp(App):
+    def compose(self):
+        yield ProgressBarWithMessage(max_fps=10)
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced():
+    app = ProgressApp()
+    async with app.run_test() as pilot:
+        widget = app.query_one(ProgressBarWithMessage)
+        with patch.object(
+            widget.progress_bar, "update", wraps=widget.progress_bar.update
+        ) as update:
+
+            def renders() -> list:
+                # ProgressBar.update calls itself again for each value it sets
+                return [call for call in update.call_args_list if len(call.kwargs) == 2]
+
+            for done in range(1, 101):
+                widget.set_progress(done, 100, "Download snap")
+            assert len(renders()) == 1
+            await pilot.pause(0.2)
+            assert len(renders()) == 2
+            assert widget.progress_bar.progress == 100
+
+            # repeated values are not rendered again
+            widget.set_progress(100, 100, "Download snap")
+            await pilot.pause(0.2)
+            assert len(renders()) == 2
+
+            widget.complete("Operation Complete")
+            assert str(widget.message.renderable) == "Operation Complete"
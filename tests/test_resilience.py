@@ -0,0 +1,165 @@
+import asyncio
+import json
+import pathlib
+import time
+
+import httpx
+import pytest
+from snap_python.client import SnapClient
+
+from store_tui.api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientClient,
+    RetryPolicy,
+)
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def categories_route(fault_server):
+    with open(TESTS_DATA_DIR / "categories_response.json") as f:
+        fault_server.routes["/v2/snaps/categories"] = json.load(f)
+
+
+def make_client(server, **policy_kwargs) -> ResilientClient:
+    api = SnapClient(store_base_url=server.url, snapd_socket_location="/nonexistent")
+    policy = RetryPolicy(base_delay=0, **policy_kwargs)
+    return ResilientClient(
+        api,
+        policies={"store.get_categories": policy},
+        breakers={
+            "store": CircuitBreaker(failure_threshold=2, reset_timeout=60),
+            "snapd": CircuitBreaker(),
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors(fault_server, categories_route):
+    client = make_client(fault_server, attempts=3)
+    fault_server.faults.extend([503, "drop"])
+
+    response = await client.store.get_categories()
+
+    assert response.categories
+    assert client.metrics["store.get_categories"].retries == 2
+    assert len(fault_server.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_not_retried(fault_server, categories_route):
+    client = make_client(fault_server, attempts=3)
+    fault_server.faults.append(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.store.get_categories()
+    assert len(fault_server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_beats_slow_response(fault_server, categories_route):
+    client = make_client(fault_server, attempts=1, hedge_after=0.05)
+    fault_server.faults.append(("slow", 1))
+
+    start = time.perf_counter()
+    await client.store.get_categories()
+
+    assert time.perf_counter() - start < 0.5
+    assert client.metrics["store.get_categories"].hedges == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_per_attempt(fault_server, categories_route):
+    client = make_client(fault_server, attempts=2, timeout=0.05)
+    fault_server.faults.extend([("slow", 1), ("slow", 1)])
+
+    with pytest.raises(TimeoutError):
+        await client.store.get_categories()
+    assert client.metrics["store.get_categories"].failures == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_cached_data(fault_server, categories_route):
+    client = make_client(fault_server, attempts=1)
+    cached = await client.store.get_categories()
+
+    fault_server.faults.extend([500, 500])
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.store.get_categories()
+    assert client.breakers["store"].state == "open"
+
+    requests_before = len(fault_server.requests)
+    assert await client.store.get_categories() is cached
+    assert len(fault_server.requests) == requests_before
+    assert client.metrics["store.get_categories"].stale_served == 1
+
+    with pytest.raises(CircuitOpenError):
+        await client.store.get_categories(type="other")
+
+
+def test_circuit_half_open_probe():
+    now = 0.0
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    now = 10.0
+    assert breaker.allow_request()
+    # only a single probe is let through while half-open
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_the_circuit(fault_server, categories_route):
+    now = 0.0
+    client = make_client(fault_server, attempts=1)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now)
+    client.breakers["store"] = breaker
+    breaker.record_failure()
+    now = 10.0
+
+    probe = asyncio.create_task(
+        client.call("store.get_categories", asyncio.Event().wait)
+    )
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await client.store.get_categories()
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state == "half-open"
+    # the next call probes the store, and closes the circuit
+    await client.store.get_categories()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_error_responses_are_retried_and_never_cached(fault_server):
+    client = make_client(fault_server)
+    client.policies["store.snap_refresh"] = RetryPolicy(base_delay=0, attempts=3)
+    refresh = {"context": [], "actions": [], "fields": []}
+
+    fault_server.faults.extend([503, 503, 503])
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.store.snap_refresh(snap_name="vlc", payload=refresh)
+    assert len(fault_server.requests) == 3
+    assert client.metrics["store.snap_refresh"].failures == 1
+    assert not client._stale_cache
+
+    fault_server.faults.append(429)
+    response = await client.store.snap_refresh(snap_name="vlc", payload=refresh)
+    assert response.status_code == 200
+    assert client.metrics["store.snap_refresh"].retries == 3
+
+
+@pytest.mark.asyncio
+async def test_unwrapped_attributes_pass_through(fault_server):
+    client = make_client(fault_server)
+    assert client.snaps.install_snap == client.api.snaps.install_snap
+    assert client.store_base_url == fault_server.url
@@ -0,0 +1,109 @@
+import pathlib
+from unittest.mock import AsyncMock
+
+import pytest
+from snap_python.client import SnapClient
+from snap_python.schemas.store.categories import CategoryResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.elements import result_index
+from store_tui.elements.result_index import ResultIndex
+from store_tui.main import SnapStoreTUI
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent / "data"
+
+ROWS = [
+    ("vlc", "The ultimate media player"),
+    ("firefox", "Mozilla Firefox web browser"),
+    ("Chromium", "Chromium web browser, open-source version of Chrome"),
+    ("mpv", None),
+]
+
+
+def names(index: ResultIndex, row_ids: list[int]) -> list[str]:
+    return [index.rows[row_id][0] for row_id in row_ids]
+
+
+def test_substring_matches_before_fuzzy():
+    index = ResultIndex(ROWS)
+    assert names(index, index.search("BROWSER")) == ["firefox", "Chromium"]
+    # "fx" only matches firefox as a subsequence of its name
+    assert names(index, index.search("fx")) == ["firefox"]
+    assert names(index, index.search("")) == [name for name, _ in ROWS]
+
+
+def test_sorting_uses_casefolded_keys():
+    index = ResultIndex(ROWS)
+    assert names(index, index.view(sort_column=0)) == [
+        "Chromium",
+        "firefox",
+        "mpv",
+        "vlc",
+    ]
+    assert names(index, index.view(sort_column=1, reverse=True)) == [
+        "vlc",
+        "firefox",
+        "Chromium",
+        "mpv",
+    ]
+    assert names(index, index.view("web", sort_column=0)) == ["Chromium", "firefox"]
+
+
+def test_upsert_and_remove_keep_index_consistent():
+    index = ResultIndex(list(ROWS))
+    index.remove("firefox")
+    index.upsert("vlc", "Video player")
+    index.upsert("brave", "Privacy web browser")
+
+    assert len(index) == 4
+    assert names(index, index.search("browser")) == ["Chromium", "brave"]
+    assert names(index, index.search("ultimate")) == []
+    assert names(index, index.view(sort_column=0)) == [
+        "brave",
+        "Chromium",
+        "mpv",
+        "vlc",
+    ]
+    assert index.matches(index.row_ids["vlc"], "video")
+    assert ("firefox", "Mozilla Firefox web browser") not in index.live_rows()
+
+
+def test_fuzzy_matching_only_tries_rows_with_the_query_characters(monkeypatch):
+    rows = [(f"snap-{i}", "Some summary") for i in range(1000)] + [("flexbox", None)]
+    index = ResultIndex(rows)
+    tried = []
+    original = result_index.is_subsequence
+
+    def is_subsequence(query: str, text: str) -> bool:
+        tried.append(text)
+        return original(query, text)
+
+    monkeypatch.setattr(result_index, "is_subsequence", is_subsequence)
+    assert names(index, index.search("fx")) == ["flexbox"]
+    assert tried == ["flexbox"]
+    # removed rows are dropped from the character index too
+    index.remove("flexbox")
+    assert index.search("fx") == []
+
+
+@pytest.mark.asyncio
+async def test_filter_and_sort_table():
+    api = SnapClient()
+    api.store.get_categories = AsyncMock(return_value=CategoryResponse(categories=[]))
+    with open(TESTS_DATA_DIR / "featured_snaps_response.json") as f:
+        api.store.get_top_snaps_from_category = AsyncMock(
+            return_value=SearchResponse.model_validate_json(f.read())
+        )
+    app = SnapStoreTUI(api=api)
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await pilot.press("/", "v", "l", "c")
+        assert [name for name, _ in app.data_table.get_rows()][0] == "vlc"
+
+        await pilot.press("escape")
+        assert app.data_table.row_count == 16
+
+        await pilot.press("o")
+        shown = [name for name, _ in app.data_table.get_rows()]
+        assert shown == sorted(shown, key=str.casefold)
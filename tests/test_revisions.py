@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from snap_python.client import SnapClient
+from snap_python.schemas.store.info import InfoResponse
+from textual.app import App
+
+from store_tui.elements.snap_channel_tree import LOAD_MORE_NODE, SnapChannelTree
+from store_tui.fake_store import SyntheticCatalog
+from store_tui.revisions import RevisionEntry, RevisionHistoryCache
+
+
+@pytest_asyncio.fixture
+async def store_server(make_store_server):
+    return await make_store_server(SyntheticCatalog(snap_count=20, seed=2))
+
+
+@pytest.fixture
+def api(store_server) -> SnapClient:
+    return SnapClient(store_base_url=store_server.url, version="v2")
+
+
+async def get_channel(api: SnapClient, snap_name: str, channel_name: str, arch: str):
+    info: InfoResponse = await api.store.get_snap_info(snap_name)
+    for channel in info.channel_map:
+        if (
+            channel.channel.name == channel_name
+            and channel.channel.architecture == arch
+        ):
+            return channel
+    raise LookupError(channel_name)
+
+
+@pytest.mark.asyncio
+async def test_history_loads_lazily_per_architecture(store_server, api):
+    catalog = store_server.catalog
+    snap_name = list(catalog.snaps)[0]
+    channel = await get_channel(api, snap_name, "edge", "arm64")
+    cache = RevisionHistoryCache(api.store, span=10)
+
+    history = cache.get(snap_name, channel, "arm64")
+    assert history.entries == []
+    assert not any("refresh" in request for request in store_server.requests)
+
+    # concurrent callers share one page load
+    first, second = await asyncio.gather(
+        cache.load_more(history), cache.load_more(history)
+    )
+    assert first == second
+    assert sum("refresh" in request for request in store_server.requests) == 1
+    assert [entry.revision for entry in first] == sorted(
+        (entry.revision for entry in first), reverse=True
+    )
+    assert all(
+        catalog.revision_exists(catalog.snaps[snap_name], entry.revision, "arm64")
+        and entry.revision < channel.revision
+        for entry in first
+    )
+
+    # the same channel reuses the cached history
+    assert cache.get(snap_name, channel, "arm64") is history
+    while not history.exhausted:
+        await cache.load_more(history)
+    revisions = [entry.revision for entry in history.entries]
+    assert revisions == sorted(set(revisions), reverse=True)
+    assert revisions[-1] <= len(catalog.architectures)
+
+
+def test_revision_entry_formats_once():
+    entry = RevisionEntry.create(
+        revision=12, version="1.2", confinement="strict", created_at=None, size=2e6
+    )
+    assert entry.label == "12: v1.2, 2.0 MB, unknown"
+
+
+def test_history_cache_is_bounded(store_server, api):
+    catalog = SyntheticCatalog(snap_count=3)
+    cache = RevisionHistoryCache(api.store, max_histories=2)
+    channels = [
+        InfoResponse.model_validate(catalog.info(name, "http://x")).channel_map[0]
+        for name in catalog.snaps
+    ]
+    histories = [
+        cache.get(name, channel, "amd64")
+        for name, channel in zip(catalog.snaps, channels)
+    ]
+    assert cache.get(list(catalog.snaps)[0], channels[0], "amd64") is not histories[0]
+    assert cache.get(list(catalog.snaps)[2], channels[2], "amd64") is histories[2]
+
+
+class ChannelTreeApp(App):
+    def __init__(self, tree: SnapChannelTree) -> None:
+        super().__init__()
+        self.channel_tree = tree
+
+    def compose(self):
+        yield self.channel_tree
+
+
+@pytest.mark.asyncio
+async def test_tree_expands_history_on_demand(store_server, api):
+    snap_name = list(store_server.catalog.snaps)[0]
+    channel = await get_channel(api, snap_name, "stable", "amd64")
+    cache = RevisionHistoryCache(api.store)
+    tree = SnapChannelTree(
+        channel, snap_name=snap_name, architecture="amd64", revision_history=cache
+    )
+
+    async with ChannelTreeApp(tree).run_test() as pilot:
+        assert not tree.history_node.children
+        tree.history_node.expand()
+        while not any(
+            isinstance(child.data, RevisionEntry)
+            for child in tree.history_node.children
+        ):
+            await pilot.pause(0.01)
+        loaded = len(tree.history.entries)
+        assert tree.history_node.children[-1].data == LOAD_MORE_NODE
+
+        tree.channel_tree.select_node(tree.history_node.children[-1])
+        while len(tree.history.entries) == loaded:
+            await pilot.pause(0.01)
+        await pilot.pause()
+        labels = [str(child.label) for child in tree.history_node.children]
+        assert labels[: len(tree.history.entries)] == [
+            entry.label for entry in tree.history.entries
+        ]
+
+        # switching channels and back shows the cached revisions without a request
+        requests = len(store_server.requests)
+        tree.update_tree(channel)
+        tree.history_node.expand()
+        await pilot.pause()
+        assert [str(child.label) for child in tree.history_node.children] == labels
+        assert len(store_server.requests) == requests
@@ -0,0 +1,166 @@
+import asyncio
+import random
+
+import pytest
+import pytest_asyncio
+
+from store_tui.api.client import create_snap_client
+from store_tui.config import Settings
+from store_tui.fake_store import SyntheticCatalog
+from store_tui.main import SnapStoreTUI
+from store_tui.scheduling import LoadPriority, TableLoadScheduler
+
+
+@pytest.mark.asyncio
+async def test_new_load_cancels_the_running_one():
+    scheduler = TableLoadScheduler()
+    cancelled = asyncio.Event()
+
+    async def slow_load(generation):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fast_load(generation):
+        return generation
+
+    first = asyncio.create_task(scheduler.run(slow_load))
+    await asyncio.sleep(0.01)
+    assert scheduler.loading
+
+    assert await scheduler.run(fast_load) == 2
+    assert await first is None
+    assert cancelled.is_set()
+    assert scheduler.is_current(2) and not scheduler.is_current(1)
+
+
+@pytest.mark.asyncio
+async def test_background_work_waits_for_higher_priorities():
+    scheduler = TableLoadScheduler()
+    order = []
+    release_user = asyncio.Event()
+
+    async def user_load(generation):
+        order.append("user start")
+        await release_user.wait()
+        order.append("user end")
+
+    async def background(priority: LoadPriority, name: str):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    user = asyncio.create_task(scheduler.run(user_load))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(background(LoadPriority.PREWARM, "prewarm")),
+        asyncio.create_task(background(LoadPriority.PREFETCH, "prefetch")),
+    ]
+    await asyncio.sleep(0.01)
+    assert order == ["user start"]
+
+    release_user.set()
+    await asyncio.gather(user, *waiting)
+    assert order == ["user start", "user end", "prefetch", "prewarm"]
+
+
+@pytest_asyncio.fixture
+async def slow_store(make_store_server):
+    return await make_store_server(
+        SyntheticCatalog(snap_count=200, category_count=6, seed=5),
+        latency=0.03,
+        jitter=0.025,
+        seed=5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rapid_table_loads_leave_only_the_last_one(slow_store, fake_snapd):
+    settings = Settings(
+        store={"base_url": slow_store.url}, snapd={"socket": fake_snapd.socket_path}
+    )
+    api = create_snap_client(settings=settings)
+    app = SnapStoreTUI(api=api, settings=settings)
+    categories = slow_store.catalog.category_names
+    rng = random.Random(7)
+
+    async with app.run_test() as pilot:
+        while app.data_table.loading or not app.snapd_api_available:
+            await pilot.pause(0.01)
+
+        last = None
+        for _ in range(30):
+            if rng.random() < 0.3:
+                await pilot.press("i")
+                last = "installed"
+            else:
+                last = rng.choice(categories)
+                app.run_worker(
+                    app.run_table_load(
+                        lambda generation, category=last: app.load_category(
+                            category, generation
+                        )
+                    )
+                )
+            await pilot.pause(rng.uniform(0, 0.04))
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        rows = [row.key.value for row in app.data_table.ordered_rows]
+        if last == "installed":
+            assert app.showing_installed
+            assert sorted(rows) == ["core22", "firefox", "vlc"]
+        else:
+            assert app.current_category == last
+            listing = await api.store.get_top_snaps_from_category(last)
+            assert rows == [result.name for result in listing.results]
+        assert not app.data_table.loading
+
+
+@pytest.mark.asyncio
+async def test_superseded_probes_do_not_wedge_the_store_circuit(slow_store, fake_snapd):
+    settings = Settings(
+        store={"base_url": slow_store.url}, snapd={"socket": fake_snapd.socket_path}
+    )
+    api = create_snap_client(settings=settings)
+    app = SnapStoreTUI(api=api, settings=settings)
+    categories = slow_store.catalog.category_names[1:]
+    breaker = app.api.breakers["store"]
+
+    async with app.run_test() as pilot:
+        while app.data_table.loading or not app.snapd_api_available:
+            await pilot.pause(0.01)
+
+        for category in categories[:-1]:
+            # the store failed a while ago, the next call is let through as a probe
+            breaker.opened_at = breaker.clock() - breaker.reset_timeout
+            assert breaker.state == "half-open"
+            requests = len(slow_store.requests)
+            app.run_worker(
+                app.run_table_load(
+                    lambda generation, category=category: app.load_category(
+                        category, generation
+                    )
+                )
+            )
+            # supersede the load while its probe waits on the store
+            await asyncio.sleep(0)
+            while len(slow_store.requests) == requests and app.load_scheduler.loading:
+                await asyncio.sleep(0.001)
+
+        requests = len(slow_store.requests)
+        await app.run_table_load(
+            lambda generation: app.load_category(categories[-1], generation)
+        )
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        # the last load still reached the store, and its answer closed the circuit
+        assert len(slow_store.requests) > requests
+        assert breaker.state == "closed"
+        assert app.errors.latest is None
+        listing = await api.store.get_top_snaps_from_category(categories[-1])
+        rows = [row.key.value for row in app.data_table.ordered_rows]
+        assert rows == [result.name for result in listing.results]
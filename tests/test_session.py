@@ -0,0 +1,88 @@
+import pathlib
+from unittest.mock import AsyncMock
+
+import pytest
+from snap_python.client import SnapClient
+from snap_python.schemas.store.categories import CategoryResponse
+from snap_python.schemas.store.search import SearchResponse
+
+from store_tui.main import SnapStoreTUI
+from store_tui.session import SessionRow, SessionState, load_session, save_session
+
+TESTS_DATA_DIR = pathlib.Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def mocked_snaps_api():
+    api = SnapClient(
+        store_base_url="https://api.snapcraft.io",
+        version="v2",
+        store_headers={"Snap-Device-Series": "16", "X-Ubuntu-Series": "16"},
+    )
+    with open(TESTS_DATA_DIR / "categories_response.json") as f:
+        api.store.get_categories = AsyncMock(
+            return_value=CategoryResponse.model_validate_json(f.read())
+        )
+    with open(TESTS_DATA_DIR / "featured_snaps_response.json") as f:
+        api.store.get_top_snaps_from_category = AsyncMock(
+            return_value=SearchResponse.model_validate_json(f.read())
+        )
+    return api
+
+
+def test_session_roundtrip(tmp_path):
+    session_path = tmp_path / "store-tui" / "session.json"
+    state = SessionState(
+        current_category="games",
+        cursor_row=1,
+        cursor_snap="vlc",
+        rows=[SessionRow(name="firefox", summary="browser"), SessionRow(name="vlc")],
+    )
+    save_session(state, session_path)
+    assert load_session(session_path) == state
+
+
+def test_load_session_ignores_bad_files(tmp_path):
+    session_path = tmp_path / "session.json"
+    assert load_session(session_path) is None
+    session_path.write_text("{not json")
+    assert load_session(session_path) is None
+
+
+@pytest.mark.asyncio
+async def test_session_restored_before_network(tmp_path, mocked_snaps_api):
+    session_path = tmp_path / "session.json"
+    save_session(
+        SessionState(
+            current_category="games",
+            cursor_snap="vlc",
+            rows=[SessionRow(name="firefox"), SessionRow(name="vlc")],
+        ),
+        session_path,
+    )
+    app = SnapStoreTUI(api=mocked_snaps_api, session_path=session_path)
+    rows_at_first_request = []
+
+    top_snaps = mocked_snaps_api.store.get_top_snaps_from_category.return_value
+
+    async def get_top_snaps_from_category(category):
+        rows_at_first_request.extend(app.data_table.get_rows())
+        return top_snaps
+
+    mocked_snaps_api.store.get_categories.return_value = CategoryResponse(categories=[])
+    mocked_snaps_api.store.get_top_snaps_from_category.side_effect = (
+        get_top_snaps_from_category
+    )
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert rows_at_first_request == [("firefox", None), ("vlc", None)]
+        assert app.title == "store-tui - Games"
+        # revalidated listing replaces the snapshot, keeping the cursor on vlc
+        mocked_snaps_api.store.get_top_snaps_from_category.assert_awaited_with("games")
+        assert app.data_table.row_count == 16
+        assert app.data_table.cursor_row == app.data_table.get_row_index("vlc")
+
+        await pilot.press("q")
+
+    assert load_session(session_path).current_category == "games"
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from snap_python.schemas.changes import ChangesResponse
+from snap_python.schemas.common import BaseErrorResult
+from snap_python.schemas.snaps import InstalledSnap, SingleInstalledSnapResponse
+from textual import on
+from textual.app import App
+
+from store_tui.snap_state import SnapStateStore
+
+
+def install_data(revision: str | None) -> SingleInstalledSnapResponse:
+    if revision is None:
+        result = BaseErrorResult(message="snap not installed")
+    else:
+        result = InstalledSnap(
+            name="vlc",
+            revision=revision,
+            summary="The ultimate media player",
+            ignore_validation=False,
+            installed_size=1,
+            jailmode=False,
+            mounted_from="/var/lib/snapd/snaps/vlc.snap",
+            status="active",
+        )
+    return SingleInstalledSnapResponse(
+        status_code=200, type="sync", status="OK", result=result
+    )
+
+
+def change(done: int, ready: bool = False) -> ChangesResponse:
+    now = datetime.now(timezone.utc)
+    task = {
+        "id": "1",
+        "kind": "download-snap",
+        "summary": "Download snap",
+        "status": "Done" if ready else "Doing",
+        "progress": {"label": "", "done": done, "total": 10},
+        "spawn-time": now,
+    }
+    return ChangesResponse(
+        status_code=200,
+        type="sync",
+        status="OK",
+        result={
+            "id": "42",
+            "kind": "install-snap",
+            "summary": "Install vlc",
+            "status": "Done" if ready else "Doing",
+            "tasks": [task],
+            "ready": ready,
+            "spawn-time": now,
+        },
+    )
+
+
+class RecordingApp(App):
+    def __init__(self, snap_state: SnapStateStore) -> None:
+        super().__init__()
+        self.snap_state = snap_state
+        self.events = []
+
+    def on_mount(self):
+        self.snap_state.subscribe(self)
+
+    @on(SnapStateStore.InstallStateChanged)
+    @on(SnapStateStore.ChangeProgress)
+    @on(SnapStateStore.ChangeFinished)
+    def record(self, event):
+        self.events.append(event)
+
+
+@pytest.mark.asyncio
+async def test_fetch_is_shared_and_publishes_only_changes():
+    async def get_snap_info(snap_name):
+        await asyncio.sleep(0.01)
+        return install_data("10")
+
+    api = SimpleNamespace(snaps=SimpleNamespace())
+    api.snaps.get_snap_info = AsyncMock(side_effect=get_snap_info)
+    snap_state = SnapStateStore(api)
+    app = RecordingApp(snap_state)
+
+    async with app.run_test() as pilot:
+        await asyncio.gather(*(snap_state.fetch("vlc") for _ in range(5)))
+        await snap_state.fetch("vlc")
+        await pilot.pause()
+
+    assert api.snaps.get_snap_info.await_count == 2
+    assert [type(event) for event in app.events] == [SnapStateStore.InstallStateChanged]
+    assert snap_state.get("vlc").installed_snap.revision == "10"
+
+
+@pytest.mark.asyncio
+async def test_track_change_publishes_progress_then_state():
+    async def get_changes_by_id_generator(change_id):
+        for response in (change(2), change(7), change(10, ready=True)):
+            yield response
+
+    api = SimpleNamespace(snaps=SimpleNamespace())
+    api.snaps.get_snap_info = AsyncMock(return_value=install_data("11"))
+    api.get_changes_by_id_generator = get_changes_by_id_generator
+    snap_state = SnapStateStore(api)
+    snap_state.set_install_data("vlc", install_data(None))
+    app = RecordingApp(snap_state)
+
+    async with app.run_test() as pilot:
+        await snap_state.track_change("vlc", "42")
+        await pilot.pause()
+
+    progress = [event.done for event in app.events[:2]]
+    finished, state_changed = app.events[2:]
+    assert progress == [2, 7]
+    assert (finished.change_id, finished.error) == ("42", None)
+    assert state_changed.state.is_installed
+    api.snaps.get_snap_info.assert_awaited_once_with("vlc")
+    assert snap_state.get("vlc").change_id is None
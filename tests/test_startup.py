@@ -0,0 +1,45 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+from store_tui.startup import deferred_in, preload_modules
+
+REPO_DIR = pathlib.Path(__file__).parent.parent
+
+
+def test_first_frame_does_not_import_deferred_modules(tmp_path):
+    snapshot = tmp_path / "first-frame-modules.txt"
+    env = {
+        **os.environ,
+        "XDG_CONFIG_HOME": str(tmp_path),
+        # nothing listens there, the first frame is drawn before the listing loads
+        "STORE_TUI_STORE__BASE_URL": "http://127.0.0.1:9",
+        "STORE_TUI_SNAPD__SOCKET": str(tmp_path / "snapd.socket"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-m", "store_tui.startup", "snapshot", "--output", snapshot],
+        cwd=REPO_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+
+    modules = snapshot.read_text().split()
+    assert "store_tui.main" in modules
+    assert "textual.app" in modules
+    assert deferred_in(modules) == []
+
+
+def test_deferred_in_matches_submodules_of_dependencies():
+    modules = ["textual.app", "PIL.Image", "store_tui.elements.snap_modal", "PILLOW"]
+    assert deferred_in(modules) == ["PIL.Image", "store_tui.elements.snap_modal"]
+
+
+def test_preload_modules_skips_modules_that_fail():
+    assert preload_modules(["json", "store_tui.missing_module", "csv"]) == [
+        "json",
+        "csv",
+    ]
@@ -0,0 +1,74 @@
+import json
+import pathlib
+from datetime import timedelta
+
+import pytest
+from snap_python.schemas.snaps import SingleInstalledSnapResponse
+from snap_python.schemas.store.info import InfoResponse
+
+from store_tui.elements.utils import get_platform_architecture
+from store_tui.fake_store import installed_snap_json, snapd_response
+from store_tui.view_model import SnapViewModel, get_last_updated_message
+
+NOTEBOOKS_DIR = pathlib.Path(__file__).parent / "notebooks"
+
+
+@pytest.fixture
+def freecad_info() -> InfoResponse:
+    with open(NOTEBOOKS_DIR / "freecad_snap_info_response.json") as f:
+        return InfoResponse.model_validate(json.load(f))
+
+
+def test_view_model_is_derived_from_the_channel_map(freecad_info):
+    view_model = SnapViewModel.from_info("freecad", freecad_info)
+
+    architectures = {
+        architecture
+        for channel in freecad_info.channel_map
+        for architecture in channel.architectures or []
+    }
+    assert view_model.architectures == tuple(sorted(architectures))
+    assert view_model.last_updated == max(
+        channel.created_at for channel in freecad_info.channel_map
+    )
+    assert view_model.title == "FreeCAD"
+    assert view_model.app_center_url == "snap://freecad"
+    assert view_model.supported_label.endswith(f"on {get_platform_architecture()}")
+    assert view_model.installed_message == "Installed: 🚫 (snapd unaccessible)"
+    assert len(view_model.channel_matrix.cells) == len(freecad_info.channel_map)
+
+
+def test_view_model_is_only_replaced_when_the_install_state_changes(freecad_info):
+    view_model = SnapViewModel.from_info("freecad", freecad_info)
+    assert view_model.with_install_data(None) is view_model
+
+    installed = SingleInstalledSnapResponse.model_validate(
+        snapd_response(installed_snap_json("freecad"))
+    )
+    installed_view = view_model.with_install_data(installed)
+    assert installed_view is not view_model
+    assert installed_view.installed_message == "Installed: ✅ (v1.0)"
+    assert installed_view.channel_matrix is view_model.channel_matrix
+
+
+def test_last_updated_is_formatted_relative_to_when_it_is_shown(freecad_info):
+    view_model = SnapViewModel.from_info("freecad", freecad_info)
+    last_updated = view_model.last_updated
+
+    # the same view model, shown again hours later
+    assert (
+        get_last_updated_message(last_updated, now=last_updated + timedelta(minutes=5))
+        == "Last Updated: 5 minutes ago"
+    )
+    assert (
+        get_last_updated_message(last_updated, now=last_updated + timedelta(hours=3))
+        == "Last Updated: 3 hours ago"
+    )
+    assert get_last_updated_message(None) == "Last Updated: Unknown"
+
+
+def test_missing_snap_is_rejected(freecad_info):
+    with pytest.raises(ValueError):
+        SnapViewModel.from_info(
+            "freecad", freecad_info.model_copy(update={"snap": None})
+        )